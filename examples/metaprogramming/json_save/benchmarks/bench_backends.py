@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the json backends available to json_save
+
+Uses the same sort of nested objects as the json_save tests.
+
+$ python bench_backends.py [num_items]
+"""
+
+import io
+import sys
+import timeit
+
+import json_save.json_save_dec as js
+from json_save import backends
+
+
+@js.json_save
+class SimpleClass:
+    a = js.Int()
+    b = js.Float()
+
+    def __init__(self, a=None, b=None):
+        if a is not None:
+            self.a = a
+        if b is not None:
+            self.b = b
+
+
+@js.json_save
+class ClassWithList:
+    x = js.Int()
+    lst = js.List()
+
+    def __init__(self, x, lst):
+        self.x = x
+        self.lst = lst
+
+
+@js.json_save
+class ClassWithDict:
+    x = js.Int()
+    d = js.Dict()
+
+    def __init__(self, x, d):
+        self.x = x
+        self.d = d
+
+
+def make_example(n):
+    lst = [SimpleClass(i, i * 1.5) for i in range(n)]
+    d = {str(i): SimpleClass(i, i / 3) for i in range(n)}
+    return ClassWithList(n, [ClassWithDict(n, d), ClassWithList(n, lst)])
+
+
+def bench(obj, indent, number=5):
+    f = io.StringIO()
+    dump = timeit.timeit(lambda: obj.to_json(f, indent=indent), number=number)
+    text = obj.to_json(indent=indent)
+    load = timeit.timeit(lambda: js.from_json(text), number=number)
+    return dump / number, load / number, len(text)
+
+
+if __name__ == "__main__":
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    obj = make_example(num)
+    print("{:10s} {:>7s} {:>9s} {:>9s} {:>11s}".format("backend", "indent",
+                                                     "dump (s)", "load (s)",
+                                                     "size"))
+    for name in backends.available_backends():
+        backends.set_backend(name)
+        for indent in (None, 4):
+            dump, load, size = bench(obj, indent)
+            print("{:10s} {:>7s} {:9.3f} {:9.3f} {:11d}".format(name, str(indent),
+                                                            dump, load, size))
@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of typed dict keys, vs. the generic repr / literal_eval
+
+$ python bench_dict_keys.py [num_keys]
+"""
+
+import sys
+import timeit
+
+from json_save.saveables import Dict, Int, Tuple
+
+
+def bench(name, typ, val, number=3):
+    compat = typ.to_json_compat(val)
+    save = timeit.timeit(lambda: typ.to_json_compat(val), number=number)
+    load = timeit.timeit(lambda: typ.to_python(dict(compat)), number=number)
+    print("{:20s} save: {:7.3f}s   load: {:7.3f}s".format(name,
+                                                         save / number,
+                                                         load / number))
+    return save + load
+
+
+if __name__ == "__main__":
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"dicts with {num} keys")
+    int_dict = {i: i * 2 for i in range(num)}
+    tuple_dict = {(i, i + 1): i for i in range(num)}
+
+    generic = bench("Dict() int", Dict(), int_dict)
+    typed = bench("Dict(key=Int)", Dict(key=Int), int_dict)
+    print("speedup: {:.1f}".format(generic / typed))
+
+    generic = bench("Dict() tuple", Dict(), tuple_dict)
+    typed = bench("Dict(key=Tuple)", Dict(key=Tuple), tuple_dict)
+    print("speedup: {:.1f}".format(generic / typed))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+"""
+Memory use and creation time of regular vs. __slots__ json_save classes
+
+$ python bench_slots.py [num_objects]
+"""
+
+import sys
+import timeit
+import tracemalloc
+
+import json_save.json_save_dec as js
+
+
+@js.json_save
+class Point:
+    x = js.Float()
+    y = js.Float()
+    z = js.Float()
+
+
+@js.json_save(slots=True)
+class SlotPoint:
+    x = js.Float()
+    y = js.Float()
+    z = js.Float()
+
+
+def measure(cls, num):
+    tracemalloc.start()
+    points = [cls() for i in range(num)]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    create = timeit.timeit(cls, number=num)
+    compat = [p.to_json_compat() for p in points]
+    load = timeit.timeit(lambda: [cls.from_json_dict(c) for c in compat], number=1)
+    print("{:10s} {:8.1f} bytes/object   create: {:.3f}s   load: {:.3f}s".format(
+          cls.__name__, size / num, create, load))
+
+
+if __name__ == "__main__":
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"{num} objects")
+    measure(Point, num)
+    measure(SlotPoint, num)
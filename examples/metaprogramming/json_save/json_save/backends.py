@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+
+"""
+Pluggable JSON encoder / decoder backends for json_save
+
+The standard library json module always works, but there are faster
+ones out there. If one of them is installed, it's used instead:
+
+ * orjson
+ * rapidjson (python-rapidjson)
+ * ujson
+
+The stdlib json is the fallback.
+
+The faster ones can't all handle everything the stdlib json can. orjson
+writes NaN and infinity as null, raises on ints bigger than 64 bits,
+and reads those ints as floats (ujson has similar limits). So when
+the faster one can't write a document, the stdlib json writes it
+instead, and documents it can't read are read with the stdlib json --
+the results are always the same as with the stdlib, just faster for
+the usual case. orjson isn't used for reading at all.
+
+You can see what's being used with ``get_backend().name``, and pick one
+yourself with ``set_backend("json")``.
+"""
+
+import json
+
+__all__ = ['Backend',
+           'available_backends',
+           'get_backend',
+           'set_backend',
+           ]
+
+# in order of preference
+PREFERRED = ["orjson", "rapidjson", "ujson", "json"]
+
+
+class Backend:
+    """
+    A JSON encoder/decoder with a common interface
+
+    :param name: name of the module
+
+    :param dumps: function that takes (obj, indent) and returns a str
+
+    :param loads: function that takes a str (or bytes) and returns the
+                  python object
+    """
+
+    def __init__(self, name, dumps, loads):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def dump(self, obj, fp, indent=None):
+        fp.write(self.dumps(obj, indent))
+
+    def load(self, fp):
+        return self.loads(fp.read())
+
+    def __repr__(self):
+        return f"Backend({self.name!r})"
+
+
+def _stdlib_dumps(obj, indent=None):
+    return json.dumps(obj, indent=indent)
+
+
+def _make_json():
+    return Backend("json", _stdlib_dumps, json.loads)
+
+
+def _with_fallback(name, dumps, loads):
+    """
+    make a Backend that uses the stdlib json when dumps or loads can't
+    handle the data -- dumps can also return None to mean that
+    """
+    def safe_dumps(obj, indent=None):
+        try:
+            result = dumps(obj, indent)
+        except (TypeError, ValueError, OverflowError):
+            result = None
+        if result is None:
+            return _stdlib_dumps(obj, indent)
+        return result
+
+    def safe_loads(s):
+        try:
+            return loads(s)
+        except ValueError:
+            return json.loads(s)
+    return Backend(name, safe_dumps, safe_loads)
+
+
+def _make_orjson():
+    import orjson
+
+    def dumps(obj, indent=None):
+        # orjson only knows how to indent by 2 -- so let the stdlib do
+        # any other indent, or it would depend on the data which one
+        # was used. (And it returns bytes.)
+        if indent not in (None, 2):
+            return None
+        option = orjson.OPT_INDENT_2 if indent is not None else 0
+        result = orjson.dumps(obj, option=option)
+        # orjson writes NaN and inf as null -- if there's a null at all,
+        # there might be one of those, so let the stdlib do it.
+        if b"null" in result:
+            return None
+        return result.decode("utf-8")
+
+    # orjson reads ints that don't fit in 64 bits as floats, without
+    # complaint -- and looking for them first takes longer than the stdlib
+    # takes to read it all. So orjson is only used for writing.
+    return _with_fallback("orjson", dumps, json.loads)
+
+
+def _make_rapidjson():
+    import rapidjson
+
+    def dumps(obj, indent=None):
+        return rapidjson.dumps(obj, indent=indent)
+    return _with_fallback("rapidjson", dumps, rapidjson.loads)
+
+
+def _make_ujson():
+    import ujson
+
+    def dumps(obj, indent=None):
+        # ujson uses 0 for no indentation, and escapes "/" by default
+        return ujson.dumps(obj, indent=indent or 0, escape_forward_slashes=False)
+    return _with_fallback("ujson", dumps, ujson.loads)
+
+
+_makers = {"json": _make_json,
+           "orjson": _make_orjson,
+           "rapidjson": _make_rapidjson,
+           "ujson": _make_ujson,
+           }
+
+
+def available_backends():
+    """
+    returns a dict of all the backends that can be imported, by name
+    """
+    backends = {}
+    for name in PREFERRED:
+        try:
+            backends[name] = _makers[name]()
+        except ImportError:
+            pass
+    return backends
+
+
+def _best_backend():
+    for name in PREFERRED:
+        try:
+            return _makers[name]()
+        except ImportError:
+            pass
+
+
+_current = _best_backend()
+
+
+def get_backend():
+    """
+    returns the Backend currently in use
+    """
+    return _current
+
+
+def set_backend(name=None):
+    """
+    select the JSON backend to use
+
+    :param name=None: name of the backend: one of "orjson", "rapidjson",
+                      "ujson" or "json". None selects the fastest one
+                      that's installed.
+
+    Raises an ImportError if the requested one is not installed.
+    """
+    global _current
+    if name is None:
+        _current = _best_backend()
+    else:
+        try:
+            maker = _makers[name]
+        except KeyError:
+            raise ValueError(f"Unknown JSON backend: {name!r}. "
+                             f"Options are: {PREFERRED}")
+        _current = maker()
+    return _current
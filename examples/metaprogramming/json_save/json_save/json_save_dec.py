@@ -4,26 +4,19 @@
 json_save implemented as a decorator
 """
 
-import json
+import inspect
+from functools import partial
 from pathlib import Path
 
+from . import backends
+from . import refs
 from .json_save_meta import *
+from .serializers import make_defaults_setter, make_serializers, slots_namespace
 
 
 # assorted methods that will need to be added to the decorated class:
-def _to_json_compat(self):
-    """
-    converts this object to a json-compatible dict.
-
-    returns the dict
-    """
-    # add and __obj_type attribute, so it can be reconstructed
-    dic = {"__obj_type": self.__class__.__qualname__}
-    for attr, typ in self._attrs_to_save.items():
-        dic[attr] = typ.to_json_compat(getattr(self, attr))
-    return dic
-
-
+# (to_json_compat and from_json_dict are generated for each class
+#  by make_serializers)
 def __eq__(self, other):
     """
     default equality method that checks if all of the saved attributes
@@ -37,23 +30,6 @@ def __eq__(self, other):
             return False
     return True
 
-@classmethod
-def _from_json_dict(cls, dic):
-    """
-    creates an instance of this class populated by the contents of
-    the json compatible dict
-
-    the object is created with __new__ before setting the attributes
-
-    NOTE: __init__ is not called.
-    There should not be any extra initialization required in __init__
-    """
-    # create a new object
-    obj = cls.__new__(cls)
-    for attr, typ in cls._attrs_to_save.items():
-        setattr(obj, attr, typ.to_python(dic[attr]))
-    return obj
-
 
 def __new__(cls, *args, **kwargs):
     """
@@ -67,12 +43,11 @@ def __new__(cls, *args, **kwargs):
     obj = cls.__base__.__new__(cls)
     # using super() did not work here -- why??
     # set the instance attributes to defaults
-    for attr, typ in cls._attrs_to_save.items():
-        setattr(obj, attr, typ.default)
+    cls._set_defaults(obj)
     return obj
 
 
-def _to_json(self, fp=None, indent=4):
+def _to_json(self, fp=None, indent=None, shared=False):
     """
     Converts the object to JSON
 
@@ -80,24 +55,81 @@ def _to_json(self, fp=None, indent=4):
                     If it is None, then a string with the JSON
                     will be returned as a string
 
-    :param indent=4: The indentation level desired in the JSON
+    :param indent=None: The indentation level desired in the JSON.
+                        The default is compact: no newlines or
+                        indentation.
+
+    :param shared=False: If True, objects that are referenced more than
+                         once are only saved once, and will be the same
+                         object when re-loaded.
     """
+    if shared:
+        compat = refs.shared_to_json_compat(self)
+    else:
+        compat = self.to_json_compat()
     if fp is None:
-        return json.dumps(self.to_json_compat(), indent=indent)
+        return backends.get_backend().dumps(compat, indent)
     else:
-        json.dump(self.to_json_compat(), fp, indent=indent)
+        backends.get_backend().dump(compat, fp, indent)
 
 
 # now the actual decorator
-def json_save(cls):
+def _set_class_cells(namespace, old_cls, new_cls):
+    """
+    point the functions in a class namespace at a new class
+
+    A method that uses super() (or __class__) with no arguments has a
+    "__class__" cell with the class it was defined in. When the class is
+    made again, the cell has to be changed, or super() fails.
+    """
+    for value in namespace.values():
+        if isinstance(value, (classmethod, staticmethod)):
+            funcs = [value.__func__]
+        elif isinstance(value, property):
+            funcs = [value.fget, value.fset, value.fdel]
+        else:
+            funcs = [value]
+        for func in funcs:
+            # unwrap decorated functions
+            func = inspect.unwrap(func) if callable(func) else func
+            closure = getattr(func, "__closure__", None)
+            if not closure:
+                continue
+            for name, cell in zip(func.__code__.co_freevars, closure):
+                if name == "__class__" and cell.cell_contents is old_cls:
+                    cell.cell_contents = new_cls
+
+
+def json_save(cls=None, *, lazy=False, slots=False, version=0):
     """
     json_save decorator
 
     makes decorated classes Saveable to json
+
+    Can be used with options::
+
+        @json_save(lazy=True)
+
+    :param lazy=False: If True, container attributes of loaded objects are
+                       only converted from json when they are first used.
+
+    :param slots=False: If True, the Saveable attributes are stored in
+                        __slots__, rather than an instance __dict__, which
+                        uses a lot less memory for lots of small objects.
+                        Any other instance attributes need to be put in
+                        the class' own __slots__.
+
+    :param version=0: The version of the saved data for this class. Older
+                      data gets migrated when loaded -- see migrations.py
     """
+    if cls is None:
+        # called with options -- return the real decorator
+        return partial(json_save, lazy=lazy, slots=slots, version=version)
     # make sure this is decorating a class object
     if type(cls) is not type:
         raise TypeError("json_save can only be used on classes")
+    if lazy and slots:
+        raise TypeError("json_save can't use both lazy and slots")
 
     # find the saveable attributes
     # these will the attributes that get saved and reconstructed from json.
@@ -110,14 +142,27 @@ def json_save(cls):
     if not cls._attrs_to_save:
         raise TypeError(f"{cls.__name__} class has no saveable attributes.\n"
                         "           Note that Savable attributes must be instances")
+    if slots:
+        # __slots__ only work when the class is created -- so make a new one
+        attrs_to_save = cls._attrs_to_save
+        namespace = slots_namespace(attr_dict)
+        namespace["__qualname__"] = cls.__qualname__
+        new_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+        _set_class_cells(namespace, cls, new_cls)
+        cls = new_cls
+        cls._attrs_to_save = attrs_to_save
+    cls._version = version
+    # generated for this class, so it's quick
+    cls._set_defaults = staticmethod(make_defaults_setter(cls, slots))
     # register this class so we can re-construct instances.
     Saveable.ALL_SAVEABLES[cls.__qualname__] = cls
 
     # add the methods:
     cls.__new__ = __new__
-    cls.to_json_compat = _to_json_compat
+    to_json_compat, from_json_dict = make_serializers(cls, lazy=lazy)
+    cls.to_json_compat = to_json_compat
     cls.__eq__ = __eq__
-    cls.from_json_dict = _from_json_dict
+    cls.from_json_dict = classmethod(from_json_dict)
     cls.to_json = _to_json
 
     return cls
@@ -141,6 +186,6 @@ def from_json(_json):
     from a json string or file
     """
     if isinstance(_json, (str, Path)):
-        return from_json_dict(json.loads(_json))
+        return from_json_dict(backends.get_backend().loads(_json))
     else:  # assume a file-like object
-        return from_json_dict(json.load(_json))
+        return from_json_dict(backends.get_backend().load(_json))
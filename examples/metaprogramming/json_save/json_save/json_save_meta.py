@@ -11,11 +11,12 @@ The idea is that you subclass from JsonSavable, and then you get an object
 that be saved and reloaded to/from JSON
 """
 
-import json
-
 # import * is a bad idea in general, but helpful for a modules that's part
 # of a package, where you control the names.
 from .saveables import *
+from . import backends
+from . import refs
+from .serializers import make_defaults_setter, make_serializers, slots_namespace
 
 
 class MetaJsonSaveable(type):
@@ -26,8 +27,33 @@ class MetaJsonSaveable(type):
 
     Note: the __init__ gets run at compile time, not run time.
           (module import time)
+
+    Options can be passed in as keyword arguments in the class definition:
+
+        class MyClass(JsonSaveable, lazy=True):
+
+    :param lazy=False: If True, container attributes of loaded objects are
+                       only converted from json when they are first used.
+
+    :param slots=False: If True, the Saveable attributes are stored in
+                        __slots__, rather than an instance __dict__, which
+                        uses a lot less memory for lots of small objects.
+                        Any other instance attributes need to be put in
+                        the class' own __slots__.
+
+    :param version=0: The version of the saved data for this class. Older
+                      data gets migrated when loaded -- see migrations.py
     """
-    def __init__(cls, name, bases, attr_dict):
+    def __new__(mcs, name, bases, attr_dict, lazy=False, slots=False, version=0):
+        # the options are for __init__ -- type.__new__ doesn't want them
+        if slots:
+            if lazy:
+                raise TypeError("JsonSaveable can't use both lazy and slots")
+            # __init__ still gets the original attr_dict with the Saveables in it.
+            return super().__new__(mcs, name, bases, slots_namespace(attr_dict))
+        return super().__new__(mcs, name, bases, attr_dict)
+
+    def __init__(cls, name, bases, attr_dict, lazy=False, slots=False, version=0):
         # it gets the class object as the first param.
         # and then the same parameters as the type() factory function
 
@@ -46,14 +72,30 @@ class MetaJsonSaveable(type):
             raise TypeError(f"{cls.__name__} class has no saveable attributes.\n"
                             "           Note that Savable attributes must be instances")
 
+        cls._version = version
+        # generated for this class, so it's quick
+        cls._set_defaults = staticmethod(make_defaults_setter(cls, slots))
+
         # register this class so we can re-construct instances.
         Saveable.ALL_SAVEABLES[attr_dict["__qualname__"]] = cls
 
+        # replace the generic (getattr / setattr loop) methods with ones
+        # generated for this class -- unless the class defines its own.
+        if cls._attrs_to_save:
+            to_json_compat, from_json_dict = make_serializers(cls, lazy=lazy)
+            if "to_json_compat" not in attr_dict:
+                cls.to_json_compat = to_json_compat
+            if "from_json_dict" not in attr_dict:
+                cls.from_json_dict = classmethod(from_json_dict)
+
 
 class JsonSaveable(metaclass=MetaJsonSaveable):
     """
     mixin for JsonSavable objects
     """
+    # so that subclasses can use slots=True
+    __slots__ = ()
+
     def __new__(cls, *args, **kwargs):
         """
         This adds instance attributes to assure they are all there, even if
@@ -62,8 +104,7 @@ class JsonSaveable(metaclass=MetaJsonSaveable):
         # create the instance
         obj = super().__new__(cls)
         # set the instance attributes to defaults
-        for attr, typ in cls._attrs_to_save.items():
-            setattr(obj, attr, typ.default)
+        cls._set_defaults(obj)
         return obj
 
     def __eq__(self, other):
@@ -110,7 +151,7 @@ class JsonSaveable(metaclass=MetaJsonSaveable):
         # obj.__init__()
         return obj
 
-    def to_json(self, fp=None, indent=4):
+    def to_json(self, fp=None, indent=None, shared=False):
         """
         Converts the object to JSON
 
@@ -118,12 +159,22 @@ class JsonSaveable(metaclass=MetaJsonSaveable):
                         If it is None, then a string with the JSON
                         will be returned as a string
 
-        :param indent=4: The indentation level desired in the JSON
+        :param indent=None: The indentation level desired in the JSON.
+                            The default is compact: no newlines or
+                            indentation.
+
+        :param shared=False: If True, objects that are referenced more than
+                             once are only saved once, and will be the same
+                             object when re-loaded.
         """
+        if shared:
+            compat = refs.shared_to_json_compat(self)
+        else:
+            compat = self.to_json_compat()
         if fp is None:
-            return json.dumps(self.to_json_compat(), indent=indent)
+            return backends.get_backend().dumps(compat, indent)
         else:
-            json.dump(self.to_json_compat(), fp, indent=indent)
+            backends.get_backend().dump(compat, fp, indent)
 
     def __str__(self):
         msg = ["{} object, with attributes:".format(self.__class__.__qualname__)]
@@ -149,9 +200,9 @@ def from_json(_json):
     from a json string or file
     """
     if isinstance(_json, str):
-        return from_json_dict(json.loads(_json))
+        return from_json_dict(backends.get_backend().loads(_json))
     else:  # assume a file-like object
-        return from_json_dict(json.load(_json))
+        return from_json_dict(backends.get_backend().load(_json))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+
+"""
+Schema versions and migrations for json_save classes
+
+A class can be given a version number::
+
+    @json_save(version=2)
+    class MyClass:
+        ...
+
+(or ``class MyClass(JsonSaveable, version=2)``)
+
+Objects of a versioned class are saved with a "__version" (files without
+one are version 0). When older data is loaded, the migration functions
+registered for the class are run in order, to bring it up to date::
+
+    @migration("MyClass", from_version=1)
+    def rename_x(dic):
+        dic["new_x"] = dic.pop("x")
+        return dic
+
+A migration function gets the json-compatible dict of the old version,
+and returns the dict for the next version. Steps that don't have a
+migration are fine -- any attributes missing after the migrations are
+set to their defaults. So a class that only gains attributes just needs
+its version bumped.
+
+migrate_file() upgrades a whole saved file without loading it into
+memory all at once.
+"""
+
+import json
+import shutil
+import tempfile
+
+from .saveables import Saveable
+from .stream import _Reader
+
+__all__ = ['migration',
+           'migrate_file',
+           ]
+
+# migration functions, keyed by (__obj_type, from_version)
+MIGRATIONS = {}
+
+_encode = json.JSONEncoder().encode
+
+
+def migration(obj_type, from_version):
+    """
+    Decorator to register a function that migrates the saved data of a
+    class from one version to the next.
+
+    :param obj_type: the class, or its __qualname__ (which is what is
+                     saved in the json as the "__obj_type")
+
+    :param from_version: the version the function migrates from
+    """
+    if isinstance(obj_type, type):
+        obj_type = obj_type.__qualname__
+
+    def register(func):
+        MIGRATIONS[obj_type, from_version] = func
+        return func
+    return register
+
+
+def migrate(cls, dic):
+    """
+    Bring the json compatible dict for an object of cls up to date
+
+    :returns: a new, migrated dict
+    """
+    version = dic.get("__version", 0)
+    if version > cls._version:
+        raise ValueError(f"{cls.__qualname__} data is version {version}, "
+                         f"newer than the code (version {cls._version})")
+    dic = dict(dic)
+    while version < cls._version:
+        func = MIGRATIONS.get((cls.__qualname__, version))
+        if func is not None:
+            dic = func(dic)
+        version += 1
+    dic["__version"] = version
+    # anything added without a migration gets the default
+    for attr, typ in cls._attrs_to_save.items():
+        if attr not in dic:
+            dic[attr] = typ.to_json_compat(typ.default)
+    return dic
+
+
+def migrate_compat(val):
+    """
+    Migrate all the saved objects in a json-compatible structure
+
+    Works on the raw json data -- no objects are created.
+    """
+    if isinstance(val, dict):
+        try:
+            cls = Saveable.ALL_SAVEABLES[val["__obj_type"]]
+        except KeyError:
+            pass
+        else:
+            if val.get("__version", 0) != cls._version:
+                val = migrate(cls, val)
+        return {key: migrate_compat(item) for key, item in val.items()}
+    elif isinstance(val, list):
+        return [migrate_compat(item) for item in val]
+    return val
+
+
+class _Spooled:
+    """
+    The JSON for a container, migrated and stored in a temp file
+    """
+
+    def __init__(self):
+        self.file = tempfile.TemporaryFile("w+")
+
+    def __repr__(self):
+        return "<migrated container>"
+
+
+def _spool_array(reader):
+    spool = _Spooled()
+    write = spool.file.write
+    write("[")
+    sep = ""
+    for _ in reader.elements():
+        write(sep + _encode(migrate_compat(reader.value())))
+        sep = ", "
+    write("]")
+    return spool
+
+
+def _spool_object(reader):
+    spool = _Spooled()
+    write = spool.file.write
+    write("{")
+    sep = ""
+    for key in reader.members():
+        write(sep + _encode(key) + ": " + _encode(migrate_compat(reader.value())))
+        sep = ", "
+    write("}")
+    return spool
+
+
+def migrate_file(infile, outfile):
+    """
+    Upgrade a file saved by json_save to the current versions
+
+    :param infile: open file-like object to read the old version from
+
+    :param outfile: open file-like object to write the migrated version to
+
+    Only one item of each container is in memory at a time -- the migrated
+    containers are stored in temporary files until they are written out.
+    Migration functions for the top-level object get these containers as
+    place holders, so they can rename or remove them, but not look inside.
+
+    The classes being migrated must have been imported, so they are
+    registered with json_save.
+    """
+    reader = _Reader(infile)
+    top = {}
+    spools = []
+    try:
+        for key in reader.members():
+            c = reader.peek_char()
+            if c == "[":
+                top[key] = _spool_array(reader)
+                spools.append(top[key])
+            elif c == "{":
+                top[key] = _spool_object(reader)
+                spools.append(top[key])
+            else:
+                top[key] = reader.value()
+        cls = Saveable.ALL_SAVEABLES[top["__obj_type"]]
+        if top.get("__version", 0) != cls._version:
+            top = migrate(cls, top)
+
+        outfile.write("{")
+        sep = ""
+        for key, val in top.items():
+            outfile.write(sep + _encode(key) + ": ")
+            sep = ", "
+            if isinstance(val, _Spooled):
+                val.file.seek(0)
+                shutil.copyfileobj(val.file, outfile)
+            else:
+                outfile.write(_encode(val))
+        outfile.write("}")
+    finally:
+        for spool in spools:
+            spool.file.close()
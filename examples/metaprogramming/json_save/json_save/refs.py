@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+"""
+Sharing of repeated objects in json_save output
+
+Normally every object reachable from the one being saved is written out
+in full, wherever it is found. So an object that is in multiple
+containers gets written multiple times -- and comes back as multiple
+separate objects when loaded.
+
+In "shared" mode, an object that is referenced more than once is written
+in full once, with an "__id", and everywhere else as {"__ref": id}. On
+loading, the references are replaced with the same object, so shared
+identity is preserved (this handles reference cycles, too).
+
+Shared mode is used with: ``obj.to_json(shared=True)`` or
+``shared_to_json_compat(obj)``. Loading works the same as always --
+the saved data is marked as "__shared", so from_json knows what to do.
+
+The memo of a shared save or load is kept per thread, so different
+threads can save and load at the same time.
+"""
+
+import threading
+
+__all__ = ['shared_to_json_compat']
+
+
+class _State(threading.local):
+    # the memo of the save or load in progress in this thread
+    # -- None when not in shared mode
+    saving = None
+    loading = None
+
+
+_state = _State()
+
+
+def _is_saveable_obj(val):
+    # json_save classes (decorator or metaclass) all have _attrs_to_save
+    return hasattr(val, "_attrs_to_save") and not isinstance(val, type)
+
+
+def _may_hold_objects(typ):
+    # typed lists of simple types (like List(Float)) can't have saveable
+    # objects in them -- so there's no need to look. But a typed list of
+    # containers (like List(List())) can.
+    from .saveables import List, Tuple, Dict
+    containers = (List, Tuple, Dict)
+    item_type = getattr(typ, "item_type", None)
+    if item_type is None:
+        return True
+    if isinstance(item_type, type):
+        return issubclass(item_type, containers)
+    return isinstance(item_type, containers)
+
+
+class SaveMemo:
+    """
+    Keeps track of the objects that are referenced more than once
+    """
+
+    def __init__(self, obj):
+        # keep the objects alive, so the ids stay unique
+        self.objects = []
+        self.shared = {}
+        self.done = set()
+        seen = set()
+        stack = [obj]
+        while stack:
+            val = stack.pop()
+            if _is_saveable_obj(val):
+                if id(val) in seen:
+                    if id(val) not in self.shared:
+                        self.shared[id(val)] = len(self.shared)
+                    continue
+                seen.add(id(val))
+                self.objects.append(val)
+                for attr, typ in val._attrs_to_save.items():
+                    if _may_hold_objects(typ):
+                        stack.append(getattr(val, attr))
+            elif isinstance(val, (list, tuple)):
+                # reversed, so they are found in the same order they are saved
+                stack.extend(reversed(val))
+            elif isinstance(val, dict):
+                stack.extend(reversed(list(val.values())))
+
+    def to_json_compat(self, obj, to_json_compat):
+        """
+        returns the json compatible version of a shared object --
+        the full version the first time, a reference after that.
+        """
+        ref_id = self.shared[id(obj)]
+        if ref_id in self.done:
+            return {"__ref": ref_id}
+        # mark it done before converting it, in case it refers to itself
+        self.done.add(ref_id)
+        dic = to_json_compat(obj)
+        dic["__id"] = ref_id
+        return dic
+
+
+def shared_to_json_compat(obj):
+    """
+    Convert a json_save object to a json compatible dict, writing objects
+    that are referenced more than once only once.
+    """
+    previous = _state.saving
+    _state.saving = SaveMemo(obj)
+    try:
+        dic = obj.to_json_compat()
+    finally:
+        _state.saving = previous
+    dic["__shared"] = True
+    return dic
+
+
+def shared_from_json_dict(cls, dic):
+    """
+    Create an object from a json compatible dict saved in shared mode
+    """
+    dic = dict(dic)
+    del dic["__shared"]
+    previous = _state.loading
+    _state.loading = {}
+    try:
+        return cls.from_json_dict(dic)
+    finally:
+        _state.loading = previous
+
+
+def register(ref_id, obj):
+    """
+    Record a loaded object, so references to it can be resolved
+    """
+    loading = _state.loading
+    if loading is None:
+        raise ValueError("Shared objects can only be loaded "
+                         "from the top-level saved object")
+    loading[ref_id] = obj
+
+
+def resolve(item):
+    """
+    Return the object item refers to, if it is a reference
+
+    Otherwise item is returned unchanged.
+    """
+    loading = _state.loading
+    if loading is not None:
+        try:
+            return loading[item["__ref"]]
+        except (KeyError, TypeError):
+            pass
+    return item
@@ -4,8 +4,9 @@
 The Saveable objects used by both the metaclass and decorator approach.
 """
 import ast
+import json
 
-# import json
+from . import refs
 
 __all__ = ['Bool',
            'Dict',
@@ -24,6 +25,30 @@ class Saveable():
     """
     default = None
     ALL_SAVEABLES = {}
+    # set by __set_name__ when used in a class
+    name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        """
+        Saveables are (non-data) descriptors, so that the attributes of
+        objects loaded "lazily" can be converted when first used.
+
+        Once set, the value in the instance __dict__ is found first, so
+        this is only called if the attribute has not been set.
+        """
+        if obj is None:
+            return self
+        try:
+            raw = obj._json_pending.pop(self.name)
+        except (AttributeError, KeyError):
+            # not lazy -- just a regular class attribute
+            return self
+        val = self.to_python(raw)
+        setattr(obj, self.name, val)
+        return val
 
     @staticmethod
     def to_json_compat(val):
@@ -104,6 +129,40 @@ class Float(Saveable):
 
 # Container types: these need to hold  Saveable objects.
 
+# these can't be (or hold) a saved object -- no need to check
+_PLAIN_TYPES = {int, float, str, bool, type(None)}
+
+
+def _item_to_json_compat(item):
+    """
+    json compatible version of an item in a container
+    """
+    if type(item) in _PLAIN_TYPES:
+        return item
+    try:
+        return item.to_json_compat()
+    except AttributeError:
+        return item
+
+
+def _item_to_python(item):
+    """
+    re-create an item in a container from its json compatible version
+
+    The item may be a saved object, a reference to a shared object, or
+    just a regular json value.
+    """
+    if type(item) is not dict:
+        return item
+    try:
+        obj_type = item["__obj_type"]
+        return Saveable.ALL_SAVEABLES[obj_type].from_json_dict(item)
+    except TypeError:
+        return item
+    except KeyError:
+        # it may be a reference to a shared object
+        return refs.resolve(item)
+
 
 class Tuple(Saveable):
     """
@@ -126,9 +185,42 @@ class List(Saveable):
     """
     This assumes that whatever is in the list is Saveable or a "usual"
     type: numbers, strings.
+
+    If all the items are the same simple type, it can be passed in, e.g.::
+
+        List(Float)
+
+    Then the per-item dispatch is skipped, and the whole list is converted
+    in one go -- much faster for big lists of numbers.
     """
     default = []
 
+    def __init__(self, item_type=None):
+        if item_type is None:
+            return
+        if not (isinstance(item_type, Saveable) or
+                (isinstance(item_type, type) and issubclass(item_type, Saveable))):
+            raise TypeError("List item_type must be a Saveable type, "
+                            f"not {item_type!r}")
+        self.item_type = item_type
+        # these are set on the instance, so they override the generic
+        # staticmethods, but only for this typed List.
+        self.to_json_compat = self._typed_to_json_compat
+        self.to_python = self._typed_to_python
+
+    def _typed_to_json_compat(self, val):
+        to_json_compat = self.item_type.to_json_compat
+        if to_json_compat is Saveable.to_json_compat:
+            # items are already json compatible -- just copy the list
+            return list(val)
+        return list(map(to_json_compat, val))
+
+    def _typed_to_python(self, val):
+        to_python = self.item_type.to_python
+        if to_python is Saveable.to_python:
+            return list(val)
+        return list(map(to_python, val))
+
     @staticmethod
     def to_json_compat(val):
         lst = []
@@ -147,15 +239,32 @@ class List(Saveable):
         Complicated because list may contain non-json-compatible objects
         """
         # try to reconstitute using the obj method
-        new_list = []
-        for item in val:
-            try:
-                obj_type = item["__obj_type"]
-                obj = Saveable.ALL_SAVEABLES[obj_type].from_json_dict(item)
-                new_list.append(obj)
-            except (TypeError, KeyError):
-                new_list.append(item)
-        return new_list
+        return [_item_to_python(item) for item in val]
+
+
+def _encode_tuple_key(key):
+    return json.dumps(key)
+
+
+def _list_to_tuple(val):
+    # json makes tuples into lists -- nested ones too
+    if type(val) is list:
+        return tuple(map(_list_to_tuple, val))
+    return val
+
+
+def _decode_tuple_key(s_key):
+    return _list_to_tuple(json.loads(s_key))
+
+
+# python type, encoder and decoder for typed Dict keys
+_KEY_CODECS = {String: (str, None, None),
+               Int: (int, str, int),
+               Float: (float, repr, float),
+               Bool: (bool, str, "True".__eq__),
+               # tuples of numbers, strings and other tuples
+               Tuple: (tuple, _encode_tuple_key, _decode_tuple_key),
+               }
 
 
 class Dict(Saveable):
@@ -163,32 +272,99 @@ class Dict(Saveable):
     This assumes that whatever in the dict is Saveable as well.
 
     This supports non-string keys, but all keys must be the same type.
+
+    If the type of the keys is known, it can be passed in, e.g.::
+
+        Dict(key=Int)
+
+    Then a simple converter for that type is used for the keys, rather
+    than repr() and ast.literal_eval() for each one. Supported key types
+    are String, Int, Float, Bool and Tuple (of numbers, strings and
+    other tuples).
     """
     default = {}
 
+    def __init__(self, key=None):
+        if key is None:
+            return
+        if isinstance(key, Saveable):
+            key = type(key)
+        try:
+            self.key_type, self._encode, self._decode = _KEY_CODECS[key]
+        except (KeyError, TypeError):
+            raise TypeError(f"Dict key must be one of: {list(_KEY_CODECS)}, "
+                            f"not {key!r}")
+        self.key = key
+        # these are set on the instance, so they override the generic
+        # staticmethods, but only for this typed Dict.
+        self.key_not_string = self._typed_key_not_string
+        self.encode_key = self._typed_encode_key
+        self.to_json_compat = self._typed_to_json_compat
+        self.to_python = self._typed_to_python
+
+    def _check_keys(self, val):
+        # one pass to check them all, rather than checking each key
+        key_types = set(map(type, val))
+        if key_types - {self.key_type}:
+            raise TypeError(f"dict keys must all be {self.key_type.__name__}, "
+                            f"not {key_types}")
+
+    def _typed_key_not_string(self, val):
+        # the type is known -- so no need to say so in the json
+        self._check_keys(val)
+        return False
+
+    def _typed_encode_key(self, key, key_not_string=False):
+        return key if self._encode is None else self._encode(key)
+
+    def _typed_to_json_compat(self, val):
+        self._check_keys(val)
+        keys = val.keys() if self._encode is None else map(self._encode, val.keys())
+        return dict(zip(keys, map(_item_to_json_compat, val.values())))
+
+    def _typed_to_python(self, val):
+        # in case it was saved by an untyped Dict
+        val.pop('__key_not_string', None)
+        keys = val.keys() if self._decode is None else map(self._decode, val.keys())
+        return dict(zip(keys, map(_item_to_python, val.values())))
+
+    @staticmethod
+    def key_not_string(val):
+        """
+        Determine whether the dict's keys are strings, from the first key
+        """
+        for key in val:
+            return type(key) is not str
+        return False
+
+    @staticmethod
+    def encode_key(key, key_not_string):
+        """
+        Convert a dict key to a JSON (string) key
+
+        :param key_not_string: whether the dict has non-string keys
+        """
+        kis = type(key) is str
+        if ((kis and key_not_string) or (not (kis or key_not_string))):
+            raise TypeError("dict keys must be all strings or no strings")
+        if key_not_string:
+            # convert key to string
+            s_key = repr(key)
+            # make sure it can be reconstituted
+            if ast.literal_eval(s_key) != key:
+                raise ValueError(f"json save cannot save dicts with key:{key}")
+            return s_key
+        return key
+
     @staticmethod
     def to_json_compat(val):
         d = {}
-        # first key, arbitrarily
-        key_type = type(next(iter(val.keys())))
-        if key_type is not str:
+        key_not_string = Dict.key_not_string(val)
+        if key_not_string:
             # need to add key_type to json
             d['__key_not_string'] = True
-            key_not_string = True
-        else:
-            key_not_string = False
         for key, item in val.items():
-            kis = type(key) is str
-            if ((kis and key_not_string) or (not (kis or key_not_string))):
-                raise TypeError("dict keys must be all strings or no strings")
-            if key_type is not str:
-                # convert key to string
-                s_key = repr(key)
-                # make sure it can be reconstituted
-                if ast.literal_eval(s_key) != key:
-                    raise ValueError(f"json save cannot save dicts with key:{key}")
-            else:
-                s_key = key
+            s_key = Dict.encode_key(key, key_not_string)
             try:
                 d[s_key] = item.to_json_compat()
             except AttributeError:
@@ -209,10 +385,5 @@ class Dict(Saveable):
         for key, item in val.items():
             if key_not_string:
                 key = ast.literal_eval(key)
-            try:
-                obj_type = item["__obj_type"]
-                obj = Saveable.ALL_SAVEABLES[obj_type].from_json_dict(item)
-                new_dict[key] = obj
-            except (KeyError, TypeError):
-                new_dict[key] = item
+            new_dict[key] = _item_to_python(item)
         return new_dict
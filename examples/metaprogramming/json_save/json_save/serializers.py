@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+"""
+Code generation of per-class serializers
+
+The generic to_json_compat / from_json_dict methods loop through the
+_attrs_to_save dict, and call getattr / setattr for each attribute of
+each object. That's fine for a few objects, but for millions of small
+ones the generic dispatch dominates.
+
+This builds the source for a pair of functions specific to a class,
+with the attribute names and converters "inlined", and compiles them
+once, when the class is created. It is used by both the decorator and
+the metaclass versions.
+"""
+
+from .saveables import Saveable, List, Tuple, Dict
+from . import refs
+from . import migrations
+
+__all__ = []
+
+
+def make_serializers(cls, lazy=False):
+    """
+    Create specialized to_json_compat and from_json_dict functions for cls
+
+    :param cls: a class with an _attrs_to_save dict already set
+
+    :param lazy=False: If True, the container attributes are not converted
+                       when loaded -- the json-compatible values are kept,
+                       and converted when the attribute is first used.
+
+    :returns: (to_json_compat, from_json_dict) functions -- the second
+              needs to be wrapped in a classmethod.
+    """
+    namespace = {"_refs": refs, "_ref_state": refs._state,
+                 "_migrations": migrations}
+    version = getattr(cls, "_version", 0)
+    dict_lines = ["{{'__obj_type': {!r},".format(cls.__qualname__)]
+    from_lines = ["def from_json_dict(cls, dic):"]
+    if version:
+        dict_lines.append("            '__version': {!r},".format(version))
+        from_lines += ["    if dic.get('__version', 0) != {!r}:".format(version),
+                       "        dic = _migrations.migrate(cls, dic)"]
+    else:
+        # not versioned -- but the data might be from a newer version,
+        # which migrate() won't load
+        from_lines += ["    if '__version' in dic:",
+                       "        dic = _migrations.migrate(cls, dic)"]
+    from_lines += ["    if '__shared' in dic:",
+                  "        return _refs.shared_from_json_dict(cls, dic)",
+                  "    obj = cls.__new__(cls)",
+                  "    if '__id' in dic:",
+                  "        _refs.register(dic['__id'], obj)"]
+    lazy_attrs = []
+    for i, (attr, typ) in enumerate(cls._attrs_to_save.items()):
+        if attr.isidentifier():
+            get = "self.{}".format(attr)
+            set_ = "    obj.{} = {{}}".format(attr)
+        else:
+            # can't be inlined as obj.attr -- fall back to getattr/setattr
+            get = "getattr(self, {!r})".format(attr)
+            set_ = "    setattr(obj, {!r}, {{}})".format(attr)
+        # simple types don't need converting -- so don't even call the function
+        if typ.to_json_compat is Saveable.to_json_compat:
+            dict_lines.append("            {!r}: {},".format(attr, get))
+        else:
+            namespace[f"_to_{i}"] = typ.to_json_compat
+            dict_lines.append("            {!r}: _to_{}({}),".format(attr, i, get))
+        if typ.to_python is Saveable.to_python:
+            from_lines.append(set_.format("dic[{!r}]".format(attr)))
+        elif lazy and isinstance(typ, (List, Tuple, Dict)):
+            namespace[f"_from_{i}"] = typ.to_python
+            lazy_attrs.append((attr, set_.format("_from_{}(dic[{!r}])".format(i, attr))))
+        else:
+            namespace[f"_from_{i}"] = typ.to_python
+            from_lines.append(set_.format("_from_{}(dic[{!r}])".format(i, attr)))
+    dict_lines.append("            }")
+    dict_source = "\n".join(dict_lines)
+    # the plain version is used by refs for shared objects; the regular
+    # one has its own copy of the dict, to save a function call.
+    to_lines = ["def _plain_to_json_compat(self):",
+                "    return " + dict_source,
+                "",
+                "def to_json_compat(self):",
+                "    saving = _ref_state.saving",
+                "    if saving is not None and id(self) in saving.shared:",
+                "        return saving.to_json_compat(self, _plain_to_json_compat)",
+                "    return " + dict_source,
+                ]
+    if lazy_attrs:
+        # shared references have to be resolved while loading --
+        # so don't be lazy then.
+        from_lines.append("    if _ref_state.loading is None:")
+        # remove the defaults set by __new__, so that the Saveable
+        # descriptors on the class get used.
+        from_lines.extend("        delattr(obj, {!r})".format(attr)
+                          for attr, _ in lazy_attrs)
+        from_lines.append("        obj._json_pending = {{{}}}".format(
+                          ", ".join("{0!r}: dic[{0!r}]".format(attr)
+                                    for attr, _ in lazy_attrs)))
+        from_lines.append("    else:")
+        from_lines.extend("    " + line for _, line in lazy_attrs)
+    from_lines.append("    return obj")
+
+    source = "\n".join(to_lines + [""] + from_lines) + "\n"
+    code = compile(source, f"<json_save serializers for {cls.__qualname__}>", "exec")
+    exec(code, namespace)
+    to_json_compat = namespace["to_json_compat"]
+    from_json_dict = namespace["from_json_dict"]
+    # keep the source around -- handy for debugging
+    to_json_compat._source = from_json_dict._source = source
+    return to_json_compat, from_json_dict
+
+
+def make_defaults_setter(cls, slots=False):
+    """
+    Create a function that sets all the Saveable attributes of an object
+    to their defaults -- used by __new__.
+
+    :param cls: a class with an _attrs_to_save dict already set
+
+    :param slots=False: whether the class uses __slots__. If not, all the
+                        defaults are put in the instance __dict__ at once.
+    """
+    defaults = {attr: typ.default for attr, typ in cls._attrs_to_save.items()}
+    if not slots:
+        def set_defaults(obj):
+            obj.__dict__.update(defaults)
+        return set_defaults
+    namespace = {}
+    lines = ["def set_defaults(obj):"]
+    for i, (attr, default) in enumerate(defaults.items()):
+        namespace[f"_default_{i}"] = default
+        lines.append("    obj.{} = _default_{}".format(attr, i))
+    lines.append("    pass")
+    source = "\n".join(lines) + "\n"
+    exec(compile(source, f"<json_save defaults for {cls.__qualname__}>", "exec"),
+         namespace)
+    return namespace["set_defaults"]
+
+
+def slots_namespace(attr_dict):
+    """
+    Make a copy of a class namespace that uses __slots__ for the Saveable
+    attributes, rather than an instance __dict__.
+
+    The Saveables themselves are removed (they would conflict with the
+    slots), so they need to be found before this is used. Any __slots__
+    already in the class are kept.
+    """
+    extra_slots = attr_dict.get("__slots__", ())
+    if isinstance(extra_slots, str):
+        extra_slots = (extra_slots,)
+    saveables = [key for key, val in attr_dict.items() if isinstance(val, Saveable)]
+    # the slot descriptors, __dict__ etc. of a class that has already
+    # been created get made again for the new one.
+    skip = set(saveables) | set(extra_slots) | {"__dict__", "__weakref__"}
+    namespace = {key: val for key, val in attr_dict.items() if key not in skip}
+    namespace["__slots__"] = tuple(saveables) + tuple(extra_slots)
+    return namespace
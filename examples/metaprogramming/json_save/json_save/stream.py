@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+
+"""
+Streaming (incremental) JSON writing and reading for json_save
+
+to_json builds the complete to_json_compat() dict tree in memory, and
+then json.dump writes it out. from_json loads the whole document, and
+then converts it. For a large object graph, that's two full copies in
+memory.
+
+dump() walks the object graph instead, writing JSON to the file as
+it goes, so only one container element is converted at a time.
+
+iter_items() reads a file written by either dump() or to_json(), and
+yields the elements of one of the top-level object's containers one
+at a time.
+"""
+
+import json
+
+from .saveables import Saveable, List, Tuple, Dict
+
+__all__ = ['dump', 'iter_items']
+
+_encode = json.JSONEncoder().encode
+
+
+def _is_saveable_obj(val):
+    # json_save classes (decorator or metaclass) all have _attrs_to_save
+    return hasattr(val, "_attrs_to_save") and not isinstance(val, type)
+
+
+class _Writer:
+    """
+    Writes the JSON for a Saveable object to a file, a piece at a time
+    """
+
+    def __init__(self, fp, indent=None):
+        self.write = fp.write
+        self.indent = indent
+        if indent is None:
+            self.item_sep = ", "
+        else:
+            self.item_sep = ","
+
+    def newline(self, level):
+        if self.indent is not None:
+            self.write("\n" + " " * (self.indent * level))
+
+    def write_obj(self, obj, level):
+        write = self.write
+        write('{')
+        self.newline(level + 1)
+        write('"__obj_type": ' + _encode(obj.__class__.__qualname__))
+        version = getattr(obj, "_version", 0)
+        if version:
+            write(self.item_sep)
+            self.newline(level + 1)
+            write('"__version": ' + _encode(version))
+        for attr, typ in obj._attrs_to_save.items():
+            write(self.item_sep)
+            self.newline(level + 1)
+            write(_encode(attr) + ": ")
+            self.write_value(getattr(obj, attr), typ, level + 1)
+        self.newline(level)
+        write('}')
+
+    def write_value(self, val, typ, level):
+        if isinstance(typ, (List, Tuple)):
+            item_type = getattr(typ, "item_type", None)
+            if item_type is None:
+                self.write_items(val, level)
+            else:
+                # typed List -- no need to check each item
+                self.write_items(map(item_type.to_json_compat, val), level,
+                                 write_item=self.write_plain)
+        elif isinstance(typ, Dict):
+            self.write_dict(val, typ, level)
+        else:
+            self.write(_encode(typ.to_json_compat(val)))
+
+    def write_item(self, item, level):
+        # same rules as List.to_json_compat
+        if _is_saveable_obj(item):
+            self.write_obj(item, level)
+        else:
+            try:
+                item = item.to_json_compat()
+            except AttributeError:
+                pass
+            self.write(_encode(item))
+
+    def write_plain(self, item, level):
+        self.write(_encode(item))
+
+    def write_items(self, items, level, write_item=None):
+        write = self.write
+        if write_item is None:
+            write_item = self.write_item
+        write('[')
+        first = True
+        for item in items:
+            if not first:
+                write(self.item_sep)
+            first = False
+            self.newline(level + 1)
+            write_item(item, level + 1)
+        if not first:
+            self.newline(level)
+        write(']')
+
+    def write_dict(self, val, typ, level):
+        write = self.write
+        key_not_string = typ.key_not_string(val)
+        write('{')
+        first = True
+        if key_not_string:
+            self.newline(level + 1)
+            write('"__key_not_string": true')
+            first = False
+        for key, item in val.items():
+            if not first:
+                write(self.item_sep)
+            first = False
+            self.newline(level + 1)
+            write(_encode(typ.encode_key(key, key_not_string)) + ": ")
+            self.write_item(item, level + 1)
+        if not first:
+            self.newline(level)
+        write('}')
+
+
+def dump(obj, fp, indent=None):
+    """
+    Write a json_save object to an open file, without building the whole
+    json-compatible version in memory first.
+
+    :param obj: the json_save object to write
+
+    :param fp: an open, file-like object to write the json to
+
+    :param indent=None: The indentation level desired in the JSON.
+                        None is the most compact.
+    """
+    _Writer(fp, indent).write_obj(obj, 0)
+
+
+class _Reader:
+    """
+    Reads JSON from a file a piece at a time
+
+    Only knows enough about JSON syntax to walk the top-level object;
+    each value is decoded with the regular json decoder.
+    """
+    _decode = json.JSONDecoder().raw_decode
+
+    def __init__(self, fp, chunk_size=65536):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+
+    def fill(self, size):
+        """
+        read more from the file -- returns False at the end
+        """
+        data = self.fp.read(size)
+        if not data:
+            return False
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def next_char(self):
+        """
+        return the next non-whitespace character, and move past it
+        """
+        while True:
+            buffer = self.buffer
+            while self.pos < len(buffer):
+                c = buffer[self.pos]
+                self.pos += 1
+                if not c.isspace():
+                    return c
+            if not self.fill(self.chunk_size):
+                raise ValueError("Unexpected end of JSON data")
+
+    def peek_char(self):
+        c = self.next_char()
+        self.pos -= 1
+        return c
+
+    def expect(self, chars):
+        c = self.next_char()
+        if c not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON, got {c!r}")
+        return c
+
+    def value(self):
+        """
+        decode the next complete JSON value
+        """
+        self.peek_char()  # skip whitespace
+        size = self.chunk_size
+        while True:
+            try:
+                val, end = self._decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                val = end = None
+            # a number (or true, false, null) could run off the end of
+            # the buffer -- "12" may really be "12.5" -- so it's only
+            # complete if there's a delimiter after it.
+            if end is not None and end < len(self.buffer):
+                if (self.buffer[end - 1] in '"]}' or
+                        self.buffer[end] in ',]}:' or
+                        self.buffer[end].isspace()):
+                    self.pos = end
+                    return val
+            if not self.fill(size):
+                if end is None:
+                    raise ValueError("Incomplete JSON value")
+                self.pos = end
+                return val
+            # read bigger chunks if a single value is big
+            size *= 2
+
+    def members(self):
+        """
+        yield the keys of an object, leaving the reader at the start
+        of each value -- the consumer must read the value.
+        """
+        self.expect("{")
+        if self.peek_char() == "}":
+            self.next_char()
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+    def elements(self):
+        """
+        yield once per element of an array, with the reader at the start
+        of the element -- the consumer must read the value.
+        """
+        self.expect("[")
+        if self.peek_char() == "]":
+            self.next_char()
+            return
+        while True:
+            yield
+            if self.expect(",]") == "]":
+                return
+
+
+def iter_items(fp, attr, chunk_size=65536):
+    """
+    Iterate through the items of a container attribute of a saved object
+
+    :param fp: an open file-like object with a json_save object in it
+               (written by dump() or to_json())
+
+    :param attr: the name of the container attribute (List, Tuple or Dict)
+
+    :param chunk_size=65536: how much to read from the file at a time
+
+    Yields the items one at a time (or (key, value) pairs for a Dict),
+    so only one item needs to be in memory at a time.
+    """
+    reader = _Reader(fp, chunk_size)
+    typ = None
+    for key in reader.members():
+        if key == "__obj_type":
+            cls = Saveable.ALL_SAVEABLES[reader.value()]
+            typ = cls._attrs_to_save[attr]
+        elif key == attr:
+            if typ is None:
+                raise ValueError("__obj_type must come before the attributes")
+            yield from _iter_container(reader, typ)
+            return
+        else:
+            # not the one we want -- read it and throw it away
+            reader.value()
+    raise KeyError(attr)
+
+
+def _iter_container(reader, typ):
+    if isinstance(typ, Dict):
+        key_not_string = False
+        for key in reader.members():
+            if key == "__key_not_string":
+                key_not_string = reader.value()
+                continue
+            # let the Dict do the conversion, so keys are handled the same.
+            item = {key: reader.value()}
+            if key_not_string:
+                item["__key_not_string"] = True
+            yield next(iter(typ.to_python(item).items()))
+    elif isinstance(typ, (List, Tuple)):
+        for _ in reader.elements():
+            yield typ.to_python([reader.value()])[0]
+    else:
+        raise TypeError(f"{typ.__class__.__name__} is not a container Saveable")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+"""
+tests for the pluggable json backends
+"""
+
+import io
+import math
+
+import pytest
+
+import json_save.json_save_dec as js
+from json_save import backends
+
+
+@js.json_save
+class Simple:
+    a = js.Int()
+    b = js.Float()
+    c = js.String()
+    lst = js.List()
+
+
+@pytest.fixture
+def obj():
+    o = Simple()
+    o.a, o.b, o.c, o.lst = 3, 4.5, "a/string", [1, 2, {"this": 3}]
+    return o
+
+
+@pytest.fixture(params=list(backends.available_backends()))
+def backend(request):
+    """
+    runs the test with each installed backend, and puts it back after.
+    """
+    current = backends.get_backend()
+    yield backends.set_backend(request.param)
+    backends.set_backend(current.name)
+
+
+def test_json_always_available():
+    assert "json" in backends.available_backends()
+
+
+def test_default_is_preferred():
+    best = list(backends.available_backends())[0]
+    assert backends.set_backend().name == best
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        backends.set_backend("not_a_json_lib")
+
+
+def test_round_trip(backend, obj):
+    assert js.from_json(obj.to_json()) == obj
+
+
+@pytest.mark.parametrize('value', [float('inf'), float('-inf')])
+def test_round_trip_inf(backend, obj, value):
+    obj.b = value
+    obj.lst.append(value)
+    assert js.from_json(obj.to_json()) == obj
+
+
+def test_round_trip_nan(backend, obj):
+    # nan != nan, so check it's still nan
+    obj.b = float('nan')
+    obj.lst = [None, float('nan')]
+    new = js.from_json(obj.to_json())
+    assert math.isnan(new.b)
+    assert new.lst[0] is None
+    assert math.isnan(new.lst[1])
+
+
+@pytest.mark.parametrize('value', [2 ** 64, -2 ** 63 - 1, 10 ** 30])
+def test_round_trip_big_int(backend, obj, value):
+    obj.a = value
+    obj.lst.append(value)
+    assert js.from_json(obj.to_json()) == obj
+
+
+def test_round_trip_file(backend, obj):
+    f = io.StringIO()
+    obj.to_json(f)
+    f.seek(0)
+    assert js.from_json(f) == obj
+
+
+def test_compact_by_default(backend, obj):
+    assert "\n" not in obj.to_json()
+
+
+def test_indent(backend, obj):
+    assert "\n" in obj.to_json(indent=4)
+
+
+@pytest.mark.parametrize('indent', [None, 0, 2, 4])
+def test_indent_same_as_stdlib(backend, obj, indent):
+    """
+    the same indentation as the stdlib json -- with or without data
+    that makes the fast ones fall back to it
+    """
+    stdlib = backends.available_backends()["json"]
+    for value in [4.5, float("nan")]:
+        obj.b = value
+        compat = obj.to_json_compat()
+        text = obj.to_json(indent=indent)
+        assert text.count("\n") == stdlib.dumps(compat, indent).count("\n")
+        widths = {len(line) - len(line.lstrip(" ")) for line in text.splitlines()}
+        expected = {len(line) - len(line.lstrip(" "))
+                    for line in stdlib.dumps(compat, indent).splitlines()}
+        assert widths == expected
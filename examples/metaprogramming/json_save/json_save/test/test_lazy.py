@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+"""
+tests for lazy loading of attributes
+"""
+
+import json_save.json_save_dec as js
+import json_save.json_save_meta as jsm
+
+
+@js.json_save
+class Item:
+    a = js.Int()
+
+    def __init__(self, a=0):
+        self.a = a
+
+
+@js.json_save(lazy=True)
+class LazyDec:
+    x = js.Int()
+    items = js.List()
+    d = js.Dict(key=js.Int)
+
+
+class LazyMeta(jsm.JsonSaveable, lazy=True):
+    x = jsm.Int()
+    items = jsm.List()
+
+
+def make_lazy_dec():
+    obj = LazyDec()
+    obj.x = 5
+    obj.items = [Item(1), Item(2)]
+    obj.d = {1: Item(3)}
+    return obj
+
+
+def test_not_converted_until_used():
+    obj = LazyDec.from_json_dict(make_lazy_dec().to_json_compat())
+    assert "items" not in vars(obj)
+    assert "d" not in vars(obj)
+    # simple ones are converted right away
+    assert vars(obj)["x"] == 5
+
+    items = obj.items
+    assert items == [Item(1), Item(2)]
+    assert vars(obj)["items"] is items
+    assert "d" not in vars(obj)
+
+
+def test_lazy_round_trip():
+    obj = make_lazy_dec()
+    obj2 = js.from_json(obj.to_json())
+    assert obj2 == obj
+    assert obj2.d[1] == Item(3)
+
+
+def test_lazy_resave():
+    """
+    saving an object that hasn't been all used yet
+    """
+    obj = make_lazy_dec()
+    obj2 = js.from_json(obj.to_json())
+    assert js.from_json(obj2.to_json()) == obj
+
+
+def test_lazy_set_before_used():
+    obj = js.from_json(make_lazy_dec().to_json())
+    obj.items = []
+    assert obj.items == []
+
+
+def test_lazy_shared():
+    """
+    shared references get resolved right away
+    """
+    obj = make_lazy_dec()
+    obj.items.append(obj.items[0])
+    obj2 = js.from_json(obj.to_json(shared=True))
+    assert obj2.items[0] is obj2.items[2]
+
+
+def test_lazy_meta():
+    obj = LazyMeta()
+    obj.x = 3
+    obj.items = [Item(4)]
+    obj2 = jsm.from_json(obj.to_json())
+    assert "items" not in vars(obj2)
+    assert obj2 == obj
+
+
+def test_class_attribute():
+    """
+    the Saveable is still there on the class
+    """
+    assert isinstance(LazyDec.items, js.List)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+"""
+tests for versioning and migrating saved data
+"""
+
+import io
+import json
+
+import pytest
+
+import json_save.json_save_dec as js
+import json_save.json_save_meta as jsm
+from json_save.migrations import migration, migrate_file
+
+
+# version 0 of the Person class had "name" and "phone"
+OLD_PERSON = {"__obj_type": "Person", "name": "Fred", "phone": "555-1234"}
+
+
+@js.json_save(version=2)
+class Person:
+    # version 1 renamed name to full_name
+    full_name = js.String()
+    # version 2 added email, with no migration needed
+    email = js.String()
+    phone = js.String()
+
+
+@migration("Person", from_version=0)
+def rename_name(dic):
+    dic["full_name"] = dic.pop("name")
+    return dic
+
+
+@js.json_save
+class Club:
+    name = js.String()
+    members = js.List()
+    by_phone = js.Dict()
+
+
+class MetaThing(jsm.JsonSaveable, version=1):
+    size = jsm.Float()
+
+
+@migration(MetaThing, from_version=0)
+def inches_to_cm(dic):
+    dic["size"] = dic.pop("inches") * 2.54
+    return dic
+
+
+def test_version_saved():
+    p = Person()
+    assert p.to_json_compat()["__version"] == 2
+
+
+def test_no_version_unversioned():
+    c = Club()
+    assert "__version" not in c.to_json_compat()
+
+
+def test_load_old():
+    p = Person.from_json_dict(OLD_PERSON)
+    assert p.full_name == "Fred"
+    assert p.phone == "555-1234"
+    assert p.email == ""
+
+
+def test_load_old_doesnt_change_input():
+    old = dict(OLD_PERSON)
+    Person.from_json_dict(old)
+    assert old == OLD_PERSON
+
+
+def test_load_current():
+    p = Person()
+    p.full_name = "Bob"
+    assert js.from_json(p.to_json()) == p
+
+
+def test_load_newer():
+    with pytest.raises(ValueError):
+        Person.from_json_dict(dict(OLD_PERSON, __version=3))
+
+
+def test_load_newer_not_versioned():
+    """
+    a class that isn't versioned yet can't load data from a newer version
+    """
+    club = {"__obj_type": "Club", "__version": 1, "name": "chess",
+            "members": [], "by_phone": {}}
+    with pytest.raises(ValueError):
+        Club.from_json_dict(club)
+    club["__version"] = 0
+    assert Club.from_json_dict(club).name == "chess"
+
+
+class MetaUnversioned(jsm.JsonSaveable):
+    size = jsm.Float()
+
+
+def test_load_newer_not_versioned_meta():
+    with pytest.raises(ValueError):
+        jsm.from_json_dict({"__obj_type": "MetaUnversioned",
+                            "__version": 2, "size": 1.0})
+
+
+def test_load_old_meta():
+    thing = jsm.from_json_dict({"__obj_type": "MetaThing", "inches": 10})
+    assert thing.size == pytest.approx(25.4)
+
+
+def test_nested_old():
+    club = {"__obj_type": "Club",
+            "name": "chess",
+            "members": [OLD_PERSON, OLD_PERSON],
+            "by_phone": {"555-1234": OLD_PERSON},
+            }
+    c = Club.from_json_dict(club)
+    assert c.members[1].full_name == "Fred"
+    assert c.by_phone["555-1234"].full_name == "Fred"
+
+
+def test_migrate_file():
+    old = {"__obj_type": "Club",
+           "name": "chess",
+           "members": [OLD_PERSON] * 10,
+           "by_phone": {"555-1234": OLD_PERSON},
+           }
+    infile = io.StringIO(json.dumps(old, indent=4))
+    outfile = io.StringIO()
+    migrate_file(infile, outfile)
+
+    new = json.loads(outfile.getvalue())
+    member = new["members"][0]
+    assert member["full_name"] == "Fred"
+    assert member["email"] == ""
+    assert member["__version"] == 2
+    assert "name" not in member
+    assert new["by_phone"]["555-1234"]["full_name"] == "Fred"
+
+    club = js.from_json(outfile.getvalue())
+    assert len(club.members) == 10
+
+
+def test_migrate_file_top_level():
+    old = dict(OLD_PERSON)
+    outfile = io.StringIO()
+    migrate_file(io.StringIO(json.dumps(old)), outfile)
+    new = json.loads(outfile.getvalue())
+    assert new == {"__obj_type": "Person", "__version": 2,
+                   "full_name": "Fred", "phone": "555-1234", "email": ""}
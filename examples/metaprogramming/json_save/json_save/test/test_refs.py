@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+
+"""
+tests for sharing repeated objects in the saved json
+"""
+
+import json
+import threading
+
+import pytest
+
+import json_save.json_save_dec as js
+import json_save.json_save_meta as jsm
+from json_save import refs
+
+
+# a little version of the nosql address book model:
+@js.json_save
+class Address:
+    line_1 = js.String()
+    city = js.String()
+
+    def __init__(self, line_1="", city=""):
+        self.line_1 = line_1
+        self.city = city
+
+
+@js.json_save
+class Household:
+    name = js.String()
+    addresses = js.List()
+    # so it can refer back to itself
+    related = js.Dict()
+
+    def __init__(self, name="", addresses=()):
+        self.name = name
+        self.addresses = list(addresses)
+        self.related = {}
+
+
+@js.json_save
+class AddressBook:
+    households = js.List()
+
+    def __init__(self, households=()):
+        self.households = list(households)
+
+
+class MetaAddress(jsm.JsonSaveable):
+    city = jsm.String()
+
+
+class MetaBook(jsm.JsonSaveable):
+    places = jsm.List()
+
+
+@pytest.fixture
+def book():
+    addr = Address("123 Some St", "Seattle")
+    other = Address("1 Other St", "Tacoma")
+    households = [Household(f"house {i}", [addr, other]) for i in range(10)]
+    households.append(Household("just other", [other]))
+    return AddressBook(households)
+
+
+def test_shared_round_trip(book):
+    book2 = js.from_json(book.to_json(shared=True))
+    assert book2 == book
+
+
+def test_shared_identity(book):
+    book2 = js.from_json(book.to_json(shared=True))
+    addr = book2.households[0].addresses[0]
+    assert all(h.addresses[0] is addr for h in book2.households[:10])
+    other = book2.households[-1].addresses[0]
+    assert all(h.addresses[1] is other for h in book2.households[:10])
+    assert addr is not other
+
+
+def test_not_shared_identity(book):
+    """
+    the default is still to make a separate copy of each
+    """
+    book2 = js.from_json(book.to_json())
+    assert book2 == book
+    assert book2.households[0].addresses[0] is not book2.households[1].addresses[0]
+
+
+def test_shared_smaller(book):
+    assert len(book.to_json(shared=True)) < len(book.to_json())
+
+
+def test_only_shared_get_ids(book):
+    compat = json.loads(book.to_json(shared=True))
+    assert compat["__shared"] is True
+    house = compat["households"][0]
+    assert "__id" not in house
+    assert "__id" in house["addresses"][0]
+    assert compat["households"][1]["addresses"][0] == {"__ref": house["addresses"][0]["__id"]}
+
+
+def test_cycle():
+    house = Household("home", [Address("123 Some St", "Seattle")])
+    house.related["self"] = house
+    house2 = js.from_json(house.to_json(shared=True))
+    assert house2.related["self"] is house2
+    assert house2.addresses[0].city == "Seattle"
+
+
+def test_meta_shared():
+    addr = MetaAddress()
+    addr.city = "Seattle"
+    book = MetaBook()
+    book.places = [addr, addr, addr]
+    book2 = jsm.from_json(book.to_json(shared=True))
+    assert book2.places[0] is book2.places[1] is book2.places[2]
+    assert book2.places[0].city == "Seattle"
+
+
+def run_in_thread(func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_other_thread_load_not_shared(book):
+    """
+    a shared load in one thread doesn't change a load in another
+    """
+    refs._state.loading = {0: "the wrong object"}
+    try:
+        house = run_in_thread(lambda: js.from_json_dict(
+            {"__obj_type": "Household", "name": "x",
+             "addresses": [{"__ref": 0}], "related": {}}))
+    finally:
+        refs._state.loading = None
+    assert house.addresses == [{"__ref": 0}]
+
+
+def test_other_thread_save_not_shared(book):
+    refs._state.saving = refs.SaveMemo(book)
+    try:
+        compat = run_in_thread(book.to_json_compat)
+    finally:
+        refs._state.saving = None
+    assert compat == json.loads(book.to_json())
+
+
+def test_threads_at_once(book):
+    """
+    lots of shared saves and loads at once
+    """
+    errors = []
+
+    def work():
+        try:
+            for i in range(50):
+                book2 = js.from_json(book.to_json(shared=True))
+                assert book2 == book
+                addr = book2.households[0].addresses[0]
+                assert all(h.addresses[0] is addr for h in book2.households[:10])
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=work) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+@js.json_save
+class Groups:
+    groups = js.List(js.List())
+    sizes = js.List(js.Int)
+
+
+def test_shared_in_typed_list_of_lists():
+    addr = Address("123 Some St", "Seattle")
+    groups = Groups()
+    groups.groups = [[addr, addr], [addr]]
+    groups.sizes = [2, 1]
+    compat = json.loads(groups.to_json(shared=True))
+    # written in full once
+    assert json.dumps(compat).count("Seattle") == 1
+    groups2 = js.from_json(groups.to_json(shared=True))
+    assert groups2.groups[0][0] is groups2.groups[0][1] is groups2.groups[1][0]
+    assert groups2.sizes == [2, 1]
@@ -85,3 +85,90 @@ bad_dicts = [{"this": "string_key", 4: "int_key"},
 def test_bad_dicts(val):
     with pytest.raises(TypeError):
         Dict.to_json_compat(val)
+
+
+typed_lists = [(Float, [1.0, 2.5, 3.25]),
+               (Float, []),
+               (Int, [1, 2, 3]),
+               (String, ["this", "that"]),
+               (Bool, [True, False]),
+               (Tuple, [(1, 2), (3, 4)]),  # only works with a typed list
+               ]
+
+
+@pytest.mark.parametrize(('item_type', 'val'), typed_lists)
+def test_typed_list(item_type, val):
+    typ = List(item_type)
+    js = json.dumps(typ.to_json_compat(val))
+    val2 = typ.to_python(json.loads(js))
+    assert val == val2
+    assert type(val2) is list
+    for item, item2 in zip(val, val2):
+        assert type(item) is type(item2)
+
+
+def test_typed_list_converts():
+    """
+    ints saved in a Float list come back as floats
+    """
+    val = List(Float).to_python([1, 2, 3])
+    assert val == [1.0, 2.0, 3.0]
+    assert all(type(v) is float for v in val)
+
+
+def test_typed_list_bad_type():
+    with pytest.raises(TypeError):
+        List(float)
+
+
+def test_untyped_list_unchanged():
+    """
+    the class level methods still do the generic conversion
+    """
+    assert List.to_json_compat is not List(Float).to_json_compat
+    assert List().to_json_compat is List.to_json_compat
+
+
+typed_dicts = [(String, {"this": 14, "that": 1.23}),
+               (Int, {34: 15, 23: 5, -4: "neg"}),
+               (Float, {3.4: "float_key", 1.2: "float_key", 1e300: "big"}),
+               (Bool, {True: "yes", False: "no"}),
+               (Tuple, {(1, 2, 3): "tuple_key", ("this", 4.5): "mixed"}),
+               (Tuple, {((1, 2), 3): "nested", (((),), ("a", (4,))): "deep"}),
+               (Int, {}),
+               ]
+
+
+@pytest.mark.parametrize(('key', 'val'), typed_dicts)
+def test_typed_dicts(key, val):
+    typ = Dict(key=key)
+    js = json.dumps(typ.to_json_compat(val))
+    val2 = typ.to_python(json.loads(js))
+    assert val == val2
+    for k1, k2 in zip(val.keys(), val2.keys()):
+        assert type(k1) is type(k2)
+
+
+def test_typed_dict_instance_key():
+    val = {1: 2}
+    typ = Dict(key=Int())
+    assert typ.to_python(typ.to_json_compat(val)) == val
+
+
+def test_typed_dict_wrong_key():
+    with pytest.raises(TypeError):
+        Dict(key=Int).to_json_compat({1: 2, "3": 4})
+
+
+def test_typed_dict_unsupported_key():
+    with pytest.raises(TypeError):
+        Dict(key=List)
+
+
+def test_typed_dict_reads_untyped():
+    """
+    a typed Dict can read what an untyped one saved
+    """
+    val = {34: 15, 23: 5}
+    js = json.dumps(Dict.to_json_compat(val))
+    assert Dict(key=Int).to_python(json.loads(js)) == val
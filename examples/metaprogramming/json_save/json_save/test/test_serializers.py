@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+tests for the generated per-class serializers
+"""
+
+import json_save.json_save_dec as js
+import json_save.json_save_meta as jsm
+from json_save.serializers import make_serializers
+
+
+@js.json_save
+class DecClass:
+    x = js.Int()
+    s = js.String()
+    l = js.List(js.Float)
+
+
+class MetaClass(jsm.JsonSaveable):
+    x = jsm.Int()
+    s = jsm.String()
+    l = jsm.List()
+
+
+class CustomMeta(jsm.JsonSaveable):
+    x = jsm.Int()
+
+    def to_json_compat(self):
+        return {"__obj_type": "CustomMeta", "x": self.x * 2}
+
+
+def test_dec_uses_generated():
+    assert "self.x" in DecClass.to_json_compat._source
+
+
+def test_meta_uses_generated():
+    assert "self.x" in MetaClass.to_json_compat._source
+
+
+def test_meta_custom_method_kept():
+    obj = CustomMeta()
+    obj.x = 3
+    assert obj.to_json_compat()["x"] == 6
+
+
+def test_round_trip_dec():
+    obj = DecClass()
+    obj.x, obj.s, obj.l = 5, "this", [1.0, 2.5]
+    compat = obj.to_json_compat()
+    assert compat == {"__obj_type": "DecClass", "x": 5, "s": "this", "l": [1.0, 2.5]}
+    assert DecClass.from_json_dict(compat) == obj
+
+
+def test_round_trip_meta():
+    obj = MetaClass()
+    obj.x, obj.s, obj.l = 5, "this", [DecClass(), 4]
+    obj2 = MetaClass.from_json_dict(obj.to_json_compat())
+    assert obj2 == obj
+
+
+def test_not_identifier():
+    """
+    attribute names that can't be written as obj.attr still work
+    """
+    class Odd:
+        _attrs_to_save = {"not valid": js.Int(), "ok": js.Int()}
+    to_json_compat, from_json_dict = make_serializers(Odd)
+    obj = Odd()
+    setattr(obj, "not valid", 3)
+    obj.ok = 4
+    compat = to_json_compat(obj)
+    assert compat == {"__obj_type": Odd.__qualname__, "not valid": 3, "ok": 4}
+    obj2 = from_json_dict(Odd, compat)
+    assert getattr(obj2, "not valid") == 3
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+"""
+tests for json_save classes using __slots__
+"""
+
+import pytest
+
+import json_save.json_save_dec as js
+import json_save.json_save_meta as jsm
+
+
+@js.json_save(slots=True)
+class SlotDec:
+    __slots__ = ("extra",)
+    x = js.Int()
+    y = js.Float()
+    lst = js.List()
+
+    def __init__(self, x=None, y=None):
+        if x is not None:
+            self.x = x
+        if y is not None:
+            self.y = y
+        self.extra = "not saved"
+
+    @property
+    def total(self):
+        return self.x + self.y
+
+
+class SlotMeta(jsm.JsonSaveable, slots=True):
+    x = jsm.Int()
+    s = jsm.String()
+
+    def __init__(self, x=0, s=""):
+        self.x = x
+        self.s = s
+
+
+def test_no_dict():
+    obj = SlotDec(1, 2.0)
+    assert not hasattr(obj, "__dict__")
+    assert not hasattr(SlotMeta(), "__dict__")
+
+
+def test_no_other_attributes():
+    obj = SlotDec(1, 2.0)
+    with pytest.raises(AttributeError):
+        obj.something_else = 5
+
+
+def test_defaults():
+    obj = SlotDec()
+    assert obj.x == 0
+    assert obj.y == 0.0
+    assert obj.lst == []
+    obj = SlotMeta.__new__(SlotMeta)
+    assert obj.s == ""
+
+
+def test_methods_kept():
+    obj = SlotDec(3, 4.5)
+    assert obj.total == 7.5
+    assert obj.extra == "not saved"
+
+
+def test_round_trip_dec():
+    obj = SlotDec(3, 4.5)
+    obj.lst = [SlotDec(1, 2.0), 5]
+    obj2 = js.from_json(obj.to_json())
+    assert type(obj2) is SlotDec
+    assert obj2 == obj
+
+
+def test_round_trip_meta():
+    obj = SlotMeta(3, "this")
+    obj2 = jsm.from_json(obj.to_json())
+    assert obj2 == obj
+
+
+def test_lazy_and_slots():
+    with pytest.raises(TypeError):
+        @js.json_save(lazy=True, slots=True)
+        class Both:
+            x = js.Int()
+
+    with pytest.raises(TypeError):
+        class MetaBoth(jsm.JsonSaveable, lazy=True, slots=True):
+            x = jsm.Int()
+
+
+class Base:
+    __slots__ = ("base_set",)
+
+    def __init__(self):
+        self.base_set = True
+
+    @classmethod
+    def make(cls):
+        return cls()
+
+    def describe(self):
+        return "base"
+
+
+@js.json_save(slots=True)
+class SlotSuper(Base):
+    x = js.Int()
+
+    def __init__(self, x=0):
+        super().__init__()
+        self.x = x
+
+    @classmethod
+    def make(cls):
+        obj = super().make()
+        obj.x = 5
+        return obj
+
+    @property
+    def description(self):
+        return super().describe() + " " + __class__.__name__
+
+
+def test_zero_arg_super():
+    """
+    the class is made again for the slots -- super() still works
+    """
+    obj = SlotSuper(3)
+    assert obj.base_set
+    assert obj.x == 3
+    assert SlotSuper.make().x == 5
+    assert obj.description == "base SlotSuper"
+    assert js.from_json(obj.to_json()) == obj
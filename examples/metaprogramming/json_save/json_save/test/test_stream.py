@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+
+"""
+tests for streaming json writing and reading
+"""
+
+import io
+import json
+
+import pytest
+
+import json_save.json_save_dec as js
+from json_save import stream
+
+
+@js.json_save
+class Point:
+    x = js.Int()
+    y = js.Float()
+
+    def __init__(self, x=0, y=0.0):
+        self.x = x
+        self.y = y
+
+
+@js.json_save
+class Collection:
+    name = js.String()
+    points = js.List()
+    values = js.List(js.Float)
+    by_key = js.Dict()
+    by_num = js.Dict()
+    empty = js.List()
+
+
+@pytest.fixture
+def collection():
+    c = Collection()
+    c.name = 'a "quoted" name'
+    c.points = [Point(i, i / 2) for i in range(100)] + [3, "this", [1, 2]]
+    c.values = [1.5, 2.5, 3.5]
+    c.by_key = {"one": Point(1, 1.0), "two": 2}
+    c.by_num = {(1, 2): "tuple", (3, 4): Point(3, 4.0)}
+    c.empty = []
+    return c
+
+
+@pytest.mark.parametrize('indent', [None, 0, 4])
+def test_dump_same_as_to_json(collection, indent):
+    f = io.StringIO()
+    stream.dump(collection, f, indent=indent)
+    assert json.loads(f.getvalue()) == collection.to_json_compat()
+
+
+def test_dump_round_trip(collection):
+    f = io.StringIO()
+    stream.dump(collection, f)
+    f.seek(0)
+    assert js.from_json(f) == collection
+
+
+# small chunk size so values are split across reads
+@pytest.mark.parametrize('chunk_size', [1, 7, 65536])
+def test_iter_items_list(collection, chunk_size):
+    f = io.StringIO(collection.to_json())
+    items = list(stream.iter_items(f, "points", chunk_size=chunk_size))
+    assert items == collection.points
+
+
+def test_iter_items_typed_list(collection):
+    f = io.StringIO(collection.to_json())
+    items = list(stream.iter_items(f, "values"))
+    assert items == collection.values
+
+
+@js.json_save
+class Floats:
+    values = js.List(js.Float)
+
+
+# every chunk size up to 40, so numbers get split at every place --
+# "12" at the end of a chunk is not the whole of "12.375e-05"
+@pytest.mark.parametrize('chunk_size', range(1, 40))
+def test_iter_items_floats_split(chunk_size):
+    floats = Floats()
+    floats.values = [(i + 0.375) * 10.0 ** (i % 7 - 3) for i in range(20)]
+    f = io.StringIO()
+    stream.dump(floats, f)
+    f.seek(0)
+    items = list(stream.iter_items(f, "values", chunk_size=chunk_size))
+    assert items == floats.values
+
+
+def test_iter_items_dict(collection):
+    f = io.StringIO()
+    stream.dump(collection, f)
+    f.seek(0)
+    assert dict(stream.iter_items(f, "by_key")) == collection.by_key
+    f.seek(0)
+    assert dict(stream.iter_items(f, "by_num")) == collection.by_num
+
+
+def test_iter_items_empty(collection):
+    f = io.StringIO(collection.to_json(indent=None))
+    assert list(stream.iter_items(f, "empty")) == []
+
+
+def test_iter_items_not_container(collection):
+    f = io.StringIO(collection.to_json())
+    with pytest.raises(TypeError):
+        list(stream.iter_items(f, "name"))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of building the trigrams: trigram.build_trigram() vs. TrigramModel
+
+The words of the text are repeated to make a bigger corpus (each copy
+with some of the words changed, so there are new trigrams in each one).
+The time to build, and the peak memory allocated while building
+(as measured by tracemalloc, not counting the list of words), are shown.
+tracemalloc slows things down a lot, so each one is built twice: once
+for the time, and again for the memory.
+
+Then the whole thing -- reading the file (times times) and building --
+is done both ways: reading it all in and splitting it up, as trigram.py
+does, vs. build_model(), which streams the words a line at a time.
+
+$ python bench_trigram.py [filename] [times]
+"""
+
+import sys
+import time
+import tracemalloc
+
+from trigram import read_in_data, make_words, build_trigram
+from trigram_engine import TrigramModel, build_model
+
+
+def scaled_words(words, times):
+    # change every 50th word in each copy, so they aren't all the same
+    result = []
+    for copy in range(times):
+        new = list(words)
+        for i in range(copy % 50, len(new), 50):
+            new[i] = "{}{}".format(new[i], copy)
+        result.extend(new)
+    return result
+
+
+def measure(msg, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print("    {:28s} {:7.3f}s  {:8.1f} MB peak".format(msg, elapsed, peak / 1e6))
+    return result
+
+
+def build_words(words):
+    model = TrigramModel()
+    model.add_words(words)
+    model.freeze()
+    return model
+
+
+def main(filename, times):
+    words = scaled_words(make_words(read_in_data(filename)), times)
+    print("{} words".format(len(words)))
+    word_pairs = measure("build_trigram", lambda: build_trigram(words))
+    print("        {} pairs".format(len(word_pairs)))
+    del word_pairs
+    model = measure("TrigramModel", lambda: build_words(words))
+    print("        {} different trigrams, {} words".format(len(model),
+                                                          len(model.word_ids)))
+    del words, model
+
+    print("reading {} copies of {} and building".format(times, filename))
+
+    def read_all():
+        text = " ".join(read_in_data(filename) for i in range(times))
+        return build_trigram(make_words(text))
+    measure("read_in_data + build_trigram", read_all)
+    measure("build_model (streaming)", lambda: build_model([filename] * times))
+
+
+if __name__ == "__main__":
+    filename = sys.argv[1] if len(sys.argv) > 1 else "sherlock.txt"
+    times = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    main(filename, times)
@@ -0,0 +1,142 @@
+"""
+tests for the integer-encoded trigram engine
+"""
+
+import io
+import random
+import sys
+from collections import Counter
+
+import pytest
+
+from trigram import build_trigram, make_words, read_in_data
+from trigram_engine import TrigramModel, build_model, iter_lines, iter_words
+
+WORDS = "I wish I may I wish I might".split()
+
+
+def sorted_dict(word_pairs):
+    # to_dict() has the same followers as build_trigram(), but not in
+    # the same order
+    return {pair: sorted(followers) for pair, followers in word_pairs.items()}
+
+
+def test_same_as_build_trigram():
+    model = TrigramModel()
+    model.add_words(WORDS)
+    assert sorted_dict(model.to_dict()) == sorted_dict(build_trigram(WORDS))
+
+
+def test_followers():
+    model = TrigramModel()
+    model.add_words(WORDS)
+    assert model.followers("I", "wish") == {"I": 2}
+    assert model.followers("wish", "I") == {"may": 1, "might": 1}
+    assert model.followers("I", "might") == {}
+    assert model.followers("not", "there") == {}
+    assert len(model) == 5
+
+
+def test_add_in_pieces():
+    """
+    adding the words in batches gives the same trigrams as all at once
+    """
+    model = TrigramModel()
+    model.add_words(WORDS[:3])
+    model.add_words(WORDS[3:4])
+    model.add_words(WORDS[4:])
+    assert sorted_dict(model.to_dict()) == sorted_dict(build_trigram(WORDS))
+
+
+def test_small_chunks():
+    """
+    the trigrams that cross from one chunk to the next are all there
+    """
+    model = TrigramModel()
+    model.chunk_size = 2
+    model.add_words(iter(WORDS))
+    assert sorted_dict(model.to_dict()) == sorted_dict(build_trigram(WORDS))
+
+
+def test_sherlock():
+    words = make_words(read_in_data("sherlock_small.txt"))
+    model = TrigramModel()
+    model.add_words(words)
+    assert sorted_dict(model.to_dict()) == sorted_dict(build_trigram(words))
+
+
+def test_build_text():
+    random.seed(2)
+    model = TrigramModel()
+    model.add_words(make_words(read_in_data("sherlock_small.txt")))
+    text = model.build_text()
+    assert text.count(".") >= 10
+    for first, second, third in zip(text.split(), text.split()[1:], text.split()[2:]):
+        if not (first.endswith(".") or second.endswith(".")):
+            assert third.rstrip(".") in model.followers(first.lower() if first != "I"
+                                                        else first, second)
+
+
+def test_iter_words_same_as_make_words():
+    words = list(iter_words(iter_lines(["sherlock.txt"])))
+    assert words == make_words(read_in_data("sherlock.txt"))
+
+
+def test_build_model_from_files():
+    model = build_model(["sherlock_small.txt", "sherlock_small.txt"])
+    text = read_in_data("sherlock_small.txt")
+    words = make_words(" ".join([text, text]))
+    assert sorted_dict(model.to_dict()) == sorted_dict(build_trigram(words))
+
+
+def test_build_model_from_stdin(monkeypatch):
+    with open("sherlock_small.txt") as infile:
+        monkeypatch.setattr(sys, "stdin", io.StringIO(infile.read()))
+    model = build_model(["-"])
+    words = make_words(read_in_data("sherlock_small.txt"))
+    assert sorted_dict(model.to_dict()) == sorted_dict(build_trigram(words))
+
+
+def test_iter_lines_is_lazy():
+    """
+    only the lines that are asked for are read
+    """
+    infile = io.StringIO("".join("line {}\n".format(i) for i in range(1000)))
+    sys_stdin, sys.stdin = sys.stdin, infile
+    try:
+        lines = iter_lines(["-"], header_lines=2)
+        assert next(lines) == "line 2\n"
+        assert infile.readline() == "line 3\n"
+    finally:
+        sys.stdin = sys_stdin
+
+
+def test_too_many_words(monkeypatch):
+    monkeypatch.setattr(TrigramModel, "MAX_WORDS", 5)
+    model = TrigramModel()
+    model.add_words(["a", "b", "c", "a", "b"])
+    with pytest.raises(ValueError):
+        model.add_words(["d", "e", "f"])
+    # nothing was added
+    assert list(model.word_ids) == ["a", "b", "c"]
+    assert len(model) == 3
+    # it can still go on
+    model.add_words(["d", "a", "e"])
+    assert len(model.word_ids) == 5
+
+
+def test_random_pair_even():
+    """
+    every pair is as likely as every other -- no matter how many
+    followers it has
+    """
+    random.seed(5)
+    model = TrigramModel()
+    # ("a", "b") has 10 different followers, ("b", "x") has 1
+    words = []
+    for i in range(10):
+        words += ["a", "b", "w{}".format(i)]
+    model.add_words(words)
+    pairs = Counter(tuple(model.random_pair()) for i in range(3000))
+    assert len(pairs) == len(model.to_dict())
+    assert max(pairs.values()) < 2 * min(pairs.values())
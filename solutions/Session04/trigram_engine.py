@@ -0,0 +1,297 @@
+#!/usr/bin/env python
+
+"""
+trigram_engine.py
+
+A faster, smaller version of the trigram builder in trigram.py
+
+build_trigram() in trigram.py makes a new tuple for every word pair in
+the text, and keeps a list of every word that follows each pair --
+so the whole text is stored again, a pointer per word.
+
+This version:
+
+ * gives each word an integer id (the first time it's seen)
+ * packs the ids of the three words of a trigram into a single integer
+ * counts how many times each trigram shows up, with a Counter
+
+So each different trigram is stored once, with a count, no matter
+how many times it's in the text.
+
+For making new text, freeze() sorts the trigrams into compact arrays,
+where all the followers of a pair are next to each other.
+
+Use it like this:
+
+    model = TrigramModel()
+    model.add_words(words)
+    print(model.build_text())
+
+or, to read the words from files (or stdin) a line at a time, rather
+than reading in the whole book and splitting it up:
+
+    model = build_model(["sherlock.txt", "another_book.txt"])
+
+From the command line:
+
+    $ python trigram_engine.py sherlock.txt another_book.txt
+    $ cat sherlock.txt | python trigram_engine.py -
+"""
+
+import sys
+import random
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from itertools import islice
+
+from trigram import make_words
+
+
+class TrigramModel:
+    """
+    word-pair -> follower counts, with the words stored as integer ids
+    """
+
+    # bits for each word id in a packed trigram -- three of them have to
+    # fit in 63 bits, so the array of them can be a signed 64 bit int
+    BITS = 21
+    MAX_WORDS = 1 << BITS
+
+    # how many words to add at once
+    chunk_size = 100000
+
+    def __init__(self):
+        # word -> id. The ids are in the order they are added to
+        # the dict, so the list of words can be made from it.
+        self.word_ids = {}
+        # packed trigram -> count
+        self.counts = Counter()
+        # the last two ids added, so the next batch of words carries on
+        self._tail = []
+        # the frozen (sorted array) version
+        self._keys = None
+        self._weights = None
+        self._words = None
+        self._pairs = None
+
+    def add_words(self, words):
+        """
+        add the trigrams from an iterable of words
+
+        It can be called more than once -- the words are treated as if
+        they follow on from the ones added last time.
+
+        The words are done a chunk at a time, so the ids of all of them
+        are never in memory at once.
+        """
+        words = iter(words)
+        while True:
+            chunk = list(islice(words, self.chunk_size))
+            if not chunk:
+                break
+            self._add_chunk(chunk)
+        # not frozen any more
+        self._keys = None
+
+    def _add_chunk(self, words):
+        word_ids = self.word_ids
+        # checked before anything is added, so the model isn't left
+        # half done -- only counting the new words if there might be
+        # too many
+        if (len(word_ids) + len(words) > self.MAX_WORDS and
+                len(word_ids) + len(set(words).difference(word_ids)) > self.MAX_WORDS):
+            raise ValueError("too many different words: more than {}"
+                             .format(self.MAX_WORDS))
+        setdefault = word_ids.setdefault
+        # len() is called before the word is added -- so a new word gets
+        # the next id, and one that's already there keeps its old one
+        ids = self._tail + [setdefault(word, len(word_ids)) for word in words]
+        shift1, shift2 = self.BITS, 2 * self.BITS
+        self.counts.update((first << shift2) | (second << shift1) | third
+                           for first, second, third in zip(ids,
+                                                           islice(ids, 1, None),
+                                                           islice(ids, 2, None)))
+        self._tail = ids[-2:]
+
+    def freeze(self):
+        """
+        sort the trigrams into arrays, ready for looking up followers
+
+        called automatically when needed
+        """
+        keys = sorted(self.counts)
+        self._keys = array('q', keys)
+        self._weights = array('l', (self.counts[key] for key in keys))
+        self._words = list(self.word_ids)
+        # each different pair once -- the trigrams are sorted, so all
+        # the ones with the same pair are together
+        pairs = array('q')
+        last = -1
+        for key in keys:
+            pair = key >> self.BITS
+            if pair != last:
+                pairs.append(pair)
+                last = pair
+        self._pairs = pairs
+
+    def _frozen(self):
+        if self._keys is None:
+            self.freeze()
+
+    def __len__(self):
+        """
+        the number of different trigrams
+        """
+        return len(self.counts)
+
+    def _pair_range(self, pair_key):
+        # where the trigrams that start with the pair are in the arrays
+        start = bisect_left(self._keys, pair_key << self.BITS)
+        stop = bisect_left(self._keys, (pair_key + 1) << self.BITS, start)
+        return start, stop
+
+    def followers(self, first, second):
+        """
+        the words that follow a pair of words, and how many times each does
+
+        :returns: a dict of word: count
+        """
+        self._frozen()
+        try:
+            pair_key = (self.word_ids[first] << self.BITS) | self.word_ids[second]
+        except KeyError:
+            return {}
+        start, stop = self._pair_range(pair_key)
+        mask = self.MAX_WORDS - 1
+        return {self._words[self._keys[i] & mask]: self._weights[i]
+                for i in range(start, stop)}
+
+    def random_pair(self):
+        """
+        a random pair of words that has followers
+
+        all the pairs are equally likely, as in trigram.build_text()
+        """
+        self._frozen()
+        key = random.choice(self._pairs)
+        mask = self.MAX_WORDS - 1
+        return [self._words[key >> self.BITS], self._words[key & mask]]
+
+    def random_follower(self, first, second):
+        """
+        a random follower of the pair -- the more often it follows the
+        pair, the more likely it is. None if there aren't any.
+        """
+        self._frozen()
+        pair_key = (self.word_ids[first] << self.BITS) | self.word_ids[second]
+        start, stop = self._pair_range(pair_key)
+        if start == stop:
+            return None
+        i = random.choices(range(start, stop), self._weights[start:stop])[0]
+        return self._words[self._keys[i] & (self.MAX_WORDS - 1)]
+
+    def to_dict(self):
+        """
+        a dict of (word1, word2): list of followers, like
+        trigram.build_trigram() makes
+
+        The pairs and their followers are the same, but not in the same
+        order: only the counts are kept, not where the words were in the
+        text, so the pairs (and the followers of each) come out sorted by
+        word id -- the order the words were first seen in -- with the
+        repeats of each follower together.
+        """
+        self._frozen()
+        word_pairs = {}
+        words = self._words
+        mask = self.MAX_WORDS - 1
+        for key, count in zip(self._keys, self._weights):
+            pair = (words[key >> (2 * self.BITS)], words[(key >> self.BITS) & mask])
+            word_pairs.setdefault(pair, []).extend([words[key & mask]] * count)
+        return word_pairs
+
+    def build_text(self, num_sentences=10):
+        """
+        Build some new text -- like trigram.build_text()
+        """
+        new_text = []
+        for i in range(num_sentences):
+            sentence = self.random_pair()
+            for j in range(random.randint(2, 10)):
+                follower = self.random_follower(*sentence[-2:])
+                if follower is None:
+                    # the end of the text -- nothing follows
+                    break
+                sentence.append(follower)
+            sentence[0] = sentence[0].capitalize()
+            sentence[-1] += "."
+            new_text.extend(sentence)
+        return " ".join(new_text)
+
+
+# Reading the text a line at a time -- each of these is a generator, so
+# only one line (and a chunk of words in TrigramModel.add_words) is in
+# memory at once, however big the files are.
+
+@contextmanager
+def open_text(filename):
+    """
+    open a file to read -- "-" means stdin (which isn't closed after)
+    """
+    if filename == "-":
+        yield sys.stdin
+    else:
+        with open(filename, 'r') as infile:
+            yield infile
+
+
+def iter_book_lines(infile, header_lines=61):
+    """
+    yield the lines of a project Gutenberg book
+
+    the same lines read_in_data() uses -- skipping the header, and
+    stopping at the footer
+    """
+    for i in range(header_lines):
+        infile.readline()
+    for line in infile:
+        if line.startswith("End of the Project Gutenberg EBook"):
+            break
+        yield line
+
+
+def iter_lines(filenames, header_lines=61):
+    """
+    yield the lines of all the books, one after the other
+    """
+    for filename in filenames:
+        with open_text(filename) as infile:
+            yield from iter_book_lines(infile, header_lines)
+
+
+def iter_words(lines):
+    """
+    yield the words in the lines -- the same words make_words() makes
+    from all the lines joined together
+    """
+    for line in lines:
+        yield from make_words(line)
+
+
+def build_model(filenames, header_lines=61):
+    """
+    build a TrigramModel from the words in some files
+
+    :param filenames: the files to read -- "-" is stdin
+    """
+    model = TrigramModel()
+    model.add_words(iter_words(iter_lines(filenames, header_lines)))
+    return model
+
+
+if __name__ == "__main__":
+    # get the filenames from the command line -- stdin if there aren't any
+    filenames = sys.argv[1:] or ["-"]
+    print(build_model(filenames).build_text())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+
+"""
+Benchmark all the html_render implementations in the repo
+
+Finds the html_render.py modules in the solutions (step_1 ... step_8)
+and in students/*/session07, builds the same synthetic page with each
+of them, and reports how fast it renders and how much memory it takes.
+
+The page is a tree of nested elements:
+
+ * depth: how many levels of nested elements
+ * fanout: how many elements inside each one
+ * attrs: how many attributes on each element
+ * text_size: how many characters of text in each innermost element
+
+Each implementation is run in its own process -- so they can't affect
+each other, and one that crashes (or hangs) doesn't stop the others.
+The ones that can't render the page (early steps can't nest elements
+or have no attributes, some student versions are unfinished) are
+reported with the error.
+
+$ python bench_html_render.py
+$ python bench_html_render.py --depth 3 --fanout 50 --attrs 0
+$ python bench_html_render.py step_7/html_render.py step_8/html_render.py
+"""
+
+import argparse
+import glob
+import importlib.util
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.normpath(os.path.join(HERE, "..", ".."))
+
+# so the results can be found in the other output of the child process
+RESULT_PREFIX = "BENCH RESULT: "
+
+
+def discover(repo=REPO):
+    """
+    find all the html_render modules in the repo
+
+    :returns: list of paths, relative to the repo
+    """
+    patterns = ["solutions/Session07/*/html_render.py",
+                "students/*/[sS]ession07/html_render*.py",
+                "students/*/[sS]ession07/*/html_render*.py",
+                ]
+    paths = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(repo, pattern)):
+            if "test" not in os.path.basename(path):
+                paths.add(os.path.relpath(path, repo))
+    return sorted(paths)
+
+
+def load_module(path):
+    spec = importlib.util.spec_from_file_location("html_render_under_test", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class PageMaker:
+    """
+    builds the synthetic page with the classes of one implementation
+
+    Uses the most specific classes the module has (Ul / Li, etc.),
+    falling back to plain Element.
+    """
+    def __init__(self, hr, depth, fanout, attrs, text_size):
+        self.depth = depth
+        self.fanout = fanout
+        self.attrs = {"attr{}".format(i): "value {}".format(i) for i in range(attrs)}
+        self.text = ("some text " * (text_size // 10 + 1))[:text_size]
+        self.root = self.find_class(hr, "Html", "Element")
+        self.block = self.find_class(hr, "Ul", "Body", "Element")
+        self.leaf = self.find_class(hr, "Li", "P", "Element")
+        self.num_elements = 0
+
+    @staticmethod
+    def find_class(hr, *names):
+        for name in names:
+            cls = getattr(hr, name, None)
+            if isinstance(cls, type):
+                return cls
+        raise AttributeError("module has none of: {}".format(", ".join(names)))
+
+    def new(self, cls, content=None):
+        self.num_elements += 1
+        if self.attrs:
+            el = cls(content, **self.attrs) if content else cls(**self.attrs)
+        else:
+            el = cls(content) if content else cls()
+        return el
+
+    def fill(self, el, level):
+        for _ in range(self.fanout):
+            if level == self.depth:
+                el.append(self.new(self.leaf, self.text))
+            else:
+                child = self.new(self.block)
+                self.fill(child, level + 1)
+                el.append(child)
+
+    def make_page(self):
+        self.num_elements = 0
+        page = self.new(self.root)
+        self.fill(page, 1)
+        return page
+
+
+def render(page):
+    out = io.StringIO()
+    page.render(out)
+    return out.getvalue()
+
+
+def run_one(path, depth, fanout, attrs, text_size, repeat):
+    """
+    benchmark a single implementation -- run in the child process
+
+    :returns: dict of results
+    """
+    result = {"path": path}
+    hr = load_module(path)
+    maker = PageMaker(hr, depth, fanout, attrs, text_size)
+
+    start = time.perf_counter()
+    page = maker.make_page()
+    result["build_time"] = time.perf_counter() - start
+    result["num_elements"] = maker.num_elements
+
+    # a new page for each render -- some implementations keep the output
+    times = []
+    for i in range(repeat):
+        if i:
+            page = maker.make_page()
+        start = time.perf_counter()
+        output = render(page)
+        times.append(time.perf_counter() - start)
+    result["render_time"] = min(times)
+    result["output_size"] = len(output)
+    del page, output
+
+    # memory is measured separately, as tracemalloc slows everything down
+    tracemalloc.start()
+    page = maker.make_page()
+    render(page)
+    result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result
+
+
+def run_child(path, args):
+    """
+    run the benchmark of one implementation in a new process
+    """
+    cmd = [sys.executable, os.path.abspath(__file__), "--child",
+           "--depth", str(args.depth),
+           "--fanout", str(args.fanout),
+           "--attrs", str(args.attrs),
+           "--text-size", str(args.text_size),
+           "--repeat", str(args.repeat),
+           os.path.join(REPO, path),
+           ]
+    # some of them write files when imported -- keep that out of the repo
+    with tempfile.TemporaryDirectory() as tmpdir:
+        try:
+            proc = subprocess.run(cmd, cwd=tmpdir, timeout=args.timeout,
+                                  stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                  universal_newlines=True)
+        except subprocess.TimeoutExpired:
+            return {"path": path, "error": "timed out"}
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+            result["path"] = path
+            return result
+    error = proc.stderr.strip().splitlines()
+    return {"path": path, "error": error[-1] if error else "no result"}
+
+
+def report(results):
+    ok = [r for r in results if "error" not in r]
+    failed = [r for r in results if "error" in r]
+    ok.sort(key=lambda r: r["render_time"])
+    print("{:56s} {:>9s} {:>12s} {:>9s} {:>10s}".format(
+          "implementation", "elements", "elements/s", "MB/s", "peak MB"))
+    for r in ok:
+        print("{:56s} {:9d} {:12,.0f} {:9.1f} {:10.1f}".format(
+              r["path"],
+              r["num_elements"],
+              r["num_elements"] / r["render_time"],
+              r["output_size"] / r["render_time"] / 1e6,
+              r["peak_memory"] / 1e6))
+    if failed:
+        print("\ncould not render the page:")
+        for r in failed:
+            print("{:56s} {}".format(r["path"], r["error"][:80]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="*",
+                        help="html_render modules to test (default: all of them)")
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=20)
+    parser.add_argument("--attrs", type=int, default=2)
+    parser.add_argument("--text-size", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=120,
+                        help="seconds to let each implementation run")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        result = run_one(args.paths[0], args.depth, args.fanout, args.attrs,
+                         args.text_size, args.repeat)
+        print(RESULT_PREFIX + json.dumps(result))
+        return
+
+    if args.paths:
+        paths = [os.path.relpath(os.path.abspath(p), REPO) for p in args.paths]
+    else:
+        paths = discover()
+    print("page: depth {}, fanout {}, {} attributes, {} characters of text\n".format(
+          args.depth, args.fanout, args.attrs, args.text_size))
+    report([run_child(path, args) for path in paths])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of re-rendering a big page after a small change
+
+The list is split into sections of 100 items, each a cached Ul (and
+the page is cached too). After changing one item, only the section
+it's in is rendered again -- the rest comes from the cache. The same
+page with nothing cached is rendered for comparison.
+
+$ python bench_cache.py [num_items]
+"""
+
+import io
+import sys
+import time
+
+import html_render as hr
+
+
+def make_page(num_items, cache=True, section_size=100):
+    page = hr.Html(cache=cache)
+    body = hr.Body()
+    body.append(hr.P("A paragraph of text", style="color: red"))
+    items = [hr.Li("item number {}".format(i)) for i in range(num_items)]
+    for start in range(0, num_items, section_size):
+        ul = hr.Ul(cache=cache)
+        for item in items[start:start + section_size]:
+            ul.append(item)
+        body.append(ul)
+    page.append(body)
+    return page, items
+
+
+def timed(msg, func, number=5):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    print("    {:36s} {:.4f}s".format(msg, (time.perf_counter() - start) / number))
+
+
+def change_one(items):
+    items[len(items) // 2].attributes["class"] = "changed"
+
+
+def bench(name, num_items, cache):
+    print(name)
+    page, items = make_page(num_items, cache)
+    timed("first render", lambda: page.render(io.StringIO()), number=1)
+    timed("render again, no changes", lambda: page.render(io.StringIO()))
+
+    def change_and_render():
+        change_one(items)
+        page.render(io.StringIO())
+    timed("render after changing one item", change_and_render)
+
+
+if __name__ == "__main__":
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("rendering a list with {} items".format(num_items))
+    bench("not cached", num_items, cache=False)
+    bench("cached sections", num_items, cache=True)
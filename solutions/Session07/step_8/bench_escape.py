@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of escaping and attribute rendering on a big document
+
+Compares the ways of escaping text (a chain of str.replace, which
+html_render uses, html.escape and str.translate with a table), and rendering the page the first time
+(when the attribute strings are built) and again (when they are
+already there).
+
+$ python bench_escape.py [num_elements]
+"""
+
+import html
+import io
+import sys
+import time
+import timeit
+
+import html_render as hr
+
+SAMPLE = 'some text with a <tag> & a "quote" in it'
+
+
+_TEXT_ESCAPES = str.maketrans({"&": "&amp;",
+                               "<": "&lt;",
+                               ">": "&gt;",
+                               })
+
+
+def translate_escape(text):
+    return text.translate(_TEXT_ESCAPES)
+
+
+def bench_escape(number=200000):
+    print("escaping a string {} times:".format(number))
+    for name, func in [("replace", hr.escape),
+                       ("html.escape", html.escape),
+                       ("translate", translate_escape)]:
+        t = timeit.timeit(lambda: func(SAMPLE), number=number)
+        print("    {:12s} {:.3f}s".format(name, t))
+
+
+def make_page(num_elements):
+    page = hr.Html()
+    body = hr.Body()
+    ul = hr.Ul(id="TheList")
+    # each Li has a text child -- so two elements for each one
+    for i in range(num_elements // 2):
+        ul.append(hr.Li("item <{}> & more".format(i),
+                        id="item{}".format(i),
+                        style="color: red"))
+    body.append(ul)
+    page.append(body)
+    return page
+
+
+def timed(msg, func):
+    start = time.perf_counter()
+    func()
+    print("    {:30s} {:.3f}s".format(msg, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    num_elements = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    bench_escape()
+    print("document with {} elements:".format(num_elements))
+    page = [None]
+    timed("build (escapes the text)", lambda: page.__setitem__(0, make_page(num_elements)))
+    timed("first render", lambda: page[0].render(io.StringIO()))
+    timed("render with cached attributes", lambda: page[0].render(io.StringIO()))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""
+Measure the memory used per element in a big page
+
+Compares this version (__slots__, shared empty attributes, plain text
+stored as str) with the step_7 version (a __dict__, attributes dict and
+TextWrapper for every node), after building the page and again after
+rendering it.
+
+$ python bench_memory.py [num_items]
+"""
+
+import io
+import os
+import sys
+import tracemalloc
+
+import html_render
+from bench_render import load_module
+
+
+def make_page(hr, num_items):
+    page = hr.Html()
+    body = hr.Body()
+    ul = hr.Ul(id="TheList")
+    for i in range(num_items):
+        ul.append(hr.Li("item number {}".format(i)))
+    body.append(ul)
+    page.append(body)
+    return page
+
+
+def measure(name, hr, num_items):
+    tracemalloc.start()
+    page = make_page(hr, num_items)
+    built, _ = tracemalloc.get_traced_memory()
+    page.render(io.StringIO())
+    rendered, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("{:12s} {:6.1f} bytes per Li built, {:6.1f} after rendering"
+          .format(name, built / num_items, rendered / num_items))
+    return page
+
+
+if __name__ == "__main__":
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("memory for a list with {} items".format(num_items))
+    step_7 = load_module(os.path.join(os.path.dirname(__file__), "..",
+                                      "step_7", "html_render.py"),
+                         "html_render_step_7")
+    measure("step_7", step_7, num_items)
+    measure("slots", html_render, num_items)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of rendering a large page
+
+Compares this version, which renders everything into a list and
+writes it once, with the step_7 version, which writes each tag
+and piece of text to the file separately.
+
+$ python bench_render.py [num_items]
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import timeit
+
+import html_render
+
+
+def load_module(path, name):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_page(hr, num_items):
+    page = hr.Html()
+    body = hr.Body()
+    body.append(hr.P("A paragraph of text", style="color: red"))
+    ul = hr.Ul(id="TheList")
+    for i in range(num_items):
+        ul.append(hr.Li("item number {}".format(i)))
+    body.append(ul)
+    page.append(body)
+    return page
+
+
+def bench(name, hr, num_items, number=5):
+    page = make_page(hr, num_items)
+    to_string = timeit.timeit(lambda: page.render(io.StringIO()), number=number)
+    with open(os.devnull, 'w') as devnull:
+        to_file = timeit.timeit(lambda: page.render(devnull), number=number)
+    print("{:12s} StringIO: {:.3f}s   file: {:.3f}s".format(name,
+                                                          to_string / number,
+                                                          to_file / number))
+
+
+if __name__ == "__main__":
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("rendering a list with {} items".format(num_items))
+    step_7 = load_module(os.path.join(os.path.dirname(__file__), "..",
+                                      "step_7", "html_render.py"),
+                         "html_render_step_7")
+    bench("step_7", step_7, num_items)
+    bench("buffered", html_render, num_items)
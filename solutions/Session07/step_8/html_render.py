@@ -4,6 +4,27 @@
 Chris's solution through step 8
 """
 
+from contextlib import contextmanager
+
+
+def escape(text):
+    """
+    escape the characters that are special in html text
+
+    (a chain of str.replace is faster than str.translate with a
+    table -- replace doesn't copy the string if there's nothing to do)
+    """
+    return (str(text).replace("&", "&amp;")
+                     .replace("<", "&lt;")
+                     .replace(">", "&gt;"))
+
+
+def escape_attr(value):
+    """
+    escape the characters that are special in an html attribute value
+    """
+    return escape(value).replace('"', "&quot;")
+
 
 class TextWrapper:
     """
@@ -13,21 +34,306 @@ class TextWrapper:
     This allows the Element classes to render either Element objects or
     plain text
 
+    The text is escaped when the wrapper is created, so "<" etc.
+    show up as text on the page.
+
+    NOTE: Elements store plain text as (escaped) strings now -- this
+          is only used if a TextWrapper is added directly.
     """
+    __slots__ = ("text",)
+    # it never changes -- so it's OK to cache the element it's in
+    _cacheable = True
+
     def __init__(self, text):
-        self.text = text
+        self.text = escape(text)
 
     def render(self, file_out, current_ind=""):
         file_out.write(current_ind + self.text)
 
+    def render_parts(self, parts, current_ind=""):
+        parts.append(current_ind + self.text)
+
+
+class _RenderAdapter:
+    """
+    Wraps content that only has a render(file, ind) method,
+    so it can be rendered into a list of parts
+    """
+    __slots__ = ("content", "write")
+
+    def __init__(self, content):
+        self.content = content
+        # so the wrapped object's render method can write to it
+        self.write = None
+
+    def render_parts(self, parts, current_ind=""):
+        self.write = parts.append
+        self.content.render(self, current_ind)
+
+
+class _Slot(str):
+    """
+    The text of a Placeholder in a list of parts
+
+    It's a str (the default text), so the parts can be joined as usual,
+    but compile() can find it and make it a slot in the Template.
+    """
+
+
+class Placeholder:
+    """
+    A spot in a page for text that will be filled in later
+
+    Use it as the content of an Element, and then compile() the element.
+    The resulting Template can be rendered over and over with different
+    text for each Placeholder.
+
+    If rendered directly, the default text is used.
+    """
+    def __init__(self, name, default=""):
+        self.name = name
+        self.default = default
+
+    def render(self, file_out, current_ind=""):
+        file_out.write(current_ind + escape(self.default))
+
+    def render_parts(self, parts, current_ind=""):
+        slot = _Slot(current_ind + escape(self.default))
+        slot.name = self.name
+        slot.ind = current_ind
+        parts.append(slot)
+
+
+class Template:
+    """
+    A compiled Element tree
+
+    All the tags, attributes and indentation are rendered once, when it's
+    created, into a list of strings. Rendering it again just means putting
+    the new text into the Placeholder slots and joining the list.
+
+    Create one with Element.compile()
+    """
+    def __init__(self, parts):
+        """
+        :param parts: list of rendered strings, as made by render_parts
+        """
+        self.parts = []
+        # list of (index in parts, placeholder name, indentation)
+        self.slots = []
+        static = []
+        for part in parts:
+            if isinstance(part, _Slot):
+                self.parts.append("".join(static))
+                static = []
+                self.slots.append((len(self.parts), part.name, part.ind))
+                self.parts.append("")
+            else:
+                static.append(part)
+        self.parts.append("".join(static))
+
+    @property
+    def names(self):
+        """
+        the names of the placeholders in this template
+        """
+        return {name for _, name, _ in self.slots}
+
+    def render_string(self, **data):
+        """
+        render the template with the given text for each placeholder
+
+        :param data: the text for each placeholder, by name
+                     (it is escaped)
+
+        :returns: the rendered html as a string
+        """
+        parts = self.parts.copy()
+        for index, name, ind in self.slots:
+            parts[index] = ind + escape(data[name])
+        return "".join(parts)
+
+    def render(self, out_file, **data):
+        """
+        render the template to a file
+
+        :param out_file: open, file-like object to write to
+
+        :param data: the text for each placeholder, by name
+        """
+        out_file.write(self.render_string(**data))
+
+
+def _wrap_content(content):
+    """
+    make content ready to go in an Element
+
+    Anything with a render_parts method is used as is, plain text
+    is stored as an escaped str.
+    """
+    if hasattr(content, 'render_parts'):
+        return content
+    elif hasattr(content, 'render'):
+        return _RenderAdapter(content)
+    else:
+        return escape(content)
+
+
+class ElementStream:
+    """
+    The open element in Element.stream()
+
+    Content appended to it is rendered and written right away,
+    rather than being stored in the element.
+    """
+    __slots__ = ("out_file", "cur_ind")
+
+    def __init__(self, out_file, cur_ind):
+        self.out_file = out_file
+        # the indentation of the content
+        self.cur_ind = cur_ind
+
+    def append(self, content):
+        """
+        render a piece of content, or an element, and write it out
+        """
+        content = _wrap_content(content)
+        if type(content) is str:
+            parts = [self.cur_ind, content]
+        else:
+            parts = []
+            content.render_parts(parts, self.cur_ind)
+        parts.append("\n")
+        self.out_file.write("".join(parts))
+
+    def extend(self, contents):
+        """
+        render and write each item from an iterable (or generator) of content
+        """
+        for content in contents:
+            self.append(content)
+
+    def stream(self, element):
+        """
+        start streaming a child element
+
+        use it as a context manager, as with Element.stream()
+        """
+        return element.stream(self.out_file, self.cur_ind, _tail="\n")
+
+
+class Attributes(dict):
+    """
+    The attributes of an Element
+
+    A dict that keeps the rendered (and escaped) attribute string,
+    so it only needs to be built again when the attributes change.
+    It also lets the element it belongs to know about changes.
+    """
+    __slots__ = ("_rendered", "_owner")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._rendered = None
+        # the Element they are the attributes of
+        self._owner = None
+
+    def _changed(self):
+        self._rendered = None
+        if self._owner is not None:
+            self._owner._changed()
+
+    def render(self):
+        """
+        the attributes as they go in the opening tag:
+        ' key1="value1" key2="value2"', or "" if there aren't any
+        """
+        if self._rendered is None:
+            self._rendered = "".join([' {}="{}"'.format(key, escape_attr(val))
+                                      for key, val in self.items()])
+        return self._rendered
+
+    # all the methods that change the dict clear the rendered strings
+    def __setitem__(self, key, value):
+        self._changed()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._changed()
+        super().__delitem__(key)
+
+    def clear(self):
+        self._changed()
+        super().clear()
+
+    def pop(self, *args):
+        self._changed()
+        return super().pop(*args)
+
+    def popitem(self):
+        self._changed()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self._changed()
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self._changed()
+        super().update(*args, **kwargs)
+
+    def __ior__(self, other):
+        self._changed()
+        return super().__ior__(other)
+
+
+# shared by all the Elements without attributes, so they don't each need
+# an empty dict -- it is replaced with a real one if it's asked for.
+_NO_ATTRIBUTES = Attributes()
+
+# the _cache of an element that keeps its output, but hasn't got any yet
+_NOT_RENDERED = ()
+
 
 class Element:
+    """
+    The base class for all the html elements
+
+    Elements use __slots__, to keep the memory use down for big pages.
+    Plain text in the content is stored as (already escaped) strings,
+    not in a wrapper object.
+
+    An element made with cache=True keeps its rendered output, so it
+    is only rendered again after something in it has changed. That
+    costs memory (a copy of all the html in it), so use it on a few big
+    containers that don't change much -- like the sections of a page --
+    not on every element. Changes made through append() or the
+    attributes are tracked -- if you change the content list directly,
+    call _changed() yourself.
+    """
 
     tag = "html"
     indent = "    "
 
-    def __init__(self, content=None, **kwargs):
-        self.attributes = kwargs
+    # any Element can go in a cached one -- it says when it changes
+    _cacheable = True
+
+    __slots__ = ("_attributes", "content", "_parent", "_cache")
+
+    def __init__(self, content=None, cache=False, **kwargs):
+        # _parent: the element this one was appended to (a list, if more
+        # than one) -- only kept when there's a cached element above it
+        # that needs to know about changes.
+        # _cache: None if the output isn't kept; otherwise _NOT_RENDERED,
+        # or (indentation, rendered string) from the last render
+        self._parent = self._cache = None
+        if cache:
+            self._cache = _NOT_RENDERED
+        if kwargs:
+            self._attributes = Attributes(kwargs)
+            self._attributes._owner = self
+        else:
+            self._attributes = _NO_ATTRIBUTES
         self.content = []
         if content:
             # call the classes append method
@@ -43,72 +349,249 @@ class Element:
         #       but that test was testing internal API --
         #       it's probably better remove it
         # if isinstance(content, Element):
-        if hasattr(content, 'render'):
-            self.content.append(content)
-        else:
-            self.content.append(TextWrapper(str(content)))
-        # self.content.append(content)
+        content = _wrap_content(content)
+        self.content.append(content)
+        if self._cache is not None or self._parent is not None:
+            # in a cached element -- so it needs to know about changes
+            self._track(content)
+            self._changed()
+
+    def _track(self, content):
+        """
+        link the content, and everything in it, to this element, so
+        changes get back to the cached element(s) this is in
+        """
+        to_do = [(self, content)]
+        while to_do:
+            parent, item = to_do.pop()
+            if type(item) is str:
+                continue
+            if isinstance(item, Element):
+                # if it's already tracked, so is everything in it
+                linked = item._cache is not None or item._parent is not None
+                item._add_parent(parent)
+                if not linked:
+                    to_do.extend((item, stuff) for stuff in item.content)
+            elif not getattr(item, "_cacheable", False):
+                # it might change without saying so (like a Placeholder)
+                parent._no_cache()
+
+    def _add_parent(self, parent):
+        # an element can be in more than one other (like a menu that is
+        # on a couple of pages) -- then _parent is a list of them all
+        current = self._parent
+        if current is None:
+            self._parent = parent
+        elif type(current) is list:
+            if not any(el is parent for el in current):
+                current.append(parent)
+        elif current is not parent:
+            self._parent = [current, parent]
+
+    def _self_and_parents(self):
+        """
+        yield this element, and all the elements it's in
+        """
+        to_do = [self]
+        while to_do:
+            el = to_do.pop()
+            yield el
+            parent = el._parent
+            if type(parent) is list:
+                to_do.extend(parent)
+            elif parent is not None:
+                to_do.append(parent)
+
+    def _changed(self):
+        """
+        clear the rendered output of this element, and all the
+        elements it's in
+        """
+        if self._cache is None and self._parent is None:
+            # nothing is cached, so there's nothing to clear
+            return
+        for el in self._self_and_parents():
+            if el._cache is not None:
+                el._cache = _NOT_RENDERED
+
+    def _no_cache(self):
+        """
+        stop keeping the output of this element, and all the elements
+        it's in -- there is something in it that can't be cached
+        """
+        for el in self._self_and_parents():
+            el._cache = None
+
+    @property
+    def attributes(self):
+        if self._attributes is _NO_ATTRIBUTES:
+            # it might get changed -- so it needs its own
+            self._attributes = Attributes()
+            self._attributes._owner = self
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes):
+        # so the rendered attributes can be kept until they change
+        self._attributes = Attributes(attributes)
+        self._attributes._owner = self
+        self._changed()
 
     def make_tags(self):
         """
         create the tags
         -- in a separate method so different subclass's render methods can use it
         """
-        attrs = " ".join(['{}="{}"'.format(key, val) for key, val in self.attributes.items()])
-        if attrs.strip():
-            open_tag = "<{} {}>".format(self.tag, attrs.strip())
-        else:
-            open_tag = "<{}>".format(self.tag)
-        close_tag = "</{}>".format(self.tag)
+        open_tag = "<" + self.tag + self._attributes.render() + ">"
+        close_tag = "</" + self.tag + ">"
 
         return open_tag, close_tag
 
+    def compile(self, cur_ind=""):
+        """
+        render the element tree once into a Template, so it can be
+        quickly re-rendered with different text in its Placeholders
+
+        :param cur_ind="": the indentation of this element
+
+        NOTE: changes to the elements after it is compiled are not
+              reflected in the Template.
+        """
+        parts = []
+        self.render_parts(parts, cur_ind)
+        return Template(parts)
+
     def render(self, out_file, cur_ind=""):
-        print("in render, type of self", type(self))
+        """
+        render the element, and everything in it, to a file
+
+        The whole thing is rendered into a list of strings first,
+        and then written all at once.
+
+        :param out_file: open file-like object to write to
+
+        :param cur_ind="": the indentation of this element
+        """
+        parts = []
+        self.render_parts(parts, cur_ind)
+        out_file.write("".join(parts))
+
+    @contextmanager
+    def stream(self, out_file, cur_ind="", _tail=""):
+        """
+        render the element to a file incrementally
+
+        The opening tag (and any content already in the element) is written
+        right away. Content added to the returned ElementStream is written
+        as it is added, and the closing tag is written at the end of the
+        with block. So the page never needs to be all in memory::
+
+            with page.stream(out_file) as html:
+                with html.stream(Ul()) as ul:
+                    ul.extend(Li(item) for item in huge_list)
+
+        :param out_file: open file-like object to write to
+
+        :param cur_ind="": the indentation of this element
+        """
+        parts = []
+        # not from the cache -- it needs to be in separate parts
+        self._render_parts(parts, cur_ind)
+        # the last part is the closing tag
+        close_tag = parts.pop()
+        out_file.write("".join(parts))
+        yield ElementStream(out_file, cur_ind + self.indent)
+        out_file.write(close_tag + _tail)
+
+    def render_parts(self, parts, cur_ind=""):
+        """
+        render the element by adding the strings to the parts list
+
+        If it's cached, and hasn't changed since the last time it was
+        rendered (at the same indentation), the saved output is used.
+        """
+        cache = self._cache
+        if cache is None:
+            self._render_parts(parts, cur_ind)
+            return
+        if cache and cache[0] == cur_ind:
+            parts.append(cache[1])
+            return
+        start = len(parts)
+        self._render_parts(parts, cur_ind)
+        rendered = "".join(parts[start:])
+        parts[start:] = [rendered]
+        self._cache = (cur_ind, rendered)
+
+    def _render_parts(self, parts, cur_ind=""):
+        """
+        render the element by adding the strings to the parts list
+
+        This is what subclasses override to change how they are rendered.
+        """
         open_tag, close_tag = self.make_tags()
-        out_file.write(cur_ind + open_tag + "\n")
+        parts.append(cur_ind + open_tag + "\n")
+        # only compute this once
+        child_ind = cur_ind + self.indent
         for stuff in self.content:
-            stuff.render(out_file, cur_ind + self.indent)
-            out_file.write("\n")
-        out_file.write(cur_ind + close_tag)
+            if type(stuff) is str:
+                parts.append(child_ind + stuff)
+            else:
+                stuff.render_parts(parts, child_ind)
+            parts.append("\n")
+        parts.append(cur_ind + close_tag)
 
 
 class OneLineTag(Element):
-    def render(self, out_file, cur_ind=""):
+    __slots__ = ()
+
+    def stream(self, *args, **kwargs):
+        raise TypeError("Only multi-line elements can be streamed")
+
+    def _render_parts(self, parts, cur_ind=""):
         open_tag, close_tag = self.make_tags()
-        out_file.write(cur_ind + open_tag)
+        parts.append(cur_ind + open_tag)
         for stuff in self.content:
-            stuff.render(out_file)
-        out_file.write(close_tag)
+            if type(stuff) is str:
+                parts.append(stuff)
+            else:
+                stuff.render_parts(parts)
+        parts.append(close_tag)
 
 
 class Html(Element):
     tag = 'html'
+    __slots__ = ()
 
-    def render(self, file_out, cur_ind=""):
-        file_out.write(cur_ind + "<!DOCTYPE html>\n")
-        super().render(file_out, cur_ind=cur_ind)
+    def _render_parts(self, parts, cur_ind=""):
+        parts.append(cur_ind + "<!DOCTYPE html>\n")
+        super()._render_parts(parts, cur_ind=cur_ind)
 
 
 class Body(Element):
     tag = "body"
+    __slots__ = ()
 
 
 class P(Element):
     tag = "p"
+    __slots__ = ()
 
 class Head(Element):
     tag = "head"
+    __slots__ = ()
 
 
 class Title(OneLineTag):
     tag = "title"
+    __slots__ = ()
 
 
 class SelfClosingTag(Element):
     """
     base class for tags that have no content
     """
+    __slots__ = ()
 
     def append(self, *args, **kwargs):
         """
@@ -117,11 +600,14 @@ class SelfClosingTag(Element):
         """
         raise TypeError("You can not add content to a self closing tag")
 
-    def render(self, out_file, ind=""):
+    def stream(self, *args, **kwargs):
+        raise TypeError("You can not stream a self closing tag")
+
+    def _render_parts(self, parts, ind=""):
         # there is some repetition here -- maybe factor that out?
         open_tag, _ = self.make_tags()
         # make it a self closing tag by adding the /
-        out_file.write(ind + open_tag.replace(">", " />"))
+        parts.append(ind + open_tag.replace(">", " />"))
 
 
 class Hr(SelfClosingTag):
@@ -129,6 +615,7 @@ class Hr(SelfClosingTag):
     Horizontal Rule
     """
     tag = "hr"
+    __slots__ = ()
 
 
 class Br(SelfClosingTag):
@@ -136,6 +623,7 @@ class Br(SelfClosingTag):
     Line break
     """
     tag = "br"
+    __slots__ = ()
 
 
 class A(OneLineTag):
@@ -143,6 +631,7 @@ class A(OneLineTag):
     anchor element
     """
     tag = "a"
+    __slots__ = ()
 
     def __init__(self, link, *args, **kwargs):
         kwargs['href'] = link
@@ -156,6 +645,7 @@ class Ul(Element):
     unordered list
     """
     tag = "ul"
+    __slots__ = ()
 
 
 class Li(Element):
@@ -163,13 +653,15 @@ class Li(Element):
     list element
     """
     tag = "li"
+    __slots__ = ()
 
 
 class H(OneLineTag):
     """
     section head
     """
-    tag = "H"
+    # the tag is set for each instance
+    __slots__ = ("tag",)
 
     def __init__(self, level, *args, **kwargs):
         self.tag = "h" + str(int(level))
@@ -181,3 +673,4 @@ class Meta(SelfClosingTag):
     metadata tag
     """
     tag = "meta"
+    __slots__ = ()
@@ -20,6 +20,7 @@ from html_render import (Element,
                          Li,
                          H,
                          Meta,
+                         Placeholder,
                          )
 
 # utility function for testing render methods
@@ -442,3 +443,345 @@ def test_whole_thing():
         page.render(f)
 
     # assert False
+
+
+def test_placeholder_render():
+    """
+    a placeholder rendered directly uses its default
+    """
+    p = P(Placeholder("text", default="the default"))
+    file_contents = render_result(p)
+    assert "the default" in file_contents
+
+
+def test_compile_same_as_render():
+    page = Html()
+    body = Body()
+    body.append(H(2, "A Header", align="center"))
+    body.append(P("some text", style="color: red"))
+    body.append(Hr())
+    page.append(body)
+
+    template = page.compile()
+    assert template.render_string() == render_result(page)
+
+
+def test_compile_placeholders():
+    page = Html()
+    body = Body()
+    body.append(Title(Placeholder("title")))
+    body.append(P(Placeholder("text")))
+    item = Li()
+    item.append("some static text")
+    item.append(Placeholder("item"))
+    body.append(Ul(item))
+    page.append(body)
+
+    template = page.compile()
+    assert template.names == {"title", "text", "item"}
+
+    for i in range(3):
+        data = {"title": f"title {i}", "text": f"text {i}", "item": f"item {i}"}
+        result = template.render_string(**data)
+
+        # should be the same as if they had been put in directly
+        page = Html()
+        body = Body()
+        body.append(Title(data["title"]))
+        body.append(P(data["text"]))
+        item = Li()
+        item.append("some static text")
+        item.append(data["item"])
+        body.append(Ul(item))
+        page.append(body)
+        assert result == render_result(page)
+
+
+def test_compile_render_file():
+    template = P(Placeholder("text")).compile(cur_ind="  ")
+    outfile = io.StringIO()
+    template.render(outfile, text="some text")
+    assert outfile.getvalue() == "  <p>\n      some text\n  </p>"
+
+
+def test_compile_missing_placeholder():
+    template = P(Placeholder("text")).compile()
+    with pytest.raises(KeyError):
+        template.render_string()
+
+
+class CountingFile(io.StringIO):
+    """
+    a file that keeps track of how many times it's written to
+    """
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def test_render_one_write(capsys):
+    """
+    rendering a whole tree should write once, and not print anything
+    """
+    ul = Ul()
+    for i in range(100):
+        ul.append(Li(f"item {i}"))
+    page = Html(Body(ul))
+
+    outfile = CountingFile()
+    page.render(outfile)
+    assert outfile.writes == 1
+    assert outfile.getvalue().count("<li>") == 100
+    assert capsys.readouterr().out == ""
+
+
+class OldStyleContent:
+    """
+    content with only a render method
+    """
+    def render(self, out_file, ind=""):
+        out_file.write(ind + "old style")
+        out_file.write(" content")
+
+
+def test_render_old_style_content():
+    p = P(OldStyleContent())
+    p.append("more text")
+    file_contents = render_result(p, ind="  ")
+    assert file_contents == "  <p>\n      old style content\n      more text\n  </p>"
+
+
+def make_stream_page(items):
+    """
+    the page used to test streaming -- created all at once
+    """
+    page = Html(Head(Title("A list")))
+    body = Body()
+    body.append(P("the list:"))
+    ul = Ul(id="TheList")
+    for item in items:
+        ul.append(Li(item))
+    body.append(ul)
+    body.append(Hr())
+    page.append(body)
+    return page
+
+
+def test_stream_same_as_render():
+    items = ["item {}".format(i) for i in range(20)]
+    expected = render_result(make_stream_page(items), ind="  ")
+
+    outfile = io.StringIO()
+    with Html(Head(Title("A list"))).stream(outfile, "  ") as page:
+        with page.stream(Body(P("the list:"))) as body:
+            with body.stream(Ul(id="TheList")) as ul:
+                ul.extend(Li(item) for item in items)
+            body.append(Hr())
+    assert outfile.getvalue() == expected
+
+
+def test_stream_writes_as_it_goes():
+    outfile = io.StringIO()
+    with Ul().stream(outfile) as ul:
+        assert outfile.getvalue() == "<ul>\n"
+        ul.append(Li("one"))
+        assert outfile.getvalue().endswith("</li>\n")
+        ul.append("some text")
+        assert outfile.getvalue().endswith("    some text\n")
+    assert outfile.getvalue().endswith("</ul>")
+
+
+def test_stream_one_line_tag():
+    with pytest.raises(TypeError):
+        with Title("a title").stream(io.StringIO()):
+            pass
+    with pytest.raises(TypeError):
+        with Hr().stream(io.StringIO()):
+            pass
+
+
+def test_escape_text():
+    e = P("fish & chips <b>cheap</b>")
+    file_contents = render_result(e)
+    assert "fish &amp; chips &lt;b&gt;cheap&lt;/b&gt;" in file_contents
+    assert "<b>" not in file_contents
+
+
+def test_escape_attributes():
+    e = P("some text", title='say "hi" & <bye>')
+    file_contents = render_result(e)
+    assert 'title="say &quot;hi&quot; &amp; &lt;bye&gt;"' in file_contents
+
+
+def test_escape_placeholder():
+    template = P(Placeholder("text")).compile()
+    assert "a &lt; b" in template.render_string(text="a < b")
+
+
+def test_attributes_changed():
+    """
+    the rendered attributes are kept -- make sure they are updated
+    """
+    e = P("some text", id="this")
+    assert '<p id="this">' in render_result(e)
+    e.attributes["style"] = "bold"
+    assert '<p id="this" style="bold">' in render_result(e)
+    del e.attributes["id"]
+    assert '<p style="bold">' in render_result(e)
+    e.attributes.update(id="that")
+    assert '<p style="bold" id="that">' in render_result(e)
+    e.attributes = {}
+    assert '<p>' in render_result(e)
+
+
+def test_no_instance_dict():
+    for e in [Html(), P("text"), Title("text"), Hr(), A("link", "text"), H(2, "text")]:
+        assert not hasattr(e, "__dict__")
+
+
+def test_shared_empty_attributes():
+    """
+    elements without attributes share an empty one --
+    make sure changing one doesn't change the others
+    """
+    e = P("some text")
+    e2 = P("some text")
+    e.attributes["id"] = "this"
+    assert e2.attributes == {}
+    assert '<p id="this">' in render_result(e)
+    assert render_result(e2).startswith("<p>")
+
+
+def test_old_style_subclass():
+    """
+    a subclass without __slots__ should still work
+    """
+    class Div(Element):
+        tag = "div"
+
+    d = Div("some text", id="a")
+    d.extra = "something"
+    assert render_result(d).startswith('<div id="a">')
+
+
+class CountingLi(Li):
+    """
+    a Li that counts how many times it is really rendered
+    """
+    __slots__ = ("count",)
+
+    def __init__(self, *args, **kwargs):
+        self.count = 0
+        super().__init__(*args, **kwargs)
+
+    def _render_parts(self, parts, cur_ind=""):
+        self.count += 1
+        super()._render_parts(parts, cur_ind)
+
+
+def make_cached_page():
+    """
+    a page with two cached lists in it
+    """
+    items = [CountingLi("item {}".format(i)) for i in range(3)]
+    others = [CountingLi("other {}".format(i)) for i in range(2)]
+    page = Html(Body(P("a paragraph")), cache=True)
+    ul = Ul(cache=True)
+    for item in items:
+        ul.append(item)
+    page.content[0].append(ul)
+    page.content[0].append(Ul(cache=True))
+    for item in others:
+        page.content[0].content[-1].append(item)
+    return page, items, others
+
+
+def test_cache_unchanged():
+    page, items, others = make_cached_page()
+    first = render_result(page)
+    assert render_result(page) == first
+    assert [item.count for item in items + others] == [1, 1, 1, 1, 1]
+
+
+def test_cache_append():
+    page, items, others = make_cached_page()
+    render_result(page)
+    items[1].append("more text")
+    result = render_result(page)
+    assert "more text" in result
+    # only the list it's in is rendered again
+    assert [item.count for item in items] == [2, 2, 2]
+    assert [item.count for item in others] == [1, 1]
+
+
+def test_cache_attribute_change():
+    page, items, others = make_cached_page()
+    render_result(page)
+    items[2].attributes["class"] = "new"
+    assert '<li class="new">' in render_result(page)
+    items[2].attributes = {"class": "newer"}
+    assert '<li class="newer">' in render_result(page)
+    assert [item.count for item in items] == [3, 3, 3]
+    assert [item.count for item in others] == [1, 1]
+
+
+def test_cache_added_later():
+    """
+    elements built first, and then put in a cached one, are tracked too
+    """
+    item = Li("an item")
+    ul = Ul(Li(P(item)))
+    page = Body(ul, cache=True)
+    render_result(page)
+    item.attributes["class"] = "x"
+    assert '<li class="x">' in render_result(page)
+    item.append("more")
+    assert "more" in render_result(page)
+
+
+def test_not_cached_by_default():
+    page, items, others = make_cached_page()
+    assert items[0]._cache is None
+    assert items[0]._parent is not None
+    # nothing is tracked if there's nothing cached
+    ul = Ul(Li("an item"))
+    assert ul.content[0]._parent is None
+    render_result(ul)
+    assert ul._cache is None
+
+
+def test_cache_indentation():
+    e = P("some text", cache=True)
+    assert render_result(e) == "<p>\n    some text\n</p>"
+    assert render_result(e, ind="  ") == "  <p>\n      some text\n  </p>"
+
+
+def test_cache_placeholder():
+    """
+    elements with a placeholder in them can't be cached
+    """
+    page = Html(Body(P(Placeholder("text", default="the default"))), cache=True)
+    assert "the default" in render_result(page)
+    template = page.compile()
+    assert "new text" in template.render_string(text="new text")
+    assert page._cache is None
+
+
+def test_cache_shared_element():
+    """
+    an element in more than one other one -- a change shows up in all
+    """
+    nav = P("navigation")
+    page1 = Body(nav, cache=True)
+    page2 = Body(Li("another"), cache=True)
+    page2.append(nav)
+    render_result(page1)
+    render_result(page2)
+    nav.attributes["class"] = "x"
+    assert '<p class="x">' in render_result(page1)
+    assert '<p class="x">' in render_result(page2)
+    nav.append(Placeholder("name", default="the default"))
+    assert "new" in page1.compile().render_string(name="new")
+    assert "new" in page2.compile().render_string(name="new")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""
+Benchmark of the on-disk SparseArray
+
+Builds an array with a lot of non-zero items in a temporary directory,
+then times reading, changing (and flushing) and summing it. The peak
+memory allocated (by python and numpy) is shown at the end -- it stays
+far below the size of the files. (The process's resident size goes
+up as the files are read, but those pages are the operating system's
+file cache, which it can drop when it needs the memory.)
+
+$ python bench_disk_sparse.py [num_nonzero]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from disk_sparse import DiskSparseArray
+
+
+def timed(msg, func):
+    start = time.perf_counter()
+    result = func()
+    print("    {:36s} {:.3f}s".format(msg, time.perf_counter() - start))
+    return result
+
+
+def build(path, num_nonzero, length, chunk=1000000):
+    sa = DiskSparseArray(path, length=length)
+    rng = np.random.default_rng(42)
+    step = length // num_nonzero
+    for start in range(0, num_nonzero, chunk):
+        stop = min(start + chunk, num_nonzero)
+        indices = np.arange(start, stop, dtype=np.int64) * step
+        sa.append_sorted(indices, rng.random(stop - start) + 1)
+    return sa
+
+
+def main(num_nonzero):
+    length = num_nonzero * 100
+    print("length {}, {} non-zero items".format(length, num_nonzero))
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "sparse")
+        sa = timed("build", lambda: build(path, num_nonzero, length))
+        size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+        print("    files: {:.1f} MB".format(size / 1e6))
+
+        indexes = [random.randrange(length) for _ in range(10000)]
+        timed("10000 random reads", lambda: [sa[i] for i in indexes])
+        view = sa[length // 2:length // 2 + 100000]
+        timed("iterate a slice of 100000", lambda: list(view.iter_nonzero()))
+
+        def change():
+            for i in indexes:
+                sa[i] = 1.0
+        timed("10000 random writes", change)
+        timed("sum (with changes not flushed)", sa.sum)
+        timed("flush", sa.flush)
+        timed("sum", sa.sum)
+        sa.close()
+    peak = tracemalloc.get_traced_memory()[1]
+    print("peak memory allocated: {:.1f} MB".format(peak / 1e6))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000000)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks of the SparseArray versions
+
+$ python bench_sparse.py [length] [num_nonzero]
+"""
+
+import random
+import sys
+import time
+
+import slice_sparse
+import sorted_sparse
+try:
+    import np_sparse
+except ImportError:
+    # it needs numpy
+    np_sparse = None
+
+
+def make_array(length, num_nonzero):
+    random.seed(1234)
+    array = [0] * length
+    for index in random.sample(range(length), num_nonzero):
+        array[index] = random.randint(1, 100)
+    return array
+
+
+def timed(name, msg, func, number=1):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    print("    {:14s} {:30s} {:.5f}s".format(name, msg,
+                                             (time.perf_counter() - start) / number))
+
+
+def bench(name, module, array):
+    length = len(array)
+    sparse = module.SparseArray(array)
+    indexes = [random.randrange(length) for _ in range(1000)]
+
+    def get_items():
+        for i in indexes:
+            sparse[i]
+    timed(name, "1000 single items", get_items)
+    timed(name, "slice of 100", lambda: list(sparse[length // 2:length // 2 + 100]), 100)
+
+    def delete():
+        # from near the start, so all the indices after it change
+        for i in range(100):
+            del sparse[10]
+    timed(name, "100 deletes", delete)
+
+
+def bench_arithmetic(array):
+    """
+    the numpy version against python loops over the dict
+    """
+    a = slice_sparse.SparseArray(array)
+    b = slice_sparse.SparseArray(array[::-1])
+
+    def dict_add():
+        result = dict(a.sparse_array)
+        for index, val in b.sparse_array.items():
+            result[index] = result.get(index, 0) + val
+        return result
+    timed("dict", "add two arrays", dict_add)
+    timed("dict", "sum", lambda: sum(a.sparse_array.values()))
+
+    a = np_sparse.SparseArray(array)
+    b = np_sparse.SparseArray(array[::-1])
+    timed("numpy", "add two arrays", lambda: a + b)
+    timed("numpy", "sum", a.sum)
+
+
+if __name__ == "__main__":
+    length = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    num_nonzero = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    print("length: {}, non-zero: {}".format(length, num_nonzero))
+    array = make_array(length, num_nonzero)
+    bench("dict", slice_sparse, array)
+    bench("sorted lists", sorted_sparse, array)
+    if np_sparse is not None:
+        bench("numpy", np_sparse, array)
+        bench_arithmetic(array)
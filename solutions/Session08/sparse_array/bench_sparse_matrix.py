@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""
+Benchmarks of the SparseMatrix against regular (dense) numpy arrays
+
+For a range of densities (the fraction of the values that are not zero),
+times matrix-vector and matrix-matrix multiplication, and shows how
+much memory each takes.
+
+$ python bench_sparse_matrix.py [size]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from sparse_matrix import SparseMatrix
+
+DENSITIES = [0.001, 0.01, 0.1]
+
+
+def random_matrix(size, density, rng):
+    """
+    a size x size sparse matrix, made without making the dense one first
+    """
+    nnz = int(size * size * density)
+    rows = rng.integers(0, size, nnz)
+    cols = rng.integers(0, size, nnz)
+    return SparseMatrix.from_coo(rows, cols, rng.random(nnz), (size, size))
+
+
+def timed(func, number=3):
+    best = float("inf")
+    for _ in range(number):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(size, density, rng):
+    sparse = random_matrix(size, density, rng)
+    dense = sparse.toarray()
+    csc = sparse.tocsc()
+    vector = rng.random(size)
+    other = random_matrix(size, density, rng)
+    other_dense = other.toarray()
+
+    sparse_bytes = sparse.data.nbytes + sparse.indices.nbytes + sparse.indptr.nbytes
+    print("density {:6.1%}: {} stored values, {:.1f} MB (dense: {:.1f} MB)".format(
+          density, sparse.nnz, sparse_bytes / 1e6, dense.nbytes / 1e6))
+    results = [("matrix @ vector", "csr", timed(lambda: sparse @ vector)),
+               ("", "csc", timed(lambda: csc @ vector)),
+               ("", "dense", timed(lambda: dense @ vector)),
+               ("matrix @ matrix", "csr", timed(lambda: sparse @ other, 1)),
+               ("", "dense", timed(lambda: dense @ other_dense, 1)),
+               ("get a row", "csr", timed(lambda: sparse[size // 2])),
+               ("get a column", "csc", timed(lambda: csc[:, size // 2])),
+               ]
+    for name, kind, t in results:
+        print("    {:16s} {:6s} {:.5f}s".format(name, kind, t))
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    print("{0} x {0} matrices\n".format(size))
+    rng = np.random.default_rng(42)
+    for density in DENSITIES:
+        bench(size, density, rng)
@@ -0,0 +1,344 @@
+"""
+A SparseArray stored on disk, for arrays too big to fit in memory
+
+The non-zero items are kept in a directory, as two binary files: the
+indices (sorted), and the values -- like the numpy version, but the
+arrays are numpy memmaps, so only the parts that are used are read
+from disk (by the operating system, a page at a time).
+
+ * getting an item is a binary search in the memmapped indices
+ * a slice is a SparseArrayView -- nothing is read until it's used,
+   and then only the part of the files it covers, a chunk at a time
+
+Changing items in the middle of the files would mean rewriting them,
+so changes go into a dict (the "delta") instead. Reads look there first.
+When there are enough changes (or flush() is called), they are all
+merged into new files in one pass, a chunk at a time -- so the whole
+array is never in memory.
+
+Deleting items (which would move all the ones after it) isn't supported.
+
+Requires numpy.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from sparse_iter import iter_runs, iter_dense, format_sparse
+from sparse_view import SparseArrayView
+
+INDEX_DTYPE = np.int64
+
+
+class DiskSparseArray(object):
+
+    # how many items to read or write at once
+    chunk_size = 1 << 20
+
+    def __init__(self, path, length=None, dtype="float64", max_delta=100000):
+        """
+        open an existing DiskSparseArray, or make a new (all zero) one
+
+        :param path: directory the files are in -- created if it
+                     doesn't exist.
+
+        :param length=None: length of a new array -- not needed if it exists
+
+        :param dtype="float64": numpy dtype of the values of a new array
+
+        :param max_delta=100000: how many changed items to keep in memory
+                                 before writing them to the files
+        """
+        self.path = path
+        self.max_delta = max_delta
+        self.delta = {}
+        if os.path.exists(self._file("meta.json")):
+            with open(self._file("meta.json")) as meta_file:
+                meta = json.load(meta_file)
+            if length is not None and length != meta["length"]:
+                raise ValueError("{} already has length {}".format(path, meta["length"]))
+            self.length = meta["length"]
+            self.dtype = np.dtype(meta["dtype"])
+            self._nnz = meta["nnz"]
+        else:
+            if length is None:
+                raise ValueError("length is needed to make a new DiskSparseArray")
+            os.makedirs(path, exist_ok=True)
+            self.length = length
+            self.dtype = np.dtype(dtype)
+            self._nnz = 0
+            open(self._file("indices"), "wb").close()
+            open(self._file("values"), "wb").close()
+            self._write_meta()
+        self._open()
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _write_meta(self):
+        meta = {"length": self.length, "dtype": self.dtype.str, "nnz": self._nnz}
+        with open(self._file("meta.json"), "w") as meta_file:
+            json.dump(meta, meta_file)
+
+    def _open(self):
+        if self._nnz:
+            self.indices = np.memmap(self._file("indices"), dtype=INDEX_DTYPE,
+                                     mode="r", shape=(self._nnz,))
+            self.values = np.memmap(self._file("values"), dtype=self.dtype,
+                                    mode="r", shape=(self._nnz,))
+        else:
+            # can't memmap an empty file
+            self.indices = np.zeros(0, dtype=INDEX_DTYPE)
+            self.values = np.zeros(0, dtype=self.dtype)
+
+    def close(self):
+        """
+        write any changes, and close the files
+        """
+        self.flush()
+        self.indices = self.values = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # writing
+
+    def flush(self):
+        """
+        merge the changed items into the files
+        """
+        if not self.delta:
+            return
+        keys = np.array(sorted(self.delta), dtype=INDEX_DTYPE)
+        new_values = np.array([self.delta[key] for key in keys.tolist()],
+                              dtype=self.dtype)
+        indices, values = self.indices, self.values
+        num = len(indices)
+        nnz = 0
+        with open(self._file("indices.new"), "wb") as index_file, \
+             open(self._file("values.new"), "wb") as value_file:
+            start = key_start = 0
+            while True:
+                stop = min(start + self.chunk_size, num)
+                chunk_indices = np.asarray(indices[start:stop])
+                chunk_values = np.asarray(values[start:stop])
+                # the changes that go in this chunk: the ones before
+                # the start of the next one
+                if stop < num:
+                    key_stop = np.searchsorted(keys, indices[stop])
+                else:
+                    key_stop = len(keys)
+                chunk_keys = keys[key_start:key_stop]
+                if len(chunk_keys):
+                    # the changed ones replace what's there
+                    keep = ~np.isin(chunk_indices, chunk_keys)
+                    chunk_indices = np.concatenate((chunk_indices[keep], chunk_keys))
+                    chunk_values = np.concatenate((chunk_values[keep],
+                                                   new_values[key_start:key_stop]))
+                    order = np.argsort(chunk_indices, kind="stable")
+                    chunk_indices = chunk_indices[order]
+                    chunk_values = chunk_values[order]
+                    nonzero = chunk_values != 0
+                    chunk_indices = chunk_indices[nonzero]
+                    chunk_values = chunk_values[nonzero]
+                chunk_indices.tofile(index_file)
+                chunk_values.tofile(value_file)
+                nnz += len(chunk_indices)
+                start, key_start = stop, key_stop
+                if start >= num:
+                    break
+        # let go of the old files before replacing them
+        self.indices = self.values = None
+        os.replace(self._file("indices.new"), self._file("indices"))
+        os.replace(self._file("values.new"), self._file("values"))
+        self._nnz = nnz
+        self._write_meta()
+        self.delta = {}
+        self._open()
+
+    def append_sorted(self, indices, values):
+        """
+        add a batch of items after all the ones in the array
+
+        This is the quick way to fill a big array -- they are written
+        straight to the end of the files.
+
+        :param indices: the indices of the items -- sorted, and after
+                        all the non-zero items already in the array
+
+        :param values: their values
+        """
+        self.flush()
+        indices = np.asarray(indices, dtype=INDEX_DTYPE)
+        values = np.asarray(values, dtype=self.dtype)
+        if indices.shape != values.shape:
+            raise ValueError("indices and values must be the same shape")
+        if len(indices) == 0:
+            return
+        if np.any(np.diff(indices) <= 0):
+            raise ValueError("indices must be sorted, with no repeats")
+        last = self.indices[-1] if len(self.indices) else -1
+        if indices[0] <= last or indices[-1] >= self.length:
+            raise IndexError("indices must be after the last item, "
+                             "and less than the length")
+        nonzero = values != 0
+        indices = indices[nonzero]
+        values = values[nonzero]
+        self.indices = self.values = None
+        with open(self._file("indices"), "ab") as index_file:
+            indices.tofile(index_file)
+        with open(self._file("values"), "ab") as value_file:
+            values.tofile(value_file)
+        self._nnz += len(indices)
+        self._write_meta()
+        self._open()
+
+    # the sequence methods
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def nnz(self):
+        """
+        the number of non-zero items, including the changes not written yet
+        """
+        if not self.delta:
+            return self._nnz
+        keys = np.fromiter(self.delta, dtype=INDEX_DTYPE, count=len(self.delta))
+        new_nonzero = np.fromiter((bool(value) for value in self.delta.values()),
+                                  dtype=bool, count=len(self.delta))
+        return self._nnz - self._on_disk(keys).sum() + new_nonzero.sum()
+
+    def _on_disk(self, keys):
+        # which of the keys are in the files
+        pos = np.searchsorted(self.indices, keys)
+        found = pos < len(self.indices)
+        found[found] = self.indices[pos[found]] == keys[found]
+        return found
+
+    def _check_index(self, index, msg):
+        index = index.__index__()
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(msg)
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SparseArrayView(self, range(*index.indices(self.length)))
+        index = self._check_index(index, 'array index out of range')
+        try:
+            return self.delta[index]
+        except KeyError:
+            pass
+        pos = np.searchsorted(self.indices, index)
+        if pos < len(self.indices) and self.indices[pos] == index:
+            # a python number, like the ones in the delta
+            return self.values[pos].item()
+        return self.dtype.type(0).item()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            raise TypeError("slices of a DiskSparseArray can't be assigned to "
+                            "-- set the items one at a time")
+        index = self._check_index(index, 'array assignment index out of range')
+        # converted now, so it's the same as it will be when it's written
+        self.delta[index] = self.dtype.type(value).item()
+        if len(self.delta) >= self.max_delta:
+            self.flush()
+
+    def __delitem__(self, index):
+        raise TypeError("items of a DiskSparseArray can't be deleted "
+                        "-- set them to zero instead")
+
+    def _iter_disk(self, start, stop, step):
+        # (index, value) of the items in the files in the range, a chunk at a time
+        first, last = np.searchsorted(self.indices, [start, stop])
+        for chunk_start in range(first, last, self.chunk_size):
+            chunk_stop = min(chunk_start + self.chunk_size, last)
+            indices = np.asarray(self.indices[chunk_start:chunk_stop])
+            values = np.asarray(self.values[chunk_start:chunk_stop])
+            if step != 1:
+                on_step = (indices - start) % step == 0
+                indices = indices[on_step]
+                values = values[on_step]
+            yield from zip(indices.tolist(), values.tolist())
+
+    def _iter_range(self, indices):
+        """
+        yield (index, value) for the non-zero items with indices in the range
+
+        (used by SparseArrayView)
+        """
+        if not indices:
+            return
+        if indices.step < 0:
+            yield from reversed(list(self._iter_range(indices[::-1])))
+            return
+        start, stop, step = indices.start, indices.stop, indices.step
+        changes = sorted((key, value) for key, value in self.delta.items()
+                         if key in indices)
+        changes.append((stop, None))  # so there is always one left
+        changes = iter(changes)
+        change = next(changes)
+        for index, value in self._iter_disk(start, stop, step):
+            while change[0] < index:
+                if change[1]:
+                    yield change
+                change = next(changes)
+            if change[0] == index:
+                # changed -- use the new value
+                if change[1]:
+                    yield change
+                change = next(changes)
+            else:
+                yield index, value
+        while change[1] is not None:
+            if change[1]:
+                yield change
+            change = next(changes)
+
+    def iter_nonzero(self):
+        """
+        yield (index, value) for each non-zero item, in order
+        """
+        return self._iter_range(range(self.length))
+
+    items = iter_nonzero
+
+    def iter_runs(self):
+        """
+        yield (value, count) for each run of the same value
+        """
+        return iter_runs(self.length, self.iter_nonzero())
+
+    def __iter__(self):
+        return iter_dense(self.length, self.iter_nonzero())
+
+    def __str__(self):
+        return format_sparse('DiskSparseArray', self.length, self.iter_nonzero())
+
+    def __repr__(self):
+        return "DiskSparseArray({!r})".format(self.path)
+
+    def sum(self):
+        """
+        the sum of the items -- read a chunk at a time
+        """
+        total = self.dtype.type(0)
+        for start in range(0, len(self.values), self.chunk_size):
+            total += self.values[start:start + self.chunk_size].sum()
+        if self.delta:
+            keys = np.fromiter(self.delta, dtype=INDEX_DTYPE, count=len(self.delta))
+            # take out the old values of the changed ones, and add the new
+            pos = np.searchsorted(self.indices, keys)[self._on_disk(keys)]
+            total -= self.values[pos].sum()
+            total += sum(self.delta.values())
+        return total
@@ -0,0 +1,348 @@
+"""
+A SparseArray that stores its non-zero values in numpy arrays
+
+This is the "COO" (coordinate) format: an array of the indices of the
+non-zero items (sorted), and an array of their values.
+
+Because the data are in numpy arrays, operations on the whole array
+(arithmetic, sums, converting to and from a regular array) are done
+by numpy, without a python loop over the items -- and only the stored
+items are touched, not all the zeros.
+
+Slicing returns a new SparseArray, rather than a list.
+
+Requires numpy.
+"""
+
+import numpy as np
+
+from sparse_iter import iter_runs, iter_dense, format_sparse
+
+
+class SparseArray(object):
+
+    def __init__(self, my_array=(), dtype=None):
+        """
+        initialize a sparse array
+
+        :param my_array: an initial sequence (or numpy array) to start with
+                         if there are zeros in it, they will not be stored
+
+        :param dtype=None: numpy dtype of the values -- by default the
+                           dtype of my_array is used.
+        """
+        my_array = np.asarray(my_array, dtype=dtype)
+        if my_array.ndim != 1:
+            raise ValueError("SparseArray must be 1-d")
+        self.length = len(my_array)
+        self.indices = np.flatnonzero(my_array)
+        self.values = my_array[self.indices]
+
+    @classmethod
+    def from_coo(cls, indices, values, length):
+        """
+        make a SparseArray from the indices and values of the non-zero items
+
+        :param indices: the indices of the items -- they don't need to be
+                        sorted, and the values of repeated indices are
+                        added together.
+
+        :param values: the values of the items
+
+        :param length: the length of the array
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        values = np.asarray(values)
+        if indices.shape != values.shape:
+            raise ValueError("indices and values must be the same shape")
+        if len(indices) and (indices.min() < 0 or indices.max() >= length):
+            raise IndexError("index out of range for length {}".format(length))
+        order = np.argsort(indices, kind="stable")
+        indices = indices[order]
+        values = values[order]
+        # add up the values of repeated indices
+        indices, starts = np.unique(indices, return_index=True)
+        if len(starts) < len(values):
+            values = np.add.reduceat(values, starts)
+        return cls._from_sorted(indices, values, length)
+
+    @classmethod
+    def _from_sorted(cls, indices, values, length):
+        # no checking -- the indices must be sorted and unique
+        self = cls.__new__(cls)
+        keep = values != 0
+        if not keep.all():
+            indices = indices[keep]
+            values = values[keep]
+        self.indices = indices
+        self.values = values
+        self.length = length
+        return self
+
+    def toarray(self):
+        """
+        a regular (dense) numpy array with the same values
+        """
+        dense = np.zeros(self.length, dtype=self.values.dtype)
+        dense[self.indices] = self.values
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.toarray()
+        if dtype is not None:
+            dense = dense.astype(dtype, copy=False)
+        return dense
+
+    @property
+    def nnz(self):
+        """
+        number of stored (non-zero) items
+        """
+        return len(self.indices)
+
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        # only looks at the non-zero items -- long runs of zeros are shortened
+        return format_sparse('SparseArray', self.length, self.iter_nonzero())
+
+    def iter_nonzero(self):
+        """
+        yield (index, value) for each non-zero item, in order
+        """
+        return zip(self.indices.tolist(), self.values.tolist())
+
+    items = iter_nonzero
+
+    def iter_runs(self):
+        """
+        yield (value, count) for each run of the same value
+        """
+        return iter_runs(self.length, self.iter_nonzero())
+
+    def __iter__(self):
+        return iter_dense(self.length, self.iter_nonzero())
+
+    def __repr__(self):
+        return "SparseArray.from_coo({!r}, {!r}, {})".format(self.indices.tolist(),
+                                                            self.values.tolist(),
+                                                            self.length)
+
+    # getting and setting items
+
+    def _check_index(self, index, msg):
+        index = index.__index__()
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(msg)
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._get_slice(index)
+        index = self._check_index(index, 'array index out of range')
+        pos = np.searchsorted(self.indices, index)
+        if pos < len(self.indices) and self.indices[pos] == index:
+            return self.values[pos]
+        return self.values.dtype.type(0)
+
+    def _get_slice(self, sl):
+        start, stop, step = sl.indices(self.length)
+        indices = range(start, stop, step)
+        if step > 0:
+            first, last = start, stop
+        else:
+            first, last = start + step * (len(indices) - 1), start + 1
+        # the items in the range, then the ones on the steps
+        lo, hi = np.searchsorted(self.indices, [first, last])
+        found = self.indices[lo:hi]
+        values = self.values[lo:hi]
+        offsets = found - start
+        on_step = offsets % step == 0
+        new_indices = offsets[on_step] // step
+        values = values[on_step]
+        if step < 0:
+            new_indices = new_indices[::-1]
+            values = values[::-1]
+        return self._from_sorted(new_indices, values.copy(), len(indices))
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._set_slice(index, value)
+            return
+        index = self._check_index(index, 'array assignment index out of range')
+        # converted first -- 0.5 in an int array is 0, so it isn't stored
+        value = self.values.dtype.type(value)
+        pos = np.searchsorted(self.indices, index)
+        if pos < len(self.indices) and self.indices[pos] == index:
+            if value:
+                self.values[pos] = value
+            else:
+                self.indices = np.delete(self.indices, pos)
+                self.values = np.delete(self.values, pos)
+        elif value:
+            self.indices = np.insert(self.indices, pos, index)
+            self.values = np.insert(self.values, pos, value)
+
+    def _set_slice(self, sl, values):
+        start, stop, step = sl.indices(self.length)
+        values = np.asarray(values, dtype=self.values.dtype)
+        if step != 1:
+            # extended slices can't change the length -- like a list
+            indices = np.arange(start, stop, step)
+            if len(values) != len(indices):
+                raise ValueError("attempt to assign sequence of size {} "
+                                 "to extended slice of size {}"
+                                 .format(len(values), len(indices)))
+            # take out the ones that are there, and put in the new ones
+            keep = ~np.isin(self.indices, indices)
+            nonzero = values != 0
+            new_indices = np.concatenate((self.indices[keep], indices[nonzero]))
+            new_values = np.concatenate((self.values[keep], values[nonzero]))
+            order = np.argsort(new_indices, kind="stable")
+            self.indices = new_indices[order]
+            self.values = new_values[order]
+            return
+        # a regular slice is replaced with the new values,
+        # and the length changes to fit.
+        stop = max(start, stop)
+        change = len(values) - (stop - start)
+        first, last = np.searchsorted(self.indices, [start, stop])
+        nonzero = np.flatnonzero(values)
+        self.indices = np.concatenate((self.indices[:first], nonzero + start,
+                                       self.indices[last:] + change))
+        self.values = np.concatenate((self.values[:first], values[nonzero],
+                                      self.values[last:]))
+        self.length += change
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step != 1:
+                deleted = np.arange(start, stop, step)
+                if step < 0:
+                    deleted = deleted[::-1]
+                keep = ~np.isin(self.indices, deleted)
+                indices = self.indices[keep]
+                # each one moves down by the number deleted before it
+                self.indices = indices - np.searchsorted(deleted, indices)
+                self.values = self.values[keep]
+                self.length -= len(deleted)
+                return
+            stop = max(start, stop)
+        else:
+            start = self._check_index(index, 'array assignment index out of range')
+            stop = start + 1
+        first, last = np.searchsorted(self.indices, [start, stop])
+        # all the items after them move down
+        self.indices = np.concatenate((self.indices[:first],
+                                       self.indices[last:] - (stop - start)))
+        self.values = np.concatenate((self.values[:first], self.values[last:]))
+        self.length -= stop - start
+
+    # arithmetic
+
+    def _check_other(self, other):
+        if len(other) != self.length:
+            raise ValueError("SparseArrays must be the same length: "
+                             "{} and {}".format(self.length, len(other)))
+
+    def __add__(self, other):
+        """
+        add another SparseArray, a dense array, or a number
+
+        Adding a SparseArray gives a SparseArray -- anything else
+        makes the zeros non-zero, so a dense numpy array is returned.
+        """
+        if isinstance(other, SparseArray):
+            self._check_other(other)
+            return self.from_coo(np.concatenate((self.indices, other.indices)),
+                                 np.concatenate((self.values, other.values)),
+                                 self.length)
+        return self.toarray() + other
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return self._from_sorted(self.indices.copy(), -self.values, self.length)
+
+    def __sub__(self, other):
+        if isinstance(other, SparseArray):
+            return self + (-other)
+        return self.toarray() - other
+
+    def __rsub__(self, other):
+        return other - self.toarray()
+
+    def __mul__(self, other):
+        """
+        multiply item by item with another SparseArray or dense array,
+        or multiply all the items by a number -- the result is a SparseArray
+        """
+        if isinstance(other, SparseArray):
+            self._check_other(other)
+            indices, mine, theirs = np.intersect1d(self.indices, other.indices,
+                                                   assume_unique=True,
+                                                   return_indices=True)
+            return self._from_sorted(indices,
+                                     self.values[mine] * other.values[theirs],
+                                     self.length)
+        if np.ndim(other) == 0:
+            return self._from_sorted(self.indices.copy(), self.values * other,
+                                     self.length)
+        other = np.asarray(other)
+        self._check_other(other)
+        return self._from_sorted(self.indices.copy(),
+                                 self.values * other[self.indices],
+                                 self.length)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        """
+        divide all the items by a number
+        """
+        return self._from_sorted(self.indices.copy(), self.values / other,
+                                 self.length)
+
+    def dot(self, other):
+        """
+        the dot product with another SparseArray or a dense array
+        """
+        if isinstance(other, SparseArray):
+            return (self * other).values.sum()
+        other = np.asarray(other)
+        self._check_other(other)
+        return self.values @ other[self.indices]
+
+    # reductions -- only the stored items are looked at
+
+    def sum(self):
+        return self.values.sum()
+
+    def max(self):
+        if self.length == 0:
+            raise ValueError("max() of an empty SparseArray")
+        if self.nnz == self.length:
+            return self.values.max()
+        # there are zeros in there, too
+        return max(self.values.max(), 0) if self.nnz else self.values.dtype.type(0)
+
+    def min(self):
+        if self.length == 0:
+            raise ValueError("min() of an empty SparseArray")
+        if self.nnz == self.length:
+            return self.values.min()
+        return min(self.values.min(), 0) if self.nnz else self.values.dtype.type(0)
+
+    def nonzero(self):
+        """
+        the indices of the non-zero items -- like numpy's nonzero()
+        """
+        return (self.indices.copy(),)
@@ -3,6 +3,9 @@
 example of emulating a sequence using slices
 """
 
+from sparse_iter import iter_runs, iter_dense, format_sparse
+from sparse_view import SparseArrayView
+
 
 class SparseArray(object):
 
@@ -21,31 +24,64 @@ class SparseArray(object):
         return self.length
 
     def __str__(self):
-        msg = ['SparseArray: [']
-        for i in range(self.length):
-            msg.append("{} ".format(self[i]))
-        msg.append(']')
-        return "".join(msg)
+        # only looks at the non-zero items -- long runs of zeros are shortened
+        return format_sparse('SparseArray', self.length, self.iter_nonzero())
+
+    def iter_nonzero(self):
+        """
+        yield (index, value) for each non-zero item, in order
+        """
+        for index in sorted(self.sparse_array):
+            yield index, self.sparse_array[index]
+
+    items = iter_nonzero
+
+    def iter_runs(self):
+        """
+        yield (value, count) for each run of the same value
+        """
+        return iter_runs(self.length, self.iter_nonzero())
+
+    def __iter__(self):
+        return iter_dense(self.length, self.iter_nonzero())
+
+    def sum(self):
+        """
+        the sum of the items -- only the non-zero ones need adding up
+        """
+        return sum(self.sparse_array.values())
 
     def __getitem__(self, index):
         # this version supports slicing -- far more complicated
-        mini_array = []
         if isinstance(index, slice):
-            start, stop, step = index.indices(len(self))
-            if step is None:
-                step = 1
-            key = start
-            mini_array = []
-            while key < stop:
-                mini_array.append(self[key])
-                key += step
-            return mini_array
+            # a view, rather than a list -- so nothing is copied
+            return SparseArrayView(self, range(*index.indices(len(self))))
         else:
             # makes it an int, even if it's some other
             # type that supports being used as an index
             index = index.__index__()
             return self._get_single_value(index)
 
+    def _iter_range(self, indices):
+        """
+        yield (index, value) for the non-zero items with indices in the range
+
+        (used by SparseArrayView)
+        """
+        sparse_array = self.sparse_array
+        if len(indices) < len(sparse_array):
+            # a short range -- look up each index
+            for key in indices:
+                if key in sparse_array:
+                    yield key, sparse_array[key]
+        else:
+            # the dict isn't in order -- so find them, and sort them.
+            found = sorted(key for key in sparse_array if key in indices)
+            if indices.step < 0:
+                found.reverse()
+            for key in found:
+                yield key, sparse_array[key]
+
     def _get_single_value(self, key):
         if key >= self.length:
             raise IndexError('array index out of range')
@@ -0,0 +1,267 @@
+"""
+A SparseArray that keeps the non-zero values in sorted lists
+
+slice_sparse.py stores the values in a dict. That's quick for getting
+a single item, but deleting an item (or inserting with a slice) means
+building a whole new dict, as all the keys after it change. And slices
+are made by looking up every index, one by one.
+
+This version keeps two lists, in order of index: the indices of the
+non-zero items, and their values. So:
+
+ * a single item is found with a binary search (the bisect module):
+   O(log nnz)
+ * a slice is a view, that only looks at the items that are in it:
+   O(log nnz + k)
+ * when an item is deleted (or inserted), the indices after it have
+   to change. Rather than changing them all each time, the change is
+   recorded as a "shift", and used when the index is needed. Once
+   there are enough shifts, they are all applied at once.
+
+(nnz is the number of non-zero items)
+"""
+
+from bisect import bisect_left
+
+from sparse_iter import iter_runs, iter_dense, format_sparse
+from sparse_view import SparseArrayView
+
+
+class SparseArray(object):
+
+    # how many shifts to keep before applying them
+    max_shifts = 32
+
+    def __init__(self, my_array=()):
+        """
+        initialize a sparse array
+
+        :param my_array: an initial sequence to start with
+                         if there are zeros in it, they will not be stored
+        """
+        self.length = len(my_array)
+        # the indices of the non-zero items, and their values
+        self.indices = []
+        self.values = []
+        for index, number in enumerate(my_array):
+            if number:
+                self.indices.append(index)
+                self.values.append(number)
+        # list of (position, delta): the items at that position in the
+        # lists and after it are really at index + delta
+        self._shifts = []
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        # only looks at the non-zero items -- long runs of zeros are shortened
+        return format_sparse('SparseArray', self.length, self.iter_nonzero())
+
+    def iter_nonzero(self):
+        """
+        yield (index, value) for each non-zero item, in order
+        """
+        self.apply_shifts()
+        return zip(self.indices, self.values)
+
+    items = iter_nonzero
+
+    def iter_runs(self):
+        """
+        yield (value, count) for each run of the same value
+        """
+        return iter_runs(self.length, self.iter_nonzero())
+
+    def __iter__(self):
+        return iter_dense(self.length, self.iter_nonzero())
+
+    def sum(self):
+        """
+        the sum of the items -- only the non-zero ones need adding up
+        """
+        return sum(self.values)
+
+    # dealing with the shifts
+
+    def _offset(self, pos):
+        """
+        how far the item at pos in the lists is from its stored index
+        """
+        offset = 0
+        for p, delta in self._shifts:
+            if pos >= p:
+                offset += delta
+        return offset
+
+    def _index_at(self, pos):
+        """
+        the real index of the item at pos in the lists
+        """
+        return self.indices[pos] + self._offset(pos)
+
+    def _find(self, index):
+        """
+        the position in the lists of the first item at index or after it
+        """
+        if not self._shifts:
+            return bisect_left(self.indices, index)
+        lo, hi = 0, len(self.indices)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._index_at(mid) < index:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _shift(self, pos, delta):
+        """
+        move the items from pos on by delta
+        """
+        if delta and pos < len(self.indices):
+            self._shifts.append((pos, delta))
+            if len(self._shifts) > self.max_shifts:
+                self.apply_shifts()
+
+    def apply_shifts(self):
+        """
+        update all the stored indices, so there are no shifts left
+        """
+        if not self._shifts:
+            return
+        indices = self.indices
+        shifts = sorted(self._shifts)
+        offset = 0
+        for i, (pos, delta) in enumerate(shifts):
+            offset += delta
+            end = shifts[i + 1][0] if i + 1 < len(shifts) else len(indices)
+            if offset and end > pos:
+                indices[pos:end] = [index + offset for index in indices[pos:end]]
+        self._shifts = []
+
+    def _insert(self, pos, indices, values):
+        """
+        put new items in the lists at pos
+
+        :param indices: the real indices of the new items -- in order
+        """
+        offset = self._offset(pos)
+        if offset:
+            indices = [index - offset for index in indices]
+        self.indices[pos:pos] = indices
+        self.values[pos:pos] = values
+        num = len(indices)
+        # the shifts after pos need to stay with the items they belong to
+        self._shifts = [(p + num if p > pos else p, delta)
+                        for p, delta in self._shifts]
+
+    def _remove(self, start, stop):
+        """
+        take the items from positions start to stop out of the lists
+        """
+        del self.indices[start:stop]
+        del self.values[start:stop]
+        num = stop - start
+        self._shifts = [(p - num if p >= stop else min(p, start), delta)
+                        for p, delta in self._shifts]
+
+    # the sequence methods
+
+    def _check_index(self, index, msg):
+        index = index.__index__()
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(msg)
+        return index
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._get_slice(index)
+        index = self._check_index(index, 'array index out of range')
+        pos = self._find(index)
+        if pos < len(self.indices) and self._index_at(pos) == index:
+            return self.values[pos]
+        return 0
+
+    def _get_slice(self, sl):
+        # a view, rather than a list -- so nothing is copied
+        return SparseArrayView(self, range(*sl.indices(self.length)))
+
+    def _iter_range(self, indices):
+        """
+        yield (index, value) for the non-zero items with indices in the range
+
+        (used by SparseArrayView)
+        """
+        if not indices:
+            return
+        if indices.step < 0:
+            # the ones in the reversed range, backwards
+            yield from reversed(list(self._iter_range(indices[::-1])))
+            return
+        start, stop, step = indices.start, indices.stop, indices.step
+        pos = self._find(start)
+        while pos < len(self.indices):
+            index = self._index_at(pos)
+            if index >= stop:
+                break
+            if (index - start) % step == 0:
+                yield index, self.values[pos]
+            pos += 1
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._set_slice(index, value)
+            return
+        index = self._check_index(index, 'array assignment index out of range')
+        pos = self._find(index)
+        if pos < len(self.indices) and self._index_at(pos) == index:
+            if value:
+                self.values[pos] = value
+            else:
+                self._remove(pos, pos + 1)
+        elif value:
+            self._insert(pos, [index], [value])
+
+    def _set_slice(self, sl, values):
+        start, stop, step = sl.indices(self.length)
+        values = list(values)
+        if step != 1:
+            # extended slices can't change the length -- like a list
+            indices = range(start, stop, step)
+            if len(values) != len(indices):
+                raise ValueError("attempt to assign sequence of size {} "
+                                 "to extended slice of size {}"
+                                 .format(len(values), len(indices)))
+            for index, value in zip(indices, values):
+                self[index] = value
+            return
+        # a regular slice is replaced with the new values,
+        # and the length changes to fit.
+        stop = max(start, stop)
+        first = self._find(start)
+        self._remove(first, self._find(stop))
+        self._shift(first, len(values) - (stop - start))
+        new = [(start + i, val) for i, val in enumerate(values) if val]
+        self._insert(first, [i for i, _ in new], [val for _, val in new])
+        self.length += len(values) - (stop - start)
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step != 1:
+                # one at a time -- from the end, so the indices don't move
+                indices = range(start, stop, step)
+                for i in sorted(indices, reverse=True):
+                    del self[i]
+                return
+            stop = max(start, stop)
+        else:
+            start = self._check_index(index, 'array assignment index out of range')
+            stop = start + 1
+        first = self._find(start)
+        self._remove(first, self._find(stop))
+        self._shift(first, start - stop)
+        self.length -= stop - start
@@ -0,0 +1,72 @@
+"""
+Iterating through a SparseArray without looking at all the zeros
+
+All of these work from the non-zero items: an iterator of
+(index, value) pairs, in order of index. So they take time in
+proportion to the number of non-zero items, not the length of the
+array (except for iter_dense, of course, which has to produce all
+the zeros).
+"""
+
+from itertools import repeat
+
+
+def _item_runs(length, nonzero):
+    # the runs of zeros, with each non-zero item as a run of its own
+    pos = 0
+    for index, value in nonzero:
+        if index > pos:
+            yield 0, index - pos
+        yield value, 1
+        pos = index + 1
+    if length > pos:
+        yield 0, length - pos
+
+
+def iter_runs(length, nonzero):
+    """
+    yield (value, count) for each run of the same value
+
+    all the zeros between two non-zero items come out as one run, and
+    so do next-door non-zero items with the same value (and type)
+
+    :param length: the length of the array
+
+    :param nonzero: iterable of (index, value) for the non-zero items
+    """
+    run_value, run_count = None, 0
+    for value, count in _item_runs(length, nonzero):
+        # the same type, too -- 1, 1.0 and True are == but print
+        # differently
+        if run_count and type(value) is type(run_value) and value == run_value:
+            run_count += count
+        else:
+            if run_count:
+                yield run_value, run_count
+            run_value, run_count = value, count
+    if run_count:
+        yield run_value, run_count
+
+
+def iter_dense(length, nonzero):
+    """
+    yield every value of the array, zeros and all
+    """
+    for value, count in _item_runs(length, nonzero):
+        yield from repeat(value, count)
+
+
+def format_sparse(name, length, nonzero, max_zeros=4):
+    """
+    the string version of a SparseArray
+
+    runs of more than max_zeros zeros are shortened to: "<n zeros>"
+    """
+    msg = ['{}: ['.format(name)]
+    for value, count in iter_runs(length, nonzero):
+        if count > max_zeros and value == 0:
+            msg.append("<{} zeros> ".format(count))
+        else:
+            msg.append("{} ".format(value) * count)
+    msg.append(']')
+    return "".join(msg)
@@ -0,0 +1,443 @@
+"""
+A 2-d sparse matrix, built on the ideas of the SparseArray
+
+Only the non-zero values are stored, in one of the two usual
+"compressed" formats:
+
+ * CSR (compressed sparse row): the non-zero values row by row, with
+   their column indices, and "indptr": where each row starts in them.
+   So row i is data[indptr[i]:indptr[i + 1]]. Getting a row is quick.
+
+ * CSC (compressed sparse column): the same thing, but column by column.
+   Getting a column is quick.
+
+A row or column comes out as a (numpy) SparseArray, and a SparseMatrix
+can be made from a bunch of SparseArray rows.
+
+All the work is done by numpy on the whole arrays -- there are no
+python loops over the values.
+
+Requires numpy.
+"""
+
+import numpy as np
+
+from np_sparse import SparseArray
+
+
+def _sum_by(keys, values, size):
+    """
+    add up the values with the same key: result[k] is the sum of
+    values[keys == k] -- with the same dtype as the values
+
+    np.bincount is the quickest way, but it only adds up float64, so
+    it's only used for floats (and the parts of complex numbers) --
+    ints would lose precision past 2**53.
+    """
+    dtype = values.dtype
+    if dtype.kind == "f" and dtype.itemsize <= 8:
+        sums = np.bincount(keys, weights=values, minlength=size)
+        return sums.astype(dtype, copy=False)
+    if dtype.kind == "c" and dtype.itemsize <= 16:
+        sums = np.empty(size, dtype=dtype)
+        sums.real = np.bincount(keys, weights=values.real, minlength=size)
+        sums.imag = np.bincount(keys, weights=values.imag, minlength=size)
+        return sums
+    sums = np.zeros(size, dtype=dtype)
+    np.add.at(sums, keys, values)
+    return sums
+
+
+class SparseMatrix(object):
+
+    # sparse @ sparse is done in blocks of rows, so there aren't more
+    # than this many products, or values in the dense array they are
+    # added up in, at a time.
+    max_products = 2 ** 22
+    max_block = 2 ** 22
+
+    def __init__(self, data, indices, indptr, shape, format="csr"):
+        """
+        make a SparseMatrix from the compressed arrays
+
+        Usually you'll want one of the from_* classmethods instead.
+
+        :param data: the non-zero values
+
+        :param indices: their column indices (for csr) or row indices (csc)
+
+        :param indptr: where each row (csr) or column (csc) starts in data
+
+        :param shape: (number of rows, number of columns)
+
+        :param format="csr": "csr" or "csc"
+        """
+        if format not in ("csr", "csc"):
+            raise ValueError('format must be "csr" or "csc", not {!r}'.format(format))
+        self.data = np.asarray(data)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.shape = tuple(shape)
+        self.format = format
+        major = self.shape[0] if format == "csr" else self.shape[1]
+        if len(self.indptr) != major + 1:
+            raise ValueError("indptr must be one longer than the number of "
+                             "{}".format("rows" if format == "csr" else "columns"))
+
+    # making them
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape, format="csr"):
+        """
+        make a SparseMatrix from the row, column and value of each item
+
+        The items can be in any order -- the values of repeated
+        (row, column) pairs are added together, and zeros are dropped.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        values = np.asarray(values)
+        nrows, ncols = shape
+        if len(rows) and (rows.min() < 0 or rows.max() >= nrows or
+                          cols.min() < 0 or cols.max() >= ncols):
+            raise IndexError("index out of range for shape {}".format(shape))
+        if format == "csr":
+            major, minor, num_major, num_minor = rows, cols, nrows, ncols
+        else:
+            major, minor, num_major, num_minor = cols, rows, ncols, nrows
+        # sort them, and add up the repeats
+        keys = major * num_minor + minor
+        keys, inverse = np.unique(keys, return_inverse=True)
+        summed = np.zeros(len(keys), dtype=values.dtype)
+        np.add.at(summed, inverse.ravel(), values)
+        keep = summed != 0
+        keys = keys[keep]
+        major, minor = np.divmod(keys, num_minor)
+        indptr = np.zeros(num_major + 1, dtype=np.intp)
+        np.cumsum(np.bincount(major, minlength=num_major), out=indptr[1:])
+        return cls(summed[keep], minor, indptr, shape, format)
+
+    @classmethod
+    def from_dense(cls, array, format="csr"):
+        """
+        make a SparseMatrix from a regular 2-d array (or nested lists)
+        """
+        array = np.asarray(array)
+        if array.ndim != 2:
+            raise ValueError("SparseMatrix must be 2-d")
+        rows, cols = np.nonzero(array)
+        return cls.from_coo(rows, cols, array[rows, cols], array.shape, format)
+
+    @classmethod
+    def from_rows(cls, rows, format="csr"):
+        """
+        make a SparseMatrix out of rows
+
+        :param rows: a sequence of (numpy) SparseArrays, all the same
+                     length. Anything else is turned into a SparseArray.
+        """
+        rows = [row if isinstance(row, SparseArray) else SparseArray(row)
+                for row in rows]
+        ncols = len(rows[0]) if rows else 0
+        if any(len(row) != ncols for row in rows):
+            raise ValueError("rows must all be the same length")
+        lengths = [row.nnz for row in rows]
+        indptr = np.zeros(len(rows) + 1, dtype=np.intp)
+        np.cumsum(lengths, out=indptr[1:])
+        if rows:
+            data = np.concatenate([row.values for row in rows])
+            indices = np.concatenate([row.indices for row in rows])
+        else:
+            data = np.zeros(0)
+            indices = np.zeros(0, dtype=np.intp)
+        matrix = cls(data, indices, indptr, (len(rows), ncols), "csr")
+        return matrix if format == "csr" else matrix.tocsc()
+
+    # converting them
+
+    def _major_ids(self):
+        # the row (csr) or column (csc) of each stored value
+        return np.repeat(np.arange(len(self.indptr) - 1), np.diff(self.indptr))
+
+    def tocoo(self):
+        """
+        the (rows, cols, values) of the non-zero items
+        """
+        if self.format == "csr":
+            return self._major_ids(), self.indices.copy(), self.data.copy()
+        return self.indices.copy(), self._major_ids(), self.data.copy()
+
+    def asformat(self, format):
+        """
+        the same matrix in the given format -- itself if it already is
+        """
+        if format == self.format:
+            return self
+        return self.from_coo(*self.tocoo(), shape=self.shape, format=format)
+
+    def tocsr(self):
+        return self.asformat("csr")
+
+    def tocsc(self):
+        return self.asformat("csc")
+
+    def toarray(self):
+        """
+        a regular (dense) 2-d numpy array with the same values
+        """
+        dense = np.zeros(self.shape, dtype=self.data.dtype)
+        rows, cols, values = self.tocoo()
+        dense[rows, cols] = values
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.toarray()
+        if dtype is not None:
+            dense = dense.astype(dtype, copy=False)
+        return dense
+
+    @property
+    def T(self):
+        """
+        the transpose -- it uses the same arrays:
+        the csr of a matrix is the csc of its transpose.
+        """
+        return SparseMatrix(self.data, self.indices, self.indptr,
+                            self.shape[::-1],
+                            "csc" if self.format == "csr" else "csr")
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    def __repr__(self):
+        return "<SparseMatrix {}x{}, {} stored values, {}>".format(
+            self.shape[0], self.shape[1], self.nnz, self.format)
+
+    def __str__(self):
+        return "SparseMatrix:\n{}".format(self.toarray())
+
+    # getting items, rows and columns
+
+    def _major(self, i):
+        # row i of a csr, or column i of a csc, as a SparseArray
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        length = self.shape[1] if self.format == "csr" else self.shape[0]
+        return SparseArray._from_sorted(self.indices[start:stop].copy(),
+                                        self.data[start:stop].copy(),
+                                        length)
+
+    def _major_slice(self, sl):
+        # a slice of rows of a csr, or columns of a csc
+        num_major = len(self.indptr) - 1
+        start, stop, step = sl.indices(num_major)
+        chosen = np.arange(start, stop, step)
+        starts, stops = self.indptr[chosen], self.indptr[chosen + 1]
+        lengths = stops - starts
+        indptr = np.zeros(len(chosen) + 1, dtype=np.intp)
+        np.cumsum(lengths, out=indptr[1:])
+        if step == 1:
+            # all together in the arrays -- no need to gather them
+            positions = slice(self.indptr[start], self.indptr[stop] if chosen.size
+                              else self.indptr[start])
+        else:
+            positions = (np.repeat(starts - indptr[:-1], lengths) +
+                         np.arange(indptr[-1]))
+        shape = list(self.shape)
+        shape[0 if self.format == "csr" else 1] = len(chosen)
+        return SparseMatrix(self.data[positions].copy(),
+                            self.indices[positions].copy(),
+                            indptr, shape, self.format)
+
+    def _minor_slice(self, sl):
+        # a slice of columns of a csr, or rows of a csc
+        num_minor = self.shape[1] if self.format == "csr" else self.shape[0]
+        chosen = np.arange(*sl.indices(num_minor))
+        if len(chosen) == num_minor and sl.indices(num_minor)[2] == 1:
+            # all of them
+            return self
+        # where each one goes in the new matrix -- -1 if it's not there
+        new_place = np.full(num_minor, -1, dtype=np.intp)
+        new_place[chosen] = np.arange(len(chosen))
+        minor = new_place[self.indices]
+        keep = minor >= 0
+        major = self._major_ids()[keep]
+        minor = minor[keep]
+        data = self.data[keep]
+        if len(chosen) > 1 and chosen[1] < chosen[0]:
+            # backwards -- so they need to be put back in order
+            order = np.lexsort((minor, major))
+            minor = minor[order]
+            data = data[order]
+        indptr = np.zeros(len(self.indptr), dtype=np.intp)
+        np.cumsum(np.bincount(major, minlength=len(self.indptr) - 1),
+                  out=indptr[1:])
+        shape = list(self.shape)
+        shape[1 if self.format == "csr" else 0] = len(chosen)
+        return SparseMatrix(data, minor, indptr, shape, self.format)
+
+    @staticmethod
+    def _check_index(i, length):
+        i = i.__index__()
+        if i < 0:
+            i += length
+        if not 0 <= i < length:
+            raise IndexError("index out of range")
+        return i
+
+    def row(self, i):
+        """
+        row i, as a SparseArray
+        """
+        i = self._check_index(i, self.shape[0])
+        if self.format == "csr":
+            return self._major(i)
+        return self.T._minor(i)
+
+    def col(self, j):
+        """
+        column j, as a SparseArray
+        """
+        j = self._check_index(j, self.shape[1])
+        if self.format == "csc":
+            return self._major(j)
+        return self.T._minor(j)
+
+    def _minor(self, i):
+        # row i of a csc, or column i of a csr -- it's in every one of
+        # the others, so look through them all at once
+        hits = np.flatnonzero(self.indices == i)
+        major = np.searchsorted(self.indptr, hits, side="right") - 1
+        length = len(self.indptr) - 1
+        return SparseArray._from_sorted(major, self.data[hits].copy(), length)
+
+    def __getitem__(self, index):
+        """
+        m[i] or m[i, :]: row i, as a SparseArray
+        m[:, j]: column j, as a SparseArray
+        m[i, j]: a single value
+        m[i0:i1], m[:, j0:j1], m[i0:i1, j0:j1]: a new SparseMatrix
+        """
+        if not isinstance(index, tuple):
+            index = (index, slice(None))
+        rows, cols = index
+        if isinstance(rows, slice) and isinstance(cols, slice):
+            if self.format == "csr":
+                return self._major_slice(rows)._minor_slice(cols)
+            return self._major_slice(cols)._minor_slice(rows)
+        if isinstance(rows, slice):
+            return self.col(cols)[rows]
+        if isinstance(cols, slice):
+            return self.row(rows)[cols]
+        if self.format == "csr":
+            return self.row(rows)[cols]
+        return self.col(cols)[rows]
+
+    # multiplying
+
+    def dot(self, other):
+        """
+        matrix multiplication
+
+        :param other: a vector (1-d array, list or SparseArray), a 2-d
+                      dense array, or another SparseMatrix.
+
+        :returns: a dense vector, a dense 2-d array, or a SparseMatrix
+                  (for another SparseMatrix)
+        """
+        if isinstance(other, SparseMatrix):
+            return self._matmat_sparse(other)
+        if isinstance(other, SparseArray):
+            other = other.toarray()
+        other = np.asarray(other)
+        if other.shape[0] != self.shape[1]:
+            raise ValueError("shapes {} and {} not aligned".format(self.shape,
+                                                                   other.shape))
+        if other.ndim == 1:
+            return self._matvec(other)
+        return self._matmat_dense(other)
+
+    __matmul__ = dot
+
+    def _matvec(self, vector):
+        major = self._major_ids()
+        if self.format == "csr":
+            return _sum_by(major, self.data * vector[self.indices], self.shape[0])
+        return _sum_by(self.indices, self.data * vector[major], self.shape[0])
+
+    def _matmat_dense(self, other):
+        result = np.zeros((self.shape[0], other.shape[1]),
+                          dtype=np.result_type(self.data, other))
+        major = self._major_ids()
+        if self.format == "csr":
+            np.add.at(result, major, self.data[:, None] * other[self.indices])
+        else:
+            np.add.at(result, self.indices, self.data[:, None] * other[major])
+        return result
+
+    def _matmat_sparse(self, other):
+        if other.shape[0] != self.shape[1]:
+            raise ValueError("shapes {} and {} not aligned".format(self.shape,
+                                                                   other.shape))
+        a = self.tocsr()
+        b = other.tocsr()
+        nrows, ncols = self.shape[0], other.shape[1]
+        # every stored a[i, k] is multiplied by every stored b[k, j] in row k.
+        # That can be a lot of products -- so it's done a block of rows
+        # at a time, adding up the products of each block in a dense array.
+        counts = np.diff(b.indptr)[a.indices]
+        products_before = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=products_before[1:])
+        row_products = products_before[a.indptr]
+        major_ids = a._major_ids()
+        max_rows = max(1, self.max_block // max(ncols, 1))
+        dtype = np.result_type(a.data, b.data)
+        data, indices, row_ids = [], [], []
+        start = 0
+        while start < nrows:
+            stop = np.searchsorted(row_products,
+                                   row_products[start] + self.max_products,
+                                   side="right") - 1
+            stop = max(start + 1, min(stop, start + max_rows, nrows))
+            first, last = a.indptr[start], a.indptr[stop]
+            block_counts = counts[first:last]
+            total = block_counts.sum()
+            if total:
+                rows = np.repeat(major_ids[first:last] - start, block_counts)
+                firsts = products_before[first:last] - products_before[first]
+                positions = (np.repeat(b.indptr[a.indices[first:last]] - firsts,
+                                       block_counts) +
+                             np.arange(total))
+                values = np.repeat(a.data[first:last], block_counts) * b.data[positions]
+                keys = rows * ncols + b.indices[positions]
+                block_size = (stop - start) * ncols
+                if total * 8 < block_size:
+                    # not many -- sorting them is quicker than the dense array
+                    found, inverse = np.unique(keys, return_inverse=True)
+                    sums = _sum_by(inverse.ravel(), values, len(found))
+                    nonzero = sums != 0
+                    found = found[nonzero]
+                    sums = sums[nonzero]
+                else:
+                    sums = _sum_by(keys, values, block_size)
+                    found = np.flatnonzero(sums)
+                    sums = sums[found]
+                data.append(sums)
+                indices.append(found % ncols)
+                row_ids.append(found // ncols + start)
+            start = stop
+        if data:
+            data = np.concatenate(data)
+            indices = np.concatenate(indices)
+            row_ids = np.concatenate(row_ids)
+        else:
+            data = np.zeros(0, dtype=dtype)
+            indices = row_ids = np.zeros(0, dtype=np.intp)
+        indptr = np.zeros(nrows + 1, dtype=np.intp)
+        np.cumsum(np.bincount(row_ids, minlength=nrows), out=indptr[1:])
+        result = SparseMatrix(data, indices, indptr, (nrows, ncols), "csr")
+        return result.asformat(self.format)
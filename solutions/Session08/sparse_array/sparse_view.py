@@ -0,0 +1,95 @@
+"""
+A view of a slice of a SparseArray
+
+Making a slice of a SparseArray a list means a list item for every
+index, zeros and all -- a slice of a million items that are almost
+all zero is still a million item list.
+
+A SparseArrayView just remembers which SparseArray it came from, and
+which indices of it are in the slice (as a range object). Nothing is
+copied until it's needed: the non-zero items are looked up in the
+SparseArray as the view is iterated through.
+
+Like a numpy view (and unlike a list slice), changes to the SparseArray
+show up in the view.
+
+The SparseArray needs an _iter_range(a_range) method that yields
+(index, value) for the non-zero items at the indices in the range,
+in the order of the range.
+"""
+
+from sparse_iter import iter_runs, iter_dense, format_sparse
+
+
+class SparseArrayView(object):
+
+    def __init__(self, parent, indices):
+        """
+        :param parent: the SparseArray it's a view of
+
+        :param indices: a range of the indices of the parent in the view
+        """
+        self.parent = parent
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            # a slice of a range is a range -- so a view of a view
+            # is just another view of the parent
+            return SparseArrayView(self.parent, self.indices[index])
+        try:
+            return self.parent[self.indices[index]]
+        except IndexError:
+            raise IndexError('view index out of range')
+
+    def iter_nonzero(self):
+        """
+        yield (index, value) for each non-zero item in the view
+
+        only the non-zero items are looked at
+        """
+        start, step = self.indices.start, self.indices.step
+        for index, value in self.parent._iter_range(self.indices):
+            yield (index - start) // step, value
+
+    items = iter_nonzero
+
+    def iter_runs(self):
+        """
+        yield (value, count) for each run of the same value
+        """
+        return iter_runs(len(self), self.iter_nonzero())
+
+    def __iter__(self):
+        return iter_dense(len(self), self.iter_nonzero())
+
+    def sum(self):
+        return sum(value for _, value in self.iter_nonzero())
+
+    def tolist(self):
+        """
+        the values in the view, as a list
+        """
+        result = [0] * len(self)
+        for index, value in self.iter_nonzero():
+            result[index] = value
+        return result
+
+    def __eq__(self, other):
+        try:
+            if len(other) != len(self):
+                return False
+        except TypeError:
+            return NotImplemented
+        return self.tolist() == list(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "SparseArrayView({!r}, {!r})".format(self.parent, self.indices)
+
+    def __str__(self):
+        return format_sparse('SparseArrayView', len(self), self.iter_nonzero())
@@ -0,0 +1,135 @@
+"""
+tests of the on-disk SparseArray
+"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from disk_sparse import DiskSparseArray  # noqa: E402  (needs numpy)
+
+MY_ARRAY = [2, 0, 0, 0, 3, 0, 0, 0, 4, 5, 6, 0, 2, 9]
+
+
+@pytest.fixture
+def my_sparse(tmp_path):
+    sa = DiskSparseArray(str(tmp_path / "sparse"), length=len(MY_ARRAY))
+    indices = [i for i, val in enumerate(MY_ARRAY) if val]
+    sa.append_sorted(indices, [MY_ARRAY[i] for i in indices])
+    return sa
+
+
+def test_new(tmp_path):
+    sa = DiskSparseArray(str(tmp_path / "sparse"), length=10)
+    assert len(sa) == 10
+    assert sa.nnz == 0
+    assert sa[5] == 0
+    assert list(sa) == [0] * 10
+    with pytest.raises(ValueError):
+        DiskSparseArray(str(tmp_path / "another"))
+
+
+def test_get(my_sparse):
+    for i, val in enumerate(MY_ARRAY):
+        assert my_sparse[i] == val
+    assert my_sparse[-1] == 9
+    with pytest.raises(IndexError):
+        my_sparse[14]
+    assert list(my_sparse) == MY_ARRAY
+
+
+def test_set(my_sparse):
+    my_sparse[1] = 7
+    my_sparse[4] = 0
+    assert my_sparse[1] == 7
+    assert my_sparse[4] == 0
+    assert my_sparse.nnz == 7
+    expected = MY_ARRAY[:]
+    expected[1] = 7
+    expected[4] = 0
+    assert list(my_sparse) == expected
+    my_sparse.flush()
+    assert my_sparse.delta == {}
+    assert list(my_sparse) == expected
+    assert my_sparse.nnz == 7
+
+
+def test_delete(my_sparse):
+    with pytest.raises(TypeError):
+        del my_sparse[3]
+
+
+def test_slice(my_sparse):
+    my_sparse[5] = 1
+    expected = MY_ARRAY[:]
+    expected[5] = 1
+    assert my_sparse[3:10] == expected[3:10]
+    assert my_sparse[::-3] == expected[::-3]
+    assert list(my_sparse[2:12].items()) == [(2, 3), (3, 1), (6, 4), (7, 5), (8, 6)]
+
+
+def test_sum_and_str(my_sparse):
+    my_sparse[0] = 0
+    my_sparse[1] = 1
+    assert my_sparse.sum() == sum(MY_ARRAY) - 2 + 1
+    assert str(my_sparse) == "DiskSparseArray: [0 1.0 0 0 3.0 0 0 0 4.0 5.0 6.0 0 2.0 9.0 ]"
+
+
+def test_get_same_type(my_sparse):
+    """
+    items from the files, the changes and the zeros are all python floats
+    """
+    my_sparse[1] = 7
+    assert type(my_sparse[0]) is float
+    assert type(my_sparse[1]) is float
+    assert type(my_sparse[2]) is float
+
+
+def test_set_slice(my_sparse):
+    with pytest.raises(TypeError):
+        my_sparse[0:2] = [1, 2]
+
+
+def test_reopen(tmp_path):
+    path = str(tmp_path / "sparse")
+    with DiskSparseArray(path, length=1000, dtype="int32") as sa:
+        sa[10] = 3
+        sa[500] = 4
+    sa = DiskSparseArray(path)
+    assert len(sa) == 1000
+    assert sa.dtype == np.int32
+    assert sa[500] == 4
+    assert sa.nnz == 2
+
+
+def test_append_sorted(my_sparse):
+    with pytest.raises(IndexError):
+        my_sparse.append_sorted([5], [1])
+    with pytest.raises(ValueError):
+        my_sparse.append_sorted([3, 2], [1, 1])
+
+
+def test_many_changes(tmp_path, monkeypatch):
+    """
+    lots of random changes, flushed in lots of small chunks
+    """
+    monkeypatch.setattr(DiskSparseArray, "chunk_size", 7)
+    random.seed(5)
+    length = 500
+    model = [0] * length
+    sa = DiskSparseArray(str(tmp_path / "sparse"), length=length, dtype="int64",
+                         max_delta=13)
+    for i in range(2000):
+        index = random.randrange(length)
+        value = random.choice([0, 0, 1, 2, 3])
+        model[index] = value
+        sa[index] = value
+        if i % 100 == 0:
+            assert sa[10:400:3] == model[10:400:3]
+    assert list(sa) == model
+    assert sa.sum() == sum(model)
+    assert sa.nnz == sum(1 for val in model if val)
+    sa.flush()
+    assert list(sa) == model
@@ -0,0 +1,188 @@
+"""
+tests the numpy version of SparseArray
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from np_sparse import SparseArray  # noqa: E402  (needs numpy)
+
+
+def set_up():
+    my_array = [2, 0, 0, 0, 3, 0, 0, 0, 4, 5, 6, 0, 2, 9]
+    my_sparse = SparseArray(my_array)
+    return (my_array, my_sparse)
+
+
+def test_object_exists():
+    my_array, my_sparse = set_up()
+    assert isinstance(my_sparse, SparseArray)
+    assert my_sparse.nnz == 7
+
+
+def test_get_items():
+    my_array, my_sparse = set_up()
+    assert my_sparse[4] == 3
+    assert my_sparse[1] == 0
+    assert my_sparse[-1] == 9
+    with pytest.raises(IndexError):
+        my_sparse[14]
+
+
+def test_get_length():
+    my_array, my_sparse = set_up()
+    assert len(my_sparse) == 14
+
+
+def test_toarray():
+    my_array, my_sparse = set_up()
+    assert np.array_equal(my_sparse.toarray(), my_array)
+    assert np.array_equal(np.asarray(my_sparse), my_array)
+
+
+@pytest.mark.parametrize("sl", [slice(2, 4), slice(None), slice(1, None, 3),
+                                slice(None, None, -2), slice(10, 2, -3),
+                                slice(5, 2)])
+def test_get_slice(sl):
+    my_array, my_sparse = set_up()
+    result = my_sparse[sl]
+    assert isinstance(result, SparseArray)
+    assert result.toarray().tolist() == my_array[sl]
+
+
+def test_set_items():
+    my_array, my_sparse = set_up()
+    my_sparse[1] = 4
+    my_sparse[4] = 0
+    my_sparse[0] = 7
+    my_array[1] = 4
+    my_array[4] = 0
+    my_array[0] = 7
+    assert my_sparse.toarray().tolist() == my_array
+    assert my_sparse.nnz == 7
+
+
+def test_delete():
+    my_array, my_sparse = set_up()
+    del my_sparse[3]
+    del my_sparse[3]
+    del my_array[3]
+    del my_array[3]
+    assert my_sparse.toarray().tolist() == my_array
+    assert len(my_sparse) == 12
+
+
+def test_set_item_converted():
+    """
+    the value is converted to the dtype before checking for zero
+    """
+    sa = SparseArray([1, 0, 0])
+    sa[1] = 0.5
+    sa[2] = 2.5
+    sa[0] = 0.25
+    assert sa.toarray().tolist() == [0, 0, 2]
+    assert sa.nnz == 1
+    assert sa.indices.tolist() == [2]
+    sa[0:3] = [0.5, 3.5, 0.1]
+    assert sa.toarray().tolist() == [0, 3, 0]
+    assert sa.nnz == 1
+
+
+SLICES = [slice(2, 5), slice(None), slice(1, None, 3), slice(None, None, -2),
+          slice(10, 2, -3), slice(5, 2), slice(12, None), slice(0, 0)]
+
+
+@pytest.mark.parametrize("sl", SLICES)
+def test_set_slice(sl):
+    my_array, my_sparse = set_up()
+    size = len(my_array[sl])
+    new = [0, 7, 8][:size] + [0, 1] * (size // 2) + [3] * (size % 2)
+    new = new[:size]
+    my_sparse[sl] = new
+    my_array[sl] = new
+    assert my_sparse.toarray().tolist() == my_array
+    assert my_sparse.nnz == len(my_array) - my_array.count(0)
+
+
+@pytest.mark.parametrize("new", [[], [1], [0, 0, 0, 0, 0], [1, 0, 2, 0, 3, 0, 4]])
+def test_set_slice_change_length(new):
+    my_array, my_sparse = set_up()
+    my_sparse[3:6] = new
+    my_array[3:6] = new
+    assert len(my_sparse) == len(my_array)
+    assert my_sparse.toarray().tolist() == my_array
+
+
+def test_set_extended_slice_wrong_size():
+    my_array, my_sparse = set_up()
+    with pytest.raises(ValueError):
+        my_sparse[::2] = [1, 2]
+
+
+@pytest.mark.parametrize("sl", SLICES)
+def test_delete_slice(sl):
+    my_array, my_sparse = set_up()
+    del my_sparse[sl]
+    del my_array[sl]
+    assert len(my_sparse) == len(my_array)
+    assert my_sparse.toarray().tolist() == my_array
+
+
+def test_from_coo():
+    sa = SparseArray.from_coo([5, 1, 5, 3], [1.0, 2.0, 3.0, 0.0], 8)
+    assert sa.toarray().tolist() == [0, 2, 0, 0, 0, 4, 0, 0]
+    assert sa.nnz == 2
+    with pytest.raises(IndexError):
+        SparseArray.from_coo([8], [1], 8)
+
+
+def test_add():
+    a = SparseArray([1, 0, 2, 0, 3])
+    b = SparseArray([0, 0, -2, 4, 1])
+    result = a + b
+    assert isinstance(result, SparseArray)
+    assert result.toarray().tolist() == [1, 0, 0, 4, 4]
+    # the zero isn't stored
+    assert result.nnz == 3
+    assert (a - b).toarray().tolist() == [1, 0, 4, -4, 2]
+
+
+def test_add_dense():
+    a = SparseArray([1, 0, 2])
+    assert (a + 1).tolist() == [2, 1, 3]
+    assert (1 + a).tolist() == [2, 1, 3]
+    assert (a + np.array([1, 1, 1])).tolist() == [2, 1, 3]
+
+
+def test_add_wrong_length():
+    with pytest.raises(ValueError):
+        SparseArray([1, 2]) + SparseArray([1, 2, 3])
+
+
+def test_mul():
+    a = SparseArray([1, 0, 2, 0, 3])
+    b = SparseArray([0, 0, -2, 4, 1])
+    assert (a * b).toarray().tolist() == [0, 0, -4, 0, 3]
+    assert (a * 2).toarray().tolist() == [2, 0, 4, 0, 6]
+    assert (2 * a).toarray().tolist() == [2, 0, 4, 0, 6]
+    assert (a * np.arange(5)).toarray().tolist() == [0, 0, 4, 0, 12]
+    assert (a / 2).toarray().tolist() == [0.5, 0, 1, 0, 1.5]
+
+
+def test_dot():
+    a = SparseArray([1, 0, 2, 0, 3])
+    b = SparseArray([0, 0, -2, 4, 1])
+    assert a.dot(b) == -1
+    assert a.dot(np.arange(5)) == 16
+
+
+def test_reductions():
+    my_array, my_sparse = set_up()
+    assert my_sparse.sum() == sum(my_array)
+    assert my_sparse.max() == 9
+    assert my_sparse.min() == 0
+    neg = SparseArray([-1, -2, -3])
+    assert neg.max() == -1
+    assert SparseArray([0, 0]).max() == 0
+    assert my_sparse.nonzero()[0].tolist() == [0, 4, 8, 9, 10, 12, 13]
@@ -0,0 +1,190 @@
+"""
+tests the sorted list version of SparseArray
+"""
+
+
+import pytest
+from sorted_sparse import SparseArray
+
+
+def set_up():
+    my_array = [2, 0, 0, 0, 3, 0, 0, 0, 4, 5, 6, 0, 2, 9]
+    my_sparse = SparseArray(my_array)
+    return (my_array, my_sparse)
+
+
+def test_object_exists():
+    my_array, my_sparse = set_up()
+    assert isinstance(my_sparse, SparseArray)
+
+
+def test_get_non_zero_number():
+    my_array, my_sparse = set_up()
+    assert my_sparse[4] == 3
+
+
+def test_get_zero():
+    my_array, my_sparse = set_up()
+    assert my_sparse[1] == 0
+
+
+def test_get_element_not_in_array():
+    my_array, my_sparse = set_up()
+    with pytest.raises(IndexError):
+        my_sparse[14]
+
+
+def test_str():
+    my_array, my_sparse = set_up()
+
+
+def test_get_slice():
+    my_array, my_sparse = set_up()
+    assert my_sparse[2:4] == [0, 0]
+
+
+def test_set_slice():
+    my_array, my_sparse = set_up()
+    my_sparse[2:4] = [2, 3, 4]
+    assert my_sparse[:] == [2, 0, 2, 3, 4, 3, 0, 0, 0, 4, 5, 6, 0, 2, 9]
+
+
+def test_set_slice_over_end():
+    # this slice goes over the end
+    my_array, my_sparse = set_up()
+    print(my_sparse)
+    my_sparse[2:4] = [2, 3, 4]
+    assert my_sparse[:] == [2, 0, 2, 3, 4, 3, 0, 0, 0, 4, 5, 6, 0, 2, 9]
+
+
+def test_get_length():
+    my_array, my_sparse = set_up()
+    assert len(my_sparse) == 14
+
+
+def test_change_number_in_array():
+    my_array, my_sparse = set_up()
+    my_sparse[0] = 3
+    assert my_sparse[0] == 3
+    # make sure others aren't changed
+    assert my_sparse[1] == 0
+    # make sure still same length
+    assert len(my_sparse) == 14
+
+
+def test_change_number_in_array_to_zero():
+    my_array, my_sparse = set_up()
+    my_sparse[4] = 0
+    assert my_sparse[4] == 0
+    # make sure still same length
+    assert len(my_sparse) == 14
+
+
+def test_change_number_in_array_from_zero():
+    my_array, my_sparse = set_up()
+    my_sparse[1] = 4
+    assert my_sparse[1] == 4
+    # make sure still same length
+    assert len(my_sparse) == 14
+
+
+def test_change_slice():
+    my_array, my_sparse = set_up()
+    my_sparse[1:3] = [2, 3]
+    assert my_sparse[1:3] == [2, 3]
+
+
+def test_delete_number():
+    my_array, my_sparse = set_up()
+    del(my_sparse[4])
+    # if we delete the 4 position, should now be zero
+    assert my_sparse[4] == 0
+    # should have smaller length
+    assert len(my_sparse) == 13
+
+
+def test_delete_zero():
+    my_array, my_sparse = set_up()
+    del my_sparse[5]
+    # should still be zero, but should have shorter length
+    assert my_sparse[5] == 0
+    assert len(my_sparse) == 13
+
+
+def test_delete_last_number():
+    my_array, my_sparse = set_up()
+    del(my_sparse[13])
+    # should get an error
+    with pytest.raises(IndexError):
+        my_sparse[13]
+    assert len(my_sparse) == 13
+
+
+def test_indices_change():
+    my_array, my_sparse = set_up()
+    del(my_sparse[3])
+    # next index should have changed
+    # my_sparse[4] was 3 now
+    # my_sparse[3] should be 3
+    assert (my_sparse[3] == 3)
+
+
+def test_negative_index():
+    my_array, my_sparse = set_up()
+    assert my_sparse[-1] == 9
+    assert my_sparse[-3] == 0
+    with pytest.raises(IndexError):
+        my_sparse[-15]
+
+
+def test_extended_slice():
+    my_array, my_sparse = set_up()
+    assert my_sparse[1::3] == my_array[1::3]
+    assert my_sparse[::-2] == my_array[::-2]
+    assert my_sparse[10:2:-3] == my_array[10:2:-3]
+
+
+def test_set_extended_slice():
+    my_array, my_sparse = set_up()
+    my_sparse[::2] = [1] * 7
+    my_array[::2] = [1] * 7
+    assert my_sparse[:] == my_array
+    with pytest.raises(ValueError):
+        my_sparse[::2] = [1, 2]
+
+
+def test_delete_slice():
+    my_array, my_sparse = set_up()
+    del my_sparse[3:9]
+    del my_array[3:9]
+    assert my_sparse[:] == my_array
+    assert len(my_sparse) == len(my_array)
+
+
+def test_many_changes():
+    """
+    lots of inserts and deletes, so the shifts get applied along the way
+    """
+    import random
+    random.seed(42)
+    my_array = [random.choice([0, 0, 0, 1, 2]) for i in range(200)]
+    my_sparse = SparseArray(my_array)
+    for i in range(300):
+        index = random.randrange(len(my_array))
+        choice = random.random()
+        if choice < 0.4:
+            del my_array[index]
+            del my_sparse[index]
+        elif choice < 0.7:
+            new = [random.choice([0, 3]) for _ in range(random.randrange(4))]
+            my_array[index:index + 2] = new
+            my_sparse[index:index + 2] = new
+        else:
+            my_array[index] = i % 3
+            my_sparse[index] = i % 3
+        if index < len(my_array):
+            assert my_sparse[index] == my_array[index]
+        assert len(my_sparse) == len(my_array)
+    assert my_sparse[:] == my_array
+    my_sparse.apply_shifts()
+    assert my_sparse[:] == my_array
@@ -0,0 +1,96 @@
+"""
+tests of the non-zero iteration of all the SparseArrays
+"""
+
+import pytest
+
+import slice_sparse
+import sorted_sparse
+from sparse_iter import iter_runs, format_sparse
+
+modules = [slice_sparse, sorted_sparse]
+try:
+    import np_sparse
+    modules.append(np_sparse)
+except ImportError:
+    # no numpy
+    np_sparse = None
+
+MY_ARRAY = [2, 0, 0, 0, 3, 0, 0, 0, 0, 0, 0, 4, 5, 0]
+
+
+@pytest.fixture(params=modules)
+def my_sparse(request):
+    return request.param.SparseArray(MY_ARRAY)
+
+
+def test_iter_runs():
+    assert list(iter_runs(6, [(1, 5), (2, 6)])) == [(0, 1), (5, 1), (6, 1), (0, 3)]
+    assert list(iter_runs(3, [])) == [(0, 3)]
+    assert list(iter_runs(0, [])) == []
+
+
+def test_iter_runs_different_types():
+    runs = list(iter_runs(4, [(0, 1), (1, 1.0), (2, True), (3, 1)]))
+    assert [(type(value), count) for value, count in runs] == [(int, 1), (float, 1),
+                                                              (bool, 1), (int, 1)]
+    assert "1 1.0 True" in format_sparse('SparseArray', 3, [(0, 1), (1, 1.0), (2, True)])
+
+
+def test_iter_runs_same_values():
+    assert list(iter_runs(4, [(1, 5), (2, 5), (3, 5)])) == [(0, 1), (5, 3)]
+    assert (list(iter_runs(7, [(0, 1), (1, 1), (2, 2), (4, 2), (5, 2)])) ==
+            [(1, 2), (2, 1), (0, 1), (2, 2), (0, 1)])
+
+
+def test_format():
+    assert format_sparse("X", 3, [(1, 2)]) == "X: [0 2 0 ]"
+    assert format_sparse("X", 8, [(7, 2)]) == "X: [<7 zeros> 2 ]"
+
+
+def test_iter_nonzero(my_sparse):
+    expected = [(0, 2), (4, 3), (11, 4), (12, 5)]
+    assert list(my_sparse.iter_nonzero()) == expected
+    assert list(my_sparse.items()) == expected
+
+
+def test_iter_runs_method(my_sparse):
+    assert list(my_sparse.iter_runs()) == [(2, 1), (0, 3), (3, 1), (0, 6),
+                                           (4, 1), (5, 1), (0, 1)]
+
+
+def test_iter(my_sparse):
+    assert list(my_sparse) == MY_ARRAY
+
+
+def test_sum(my_sparse):
+    assert my_sparse.sum() == sum(MY_ARRAY)
+
+
+def test_str(my_sparse):
+    assert str(my_sparse) == "SparseArray: [2 0 0 0 3 <6 zeros> 4 5 0 ]"
+
+
+def test_view(my_sparse):
+    if np_sparse is not None and isinstance(my_sparse, np_sparse.SparseArray):
+        pytest.skip("numpy version doesn't use views")
+    view = my_sparse[3:13]
+    assert list(view.items()) == [(1, 3), (8, 4), (9, 5)]
+    assert view.sum() == 12
+    assert str(view) == "SparseArrayView: [0 3 <6 zeros> 4 5 ]"
+
+
+@pytest.mark.parametrize("module", [slice_sparse, sorted_sparse])
+def test_str_long(module):
+    my_sparse = module.SparseArray([0] * 1000000)
+    my_sparse[10] = 1
+    my_sparse[999999] = 2
+    assert str(my_sparse) == ("SparseArray: [<10 zeros> 1 <999988 zeros> 2 ]")
+
+
+@pytest.mark.skipif(np_sparse is None, reason="needs numpy")
+def test_str_huge():
+    my_sparse = np_sparse.SparseArray.from_coo(range(0, 10 ** 8, 10 ** 5),
+                                               [1] * 1000, 10 ** 8)
+    assert str(my_sparse).count("<99999 zeros>") == 1000
+    assert my_sparse.sum() == 1000
@@ -0,0 +1,186 @@
+"""
+tests of the SparseMatrix
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from np_sparse import SparseArray  # noqa: E402  (needs numpy)
+from sparse_matrix import SparseMatrix  # noqa: E402
+
+DENSE = [[1, 0, 0, 2],
+         [0, 0, 0, 0],
+         [0, 3, 0, 4],
+         [5, 0, 6, 0],
+         [0, 0, 7, 0]]
+
+
+@pytest.fixture(params=["csr", "csc"])
+def set_up(request):
+    dense = np.array(DENSE)
+    return dense, SparseMatrix.from_dense(dense, format=request.param)
+
+
+def random_matrix(shape, density, seed):
+    rng = np.random.default_rng(seed)
+    dense = rng.random(shape)
+    dense[rng.random(shape) > density] = 0
+    return dense
+
+
+def test_from_dense(set_up):
+    dense, matrix = set_up
+    assert matrix.shape == (5, 4)
+    assert matrix.nnz == 7
+    assert np.array_equal(matrix.toarray(), dense)
+
+
+def test_csr_arrays():
+    matrix = SparseMatrix.from_dense(DENSE)
+    assert matrix.indptr.tolist() == [0, 2, 2, 4, 6, 7]
+    assert matrix.indices.tolist() == [0, 3, 1, 3, 0, 2, 2]
+    assert matrix.data.tolist() == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_convert(set_up):
+    dense, matrix = set_up
+    assert np.array_equal(matrix.tocsr().toarray(), dense)
+    assert np.array_equal(matrix.tocsc().toarray(), dense)
+    assert matrix.tocsc().format == "csc"
+    assert np.array_equal(matrix.T.toarray(), dense.T)
+
+
+def test_from_coo_repeats():
+    matrix = SparseMatrix.from_coo([0, 1, 0, 1], [1, 0, 1, 1], [1, 2, 3, 0], (2, 2))
+    assert matrix.toarray().tolist() == [[0, 4], [2, 0]]
+    assert matrix.nnz == 2
+
+
+def test_from_rows():
+    rows = [SparseArray(row) for row in DENSE]
+    matrix = SparseMatrix.from_rows(rows)
+    assert np.array_equal(matrix.toarray(), DENSE)
+    assert np.array_equal(SparseMatrix.from_rows(DENSE, format="csc").toarray(), DENSE)
+    with pytest.raises(ValueError):
+        SparseMatrix.from_rows([[1, 2], [1, 2, 3]])
+
+
+def test_get_item(set_up):
+    dense, matrix = set_up
+    for i in range(5):
+        for j in range(4):
+            assert matrix[i, j] == dense[i, j]
+    assert matrix[-1, -2] == 7
+    with pytest.raises(IndexError):
+        matrix[5, 0]
+
+
+def test_rows_and_cols(set_up):
+    dense, matrix = set_up
+    for i in range(5):
+        row = matrix[i]
+        assert isinstance(row, SparseArray)
+        assert row.toarray().tolist() == dense[i].tolist()
+    for j in range(4):
+        col = matrix[:, j]
+        assert isinstance(col, SparseArray)
+        assert col.toarray().tolist() == dense[:, j].tolist()
+    assert matrix[2, 1:].toarray().tolist() == [3, 0, 4]
+    assert matrix[1:4, 3].toarray().tolist() == [0, 4, 0]
+
+
+@pytest.mark.parametrize("index", [(slice(1, 4), slice(None)),
+                                   (slice(None), slice(1, 3)),
+                                   (slice(None, None, 2), slice(None, None, -1)),
+                                   (slice(3, 0, -1), slice(2, 4)),
+                                   (slice(2, 2), slice(None))])
+def test_slices(set_up, index):
+    dense, matrix = set_up
+    result = matrix[index]
+    assert isinstance(result, SparseMatrix)
+    assert np.array_equal(result.toarray(), dense[index])
+
+
+def test_matvec(set_up):
+    dense, matrix = set_up
+    vector = np.arange(4) + 1.0
+    assert np.allclose(matrix.dot(vector), dense @ vector)
+    assert np.allclose(matrix @ SparseArray([1, 0, 2, 0]), dense @ [1, 0, 2, 0])
+    with pytest.raises(ValueError):
+        matrix.dot(np.ones(5))
+
+
+def test_matmat_dense(set_up):
+    dense, matrix = set_up
+    other = np.arange(12).reshape(4, 3)
+    assert np.array_equal(matrix @ other, dense @ other)
+
+
+@pytest.mark.parametrize("formats", [("csr", "csr"), ("csr", "csc"),
+                                     ("csc", "csr"), ("csc", "csc")])
+def test_matmat_sparse(formats):
+    a = random_matrix((30, 20), 0.1, 1)
+    b = random_matrix((20, 40), 0.1, 2)
+    result = (SparseMatrix.from_dense(a, formats[0]) @
+              SparseMatrix.from_dense(b, formats[1]))
+    assert isinstance(result, SparseMatrix)
+    assert result.format == formats[0]
+    assert np.allclose(result.toarray(), a @ b)
+
+
+def test_random_matvec():
+    a = random_matrix((200, 100), 0.01, 3)
+    vector = np.random.default_rng(4).random(100)
+    assert np.allclose(SparseMatrix.from_dense(a) @ vector, a @ vector)
+
+
+def test_matmat_sparse_blocks(monkeypatch):
+    """
+    make it do the multiplication in lots of small blocks
+    """
+    monkeypatch.setattr(SparseMatrix, "max_products", 10)
+    monkeypatch.setattr(SparseMatrix, "max_block", 50)
+    a = random_matrix((30, 20), 0.2, 5)
+    b = random_matrix((20, 40), 0.2, 6)
+    result = SparseMatrix.from_dense(a) @ SparseMatrix.from_dense(b)
+    assert np.allclose(result.toarray(), a @ b)
+
+
+def test_matmat_sparse_int():
+    a = np.array([[1, 0], [0, 2]])
+    result = SparseMatrix.from_dense(a) @ SparseMatrix.from_dense(a)
+    assert result.dtype == a.dtype
+    assert result.toarray().tolist() == [[1, 0], [0, 4]]
+
+
+def test_matvec_int(set_up):
+    dense, matrix = set_up
+    vector = np.arange(4)
+    result = matrix @ vector
+    assert result.dtype == (dense @ vector).dtype
+    assert result.tolist() == (dense @ vector).tolist()
+
+
+def test_int_big_values():
+    # too big to be exact as a float64
+    big = 2 ** 60 + 1
+    a = np.array([[big, 1], [0, 3]], dtype=np.int64)
+    matrix = SparseMatrix.from_dense(a)
+    assert (matrix @ np.array([1, 1])).tolist() == [big + 1, 3]
+    assert (matrix @ SparseMatrix.from_dense(np.eye(2, dtype=np.int64))
+            ).toarray().tolist() == a.tolist()
+
+
+@pytest.mark.parametrize("format", ["csr", "csc"])
+def test_complex(format):
+    a = random_matrix((30, 20), 0.2, 7) * (1 + 2j)
+    b = random_matrix((20, 10), 0.2, 8) - 1j * random_matrix((20, 10), 0.2, 9)
+    vector = np.arange(20) * 1j
+    matrix = SparseMatrix.from_dense(a, format)
+    result = matrix @ vector
+    assert result.dtype == np.complex128
+    assert np.allclose(result, a @ vector)
+    result = matrix @ SparseMatrix.from_dense(b)
+    assert result.dtype == np.complex128
+    assert np.allclose(result.toarray(), a @ b)
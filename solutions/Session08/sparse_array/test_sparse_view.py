@@ -0,0 +1,72 @@
+"""
+tests of the slice views, with both SparseArrays that use them
+"""
+
+import pytest
+
+import slice_sparse
+import sorted_sparse
+from sparse_view import SparseArrayView
+
+
+@pytest.fixture(params=[slice_sparse, sorted_sparse])
+def set_up(request):
+    my_array = [2, 0, 0, 0, 3, 0, 0, 0, 4, 5, 6, 0, 2, 9]
+    my_sparse = request.param.SparseArray(my_array)
+    return (my_array, my_sparse)
+
+
+SLICES = [slice(2, 4), slice(None), slice(1, None, 3), slice(None, None, -2),
+          slice(10, 2, -3), slice(5, 2), slice(-5, None)]
+
+
+@pytest.mark.parametrize("sl", SLICES)
+def test_slice_is_view(set_up, sl):
+    my_array, my_sparse = set_up
+    view = my_sparse[sl]
+    assert isinstance(view, SparseArrayView)
+    assert len(view) == len(my_array[sl])
+    assert view.tolist() == my_array[sl]
+    assert list(view) == my_array[sl]
+    assert view == my_array[sl]
+
+
+@pytest.mark.parametrize("sl", SLICES)
+def test_slice_of_view(set_up, sl):
+    my_array, my_sparse = set_up
+    view = my_sparse[1:-1][sl]
+    assert view.tolist() == my_array[1:-1][sl]
+
+
+def test_view_index(set_up):
+    my_array, my_sparse = set_up
+    view = my_sparse[3:]
+    assert view[1] == 3
+    assert view[0] == 0
+    assert view[-1] == 9
+    with pytest.raises(IndexError):
+        view[11]
+
+
+def test_iter_nonzero(set_up):
+    my_array, my_sparse = set_up
+    assert list(my_sparse[3:11].iter_nonzero()) == [(1, 3), (5, 4), (6, 5), (7, 6)]
+    assert list(my_sparse[::-4].iter_nonzero()) == [(0, 9), (1, 5)]
+
+
+def test_view_sees_changes(set_up):
+    my_array, my_sparse = set_up
+    view = my_sparse[:5]
+    my_sparse[1] = 8
+    assert view == [2, 8, 0, 0, 3]
+
+
+def test_big_view():
+    """
+    a slice of a big array doesn't make a big list
+    """
+    my_sparse = sorted_sparse.SparseArray([0] * 1000000)
+    my_sparse[500000] = 1
+    view = my_sparse[1000:]
+    assert list(view.iter_nonzero()) == [(499000, 1)]
+    assert view[499000] == 1
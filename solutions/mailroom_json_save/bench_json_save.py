@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+
+"""
+Benchmark for saving and loading a DonorDB with json_save
+
+Compares the generic List() saveable with the typed List(Float)
+that Donor.donations uses now.
+
+$ python bench_json_save.py [num_donors]
+"""
+
+import os
+import sys
+import timeit
+
+from json_save import json_save_dec as js
+
+from mailroom.model import DonorDB
+from bench_report import make_donors
+
+generic = js.List()
+typed = js.List(js.Float)
+
+
+def bench(name, saveable, donations, number=5):
+    compats = [saveable.to_json_compat(d) for d in donations]
+    save = timeit.timeit(lambda: [saveable.to_json_compat(d)
+                                  for d in donations], number=number)
+    load = timeit.timeit(lambda: [saveable.to_python(c)
+                                  for c in compats], number=number)
+    print("{:16s} save: {:.3f}s   load: {:.3f}s".format(name,
+                                                       save / number,
+                                                       load / number))
+    return save + load
+
+
+if __name__ == "__main__":
+    num_donors = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    donations = [d.donations * 50 for d in make_donors(num_donors)]
+    print("{} donors, {} donations".format(num_donors,
+                                           sum(len(d) for d in donations)))
+
+    t_generic = bench("List()", generic, donations)
+    t_typed = bench("List(Float)", typed, donations)
+    print("speedup: {:.1f}".format(t_generic / t_typed))
+
+    # and the whole thing, end to end.
+    db = DonorDB(make_donors(num_donors), db_file=os.devnull)
+    print("DonorDB.to_json_compat: {:.3f}s".format(
+          timeit.timeit(db.to_json_compat, number=1)))
+    compat = db.to_json_compat()
+    print("DonorDB.from_json_dict: {:.3f}s".format(
+          timeit.timeit(lambda: DonorDB.from_json_dict(dict(compat)), number=1)))
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+"""
+Benchmark for the donor report generation
+
+Builds a large fake DonorDB, and times generate_donor_report
+with different numbers of worker processes.
+
+$ python bench_report.py [num_donors]
+"""
+
+import os
+import sys
+import time
+from random import randint, seed
+
+from mailroom.model import Donor, DonorDB
+
+
+def rand_name():
+    return "".join([chr(randint(97, 122)) for i in range(randint(5, 10))])
+
+
+def make_donors(n):
+    seed(42)
+    for i in range(n):
+        name = " ".join((rand_name().capitalize(),
+                         chr(randint(65, 90)) + ".",
+                         rand_name().capitalize(),
+                         str(i)))
+        yield Donor(name, [randint(10, 30) * 100.0
+                           for j in range(randint(1, 20))])
+
+
+def time_report(db, workers):
+    start = time.perf_counter()
+    report = db.generate_donor_report(workers=workers)
+    return time.perf_counter() - start, report
+
+
+if __name__ == "__main__":
+    num_donors = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    print("building a DB with {} donors".format(num_donors))
+    db = DonorDB(make_donors(num_donors), db_file=os.devnull)
+
+    serial_time, serial_report = time_report(db, 1)
+    print("{:2d} worker(s): {:.3f} seconds".format(1, serial_time))
+    workers = 2
+    while workers <= os.cpu_count():
+        elapsed, report = time_report(db, workers)
+        assert report == serial_report
+        print("{:2d} worker(s): {:.3f} seconds, speedup: {:.2f}".format(
+              workers, elapsed, serial_time / elapsed))
+        workers *= 2
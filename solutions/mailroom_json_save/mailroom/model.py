@@ -10,6 +10,8 @@ This version has been made Object Oriented.
 # handy utility to make pretty printing easier
 from textwrap import dedent
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import heapq
 
 import json_save.json_save_dec as js
 import json
@@ -23,7 +25,7 @@ class Donor:
     class to hold the information about a single donor
     """
     name = js.String()
-    donations = js.List()
+    donations = js.List(js.Float)
 
     # reference to the DB its in -- this will be set in the instance
     # when added to the DonorDB
@@ -136,6 +138,37 @@ class Donor:
                       )
 
 
+REPORT_HEADER = "{:25s} | {:11s} | {:9s} | {:12s}".format("Donor Name",
+                                                        "Total Given",
+                                                        "Num Gifts",
+                                                        "Average Gift")
+
+
+def _format_report_chunk(donors):
+    """
+    Summarize and format a batch of donors for the donor report.
+
+    This is at the module level so that it can be sent to worker
+    processes by DonorDB.generate_donor_report.
+
+    :param donors: iterable of (name, donations) tuples
+
+    :returns: list of (name, total, formatted_row) tuples, sorted by total
+    """
+    rows = []
+    for name, gifts in donors:
+        total_gifts = sum(gifts)
+        num_gifts = len(gifts)
+        avg_gift = total_gifts / num_gifts
+        rows.append((name, total_gifts,
+                     "{:25s}   ${:10.2f}   {:9d}   ${:11.2f}".format(name,
+                                                                     total_gifts,
+                                                                     num_gifts,
+                                                                     avg_gift)))
+    rows.sort(key=DonorDB.sort_key)
+    return rows
+
+
 @js.json_save
 class DonorDB:
     """
@@ -270,32 +303,38 @@ class DonorDB:
         # used to sort on name in self.donor_data
         return item[1]
 
-    def generate_donor_report(self):
+    def generate_donor_report(self, workers=1, chunk_size=10000):
         """
         Generate the report of the donors and amounts donated.
 
+        :param workers=1: number of processes to use to format the report.
+                          With more than one, the donors are split into
+                          chunks that are summarized and formatted in a
+                          process pool, then merged back in sorted order.
+
+        :param chunk_size=10000: number of donors sent to each worker
+                                 at a time in parallel mode.
+
         :returns: the donor report as a string.
         """
-        # First, reduce the raw data into a summary list view
-        report_rows = []
-        for donor in self.donor_data.values():
-            name = donor.name
-            gifts = donor.donations
-            total_gifts = donor.total_donations
-            num_gifts = len(gifts)
-            avg_gift = donor.average_donation
-            report_rows.append((name, total_gifts, num_gifts, avg_gift))
-
-        # sort the report data
-        report_rows.sort(key=self.sort_key)
-        report = []
-        report.append("{:25s} | {:11s} | {:9s} | {:12s}".format("Donor Name",
-                                                                "Total Given",
-                                                                "Num Gifts",
-                                                                "Average Gift"))
-        report.append("-" * 66)
-        for row in report_rows:
-            report.append("{:25s}   ${:10.2f}   {:9d}   ${:11.2f}".format(*row))
+        if workers > 1:
+            # only ship plain data to the workers -- the Donor objects
+            # hold a reference back to the whole DB.
+            raw = [(donor.name, donor.donations)
+                   for donor in self.donor_data.values()]
+            chunks = [raw[i:i + chunk_size]
+                      for i in range(0, len(raw), chunk_size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(_format_report_chunk, chunks))
+            # each chunk comes back sorted, so they just need merging.
+            # heapq.merge is stable, so ties come out in the same order
+            # as the single process version.
+            rows = heapq.merge(*partials, key=self.sort_key)
+        else:
+            rows = _format_report_chunk((donor.name, donor.donations)
+                                        for donor in self.donor_data.values())
+        report = [REPORT_HEADER, "-" * 66]
+        report.extend(row[2] for row in rows)
         return "\n".join(report)
 
     def save_letters_to_disk(self):
@@ -135,6 +135,18 @@ def test_generate_donor_report(sample_db):
     assert "Jeff Bezos                  $    877.33           1   $     877.33" in report
 
 
+def test_generate_donor_report_parallel(sample_db):
+    """
+    The parallel report should be exactly the same as the serial one
+    """
+    report = sample_db.generate_donor_report()
+
+    # small chunks so that there is something to merge
+    par_report = sample_db.generate_donor_report(workers=2, chunk_size=1)
+
+    assert par_report == report
+
+
 def test_save_letters_to_disk(sample_db):
     """
     This only tests that the files get created, but that's a start